@@ -4,30 +4,31 @@ from flask_login import LoginManager,current_user
 from flask_admin import Admin,AdminIndexView
 from flask_admin.contrib.sqla import ModelView
 from flask_assets import Environment
-from sassutils.wsgi import SassMiddleware
 from flask_migrate import Migrate
 
+from .assets import init_assets
+from .templating import init_template_cache
 
-app = Flask(__name__)
 
+app = Flask(__name__)
 
-assets = Environment(app)
 
 app.config['SECRET_KEY'] = '340ab03a37eaa432fc52d8a2ae8cf26c'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///cuba.db'
 
+# Prebuilt bundles; SassMiddleware only with ASSETS_DEV=1 (see cuba/assets.py)
+assets = Environment()
+init_assets(app, assets)
 
-db = SQLAlchemy(app)
+# Compiled templates persist across workers; warm with "flask templates compile"
+init_template_cache(app)
 
-with app.app_context():
-    db.create_all()
 
+# Schema is managed by the revisions in migrations/ ("flask --app app db upgrade")
+db = SQLAlchemy(app)
 
-migrate = Migrate(app, db)
 
-app.wsgi_app = SassMiddleware(app.wsgi_app, {
-    'cuba': ('static/assets/scss', 'static/assets/css', '/static/assets/css')
-})
+migrate = Migrate(app, db)
 
 
 class UserModelView(ModelView):
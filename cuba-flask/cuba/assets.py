@@ -0,0 +1,74 @@
+"""
+Flask-Assets bundles.
+
+Production serves prebuilt, minified files with the content hash in the name
+(``static/assets/gen/style.<hash>.css``). Build them as part of a deploy:
+
+    flask --app app assets build
+
+The hash is recorded in ``static/assets/gen/manifest.json``, so the app never
+compiles SCSS or hashes files at runtime. With ``ASSETS_DEV=1`` bundles are
+rebuilt when a source changes and SassMiddleware compiles the legacy
+``*.scss.css`` URLs on request (development only; needs libsass).
+"""
+import logging
+import os
+
+from flask_assets import Bundle, Environment
+
+
+logger = logging.getLogger(__name__)
+
+GEN_DIR = 'assets/gen'
+MANIFEST = f'{GEN_DIR}/manifest.json'
+
+BUNDLES = {
+    # libsass "compressed" output is the minified stylesheet
+    'style_css': Bundle(
+        'assets/scss/style.scss',
+        filters='libsass',
+        depends='assets/scss/**/*.scss',
+        output=f'{GEN_DIR}/style.%(version)s.css',
+    ),
+    'app_js': Bundle(
+        'assets/js/script.js',
+        'assets/js/script1.js',
+        filters='rjsmin',
+        output=f'{GEN_DIR}/app.%(version)s.js',
+    ),
+}
+
+
+def assets_dev_enabled() -> bool:
+    return os.environ.get('ASSETS_DEV', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def init_assets(app, assets: Environment) -> None:
+    """Register the bundles and choose between prebuilt and on-request assets."""
+    dev = assets_dev_enabled()
+    app.config.setdefault('LIBSASS_STYLE', 'compressed')
+    # Partials import each other relative to the SCSS root (e.g. "utils/variables")
+    app.config.setdefault('LIBSASS_INCLUDES', [os.path.join(app.static_folder, 'assets', 'scss')])
+    app.config.setdefault('ASSETS_DEBUG', False)
+    app.config.setdefault('ASSETS_AUTO_BUILD', dev)
+    app.config.setdefault('ASSETS_MANIFEST', f'json:{MANIFEST}')
+    app.config.setdefault('ASSETS_CACHE', False)
+    # The version is part of the file name, no "?<hash>" query string needed
+    app.config.setdefault('ASSETS_URL_EXPIRE', False)
+
+    assets.init_app(app)
+    for name, bundle in BUNDLES.items():
+        assets.register(name, bundle)
+
+    if not dev and not os.path.exists(os.path.join(app.static_folder, MANIFEST)):
+        # Keep the site working on a checkout that skipped the build step: bundles
+        # are built once on first use (slow first request) instead of failing
+        logger.warning("Prebuilt assets not found; run 'flask --app app assets build'. "
+                       "Building on first request instead.")
+        app.config['ASSETS_AUTO_BUILD'] = True
+
+    if dev:
+        from sassutils.wsgi import SassMiddleware
+        app.wsgi_app = SassMiddleware(app.wsgi_app, {
+            'cuba': ('static/assets/scss', 'static/assets/css', '/static/assets/css')
+        })
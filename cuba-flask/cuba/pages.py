@@ -0,0 +1,97 @@
+"""
+Declarative demo pages with a rendered-response cache.
+
+Most views in ``routes.py`` render a fixed template with a fixed context
+(breadcrumb, optional layout/footer variant), so the HTML is the same for
+every user. ``register_pages`` builds those views from a table of ``Page``
+entries. Each page is rendered once per process and stored under
+``(template, layout, footer)``. Repeat hits are a dictionary lookup, and
+browsers revalidate with ETag/Last-Modified (304 when unchanged).
+
+The cache is bypassed while templates auto-reload (debug mode) or with
+``PAGE_CACHE = False``.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from flask import Response, current_app, render_template, request
+from flask_login import login_required as require_login
+
+
+class Page(NamedTuple):
+    endpoint: str
+    rules: List[str]
+    template: str
+    context: Dict
+    login_required: bool = True
+
+    @property
+    def cache_key(self) -> Tuple[str, Optional[str], Optional[str]]:
+        return self.template, self.context.get('layout'), self.context.get('footer')
+
+
+class RenderedPage(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+_rendered: Dict[Tuple, RenderedPage] = {}
+
+
+def clear_page_cache() -> None:
+    _rendered.clear()
+
+
+def _cache_enabled() -> bool:
+    app = current_app
+    return app.config.get('PAGE_CACHE', True) and not app.jinja_env.auto_reload
+
+
+def _render(page: Page) -> RenderedPage:
+    body = render_template(page.template, **page.context).encode('utf-8')
+    return RenderedPage(
+        body=body,
+        etag=hashlib.sha1(body).hexdigest(),
+        # HTTP dates have one-second resolution
+        last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+    )
+
+
+def render_page(page: Page) -> Response:
+    """Serve a page from the cache (rendering it on first use) as a conditional response."""
+    if not _cache_enabled():
+        return Response(render_template(page.template, **page.context), mimetype='text/html')
+
+    rendered = _rendered.get(page.cache_key)
+    if rendered is None:
+        rendered = _rendered.setdefault(page.cache_key, _render(page))
+
+    response = Response(rendered.body, mimetype='text/html')
+    response.set_etag(rendered.etag)
+    response.last_modified = rendered.last_modified
+    # Pages sit behind the login, so only the browser may store them, and it has to revalidate
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _make_view(page: Page):
+    def view():
+        return render_page(page)
+    view.__name__ = page.endpoint
+    return require_login(view) if page.login_required else view
+
+
+def register_pages(blueprint, pages: List[Page]) -> None:
+    """Add one view per page to the blueprint, keeping the table's endpoint names."""
+    seen = {}
+    for page in pages:
+        other = seen.setdefault(page.cache_key, page)
+        if other is not page and other.context != page.context:
+            raise ValueError(f"Pages {other.endpoint!r} and {page.endpoint!r} share cache key "
+                             f"{page.cache_key!r} with different contexts")
+        view = _make_view(page)
+        for rule in page.rules:
+            blueprint.add_url_rule(rule, page.endpoint, view)
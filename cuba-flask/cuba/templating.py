@@ -0,0 +1,74 @@
+"""
+Persistent Jinja bytecode cache and ``flask templates compile``.
+
+Compiled templates are stored in ``TEMPLATE_CACHE_DIR`` (default
+``instance/jinja_cache``), keyed by template name and source checksum. New
+workers load bytecode instead of parsing each of the several hundred page
+templates on first render. Run ``flask --app app templates compile`` at
+deploy time to warm the cache.
+"""
+import logging
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+
+logger = logging.getLogger(__name__)
+
+
+class TolerantBytecodeCache(FileSystemBytecodeCache):
+    """Filesystem bytecode cache that never fails a render because it cannot write."""
+
+    def dump_bytecode(self, bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.debug("Template bytecode not cached for %s: %s", bucket.key, e)
+
+
+def init_template_cache(app) -> None:
+    app.config.setdefault('TEMPLATE_BYTECODE_CACHE',
+                          os.environ.get('TEMPLATE_BYTECODE_CACHE', '1').lower() not in ('0', 'false', 'no', 'off'))
+    app.config.setdefault('TEMPLATE_CACHE_DIR', os.environ.get('TEMPLATE_CACHE_DIR'))
+
+    if app.config['TEMPLATE_BYTECODE_CACHE']:
+        directory = app.config['TEMPLATE_CACHE_DIR'] or os.path.join(app.instance_path, 'jinja_cache')
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            logger.warning("Template bytecode cache disabled, cannot create %s: %s", directory, e)
+        else:
+            app.config['TEMPLATE_CACHE_DIR'] = directory
+            app.jinja_env.bytecode_cache = TolerantBytecodeCache(directory)
+
+    app.cli.add_command(templates_cli)
+
+
+templates_cli = AppGroup('templates', help='Jinja template bytecode cache.')
+
+
+@templates_cli.command('compile')
+@click.option('--clear', is_flag=True, help='Drop cached bytecode first.')
+def templates_compile(clear):
+    """Compile all templates into the bytecode cache (run at deploy time)."""
+    env = current_app.jinja_env
+    if env.bytecode_cache is None:
+        raise click.ClickException("Template bytecode cache is disabled (TEMPLATE_BYTECODE_CACHE=0).")
+    if clear:
+        env.bytecode_cache.clear()
+
+    compiled, failed = 0, 0
+    for name in env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        try:
+            env.get_template(name)
+        except TemplateError as e:
+            click.echo(f"✗ {name}: {e}", err=True)
+            failed += 1
+        else:
+            compiled += 1
+    click.echo(f"✓ {compiled} templates compiled into {current_app.config['TEMPLATE_CACHE_DIR']}")
+    if failed:
+        raise SystemExit(1)
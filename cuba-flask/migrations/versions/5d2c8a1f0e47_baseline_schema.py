@@ -0,0 +1,54 @@
+"""Baseline schema (replaces db.create_all() at import)
+
+Creates the user and todo tables. Databases created by the old import-time
+create_all() already have them, so each table is only created when missing.
+
+Revision ID: 5d2c8a1f0e47
+Revises:
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2c8a1f0e47'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = _tables()
+    if 'user' not in tables:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=20), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('password', sa.String(length=600), nullable=False),
+            sa.Column('isAdmin', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+            sa.UniqueConstraint('username'),
+        )
+    if 'todo' not in tables:
+        op.create_table(
+            'todo',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('description', sa.String(length=500), nullable=False),
+            sa.Column('completed', sa.Boolean(), nullable=True),
+            sa.Column('timeStamp', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('description'),
+        )
+
+
+def downgrade():
+    op.drop_table('todo')
+    op.drop_table('user')
@@ -1,4 +1,6 @@
-from cuba import app
+from cuba import create_app
+
+app = create_app()
 
 if __name__ == "__main__":
     # Local development entrypoint
@@ -0,0 +1,10 @@
+"""
+Endpoint benchmarks with regression gates.
+
+Run from the ``staterkit`` directory::
+
+    python -m benchmarks.run                     # compare against saved baselines
+    python -m benchmarks.run --save-baseline     # record new baselines
+
+See ``benchmarks/run.py`` for options.
+"""
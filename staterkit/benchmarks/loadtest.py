@@ -0,0 +1,264 @@
+"""
+Load test: simulated analysts against a multi-worker server.
+
+Starts the application on a copy of a generated dataset under gunicorn (if
+installed) or the pre-forking werkzeug server in ``benchmarks/serve.py``,
+then runs concurrency steps. In each step N simulated sessions log in
+(with CSRF) and, until the step ends,
+
+* poll ``/api/notifications`` every 30 s,
+* page through and filter the credential list,
+* search, open the analysis page, and occasionally export.
+
+For each step it reports throughput, latency percentiles and error rate,
+which shows how many workers a deployment needs and where SQLite writer
+contention (logins, audit rows) starts to collapse throughput.
+
+    python -m benchmarks.loadtest --dataset small --workers 4 --concurrency 1,4,8,16,32
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from .run import PROJECT_DIR, ensure_dataset
+from .scenarios import DATASETS
+from .worker import percentile
+
+
+LIST_URL = '/threat-intelligence/breached-creds'
+CSRF_FIELD = re.compile(r'name="csrf_token" value="([^"]+)"')
+LIST_FILTERS = ['type=stealer', 'type=combolist', 'date_filter=week', 'date_filter=month',
+                'source=Telegram', 'search=smith', 'domain=mail']
+SEARCH_TERMS = ['smith', 'john', 'gmail', 'stealer', 'corp']
+EXPORT_FORMATS = ['csv', 'json', 'xlsx', 'pdf']
+
+
+class Recorder:
+    """Collects (kind, started, seconds, ok) samples from all session threads."""
+
+    def __init__(self):
+        self.samples = []  # list.append is atomic; no lock needed
+
+    def add(self, kind, started, seconds, ok):
+        self.samples.append((kind, started, seconds, ok))
+
+
+class AnalystSession:
+    """One browser-like session: cookie jar, CSRF login, timed requests."""
+
+    def __init__(self, base_url, email, password, recorder, timeout=60):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.recorder = recorder
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def request(self, kind, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        started = time.time()
+        t0 = time.perf_counter()
+        ok, text = False, ''
+        try:
+            with self.opener.open(self.base_url + path, data=body, timeout=self.timeout) as response:
+                text = response.read().decode('utf-8', 'replace')
+                ok = response.status < 400
+        except (urllib.error.URLError, OSError):
+            ok = False
+        self.recorder.add(kind, started, time.perf_counter() - t0, ok)
+        return ok, text
+
+    def login(self):
+        ok, page = self.request('login_form', '/login')
+        match = CSRF_FIELD.search(page) if ok else None
+        if not match:
+            return False
+        ok, page = self.request('login', '/login', {
+            'csrf_token': match.group(1), 'email': self.email, 'password': self.password,
+        })
+        # A failed login re-renders the form instead of redirecting to the dashboard
+        return ok and 'name="password"' not in page
+
+    def run(self, stop_at, rng, poll_interval, think_time, export_probability):
+        next_poll = time.time()
+        page = 1
+        while time.time() < stop_at:
+            if time.time() >= next_poll:
+                self.request('notifications', '/api/notifications')
+                next_poll += poll_interval
+
+            roll = rng.random()
+            if roll < export_probability:
+                self.request('export', f'/threat-intelligence/breached-creds/export?format={rng.choice(EXPORT_FORMATS)}')
+            elif roll < 0.45:
+                page = page + 1 if rng.random() < 0.6 else 1
+                self.request('list', f'{LIST_URL}?page={page}')
+            elif roll < 0.70:
+                self.request('list_filtered', f'{LIST_URL}?{rng.choice(LIST_FILTERS)}')
+            elif roll < 0.90:
+                self.request('search', f'/api/search?q={rng.choice(SEARCH_TERMS)}')
+            else:
+                self.request('analysis', '/threat-intelligence/analysis')
+
+            if think_time:
+                time.sleep(min(think_time * rng.uniform(0.5, 1.5), max(0.0, stop_at - time.time())))
+
+
+def start_server(args, database_path):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database_path}', SQL_SLOW_QUERY_MS='60000')
+    env.pop('SQLALCHEMY_DATABASE_URI', None)
+    use_gunicorn = args.server == 'gunicorn' or (args.server == 'auto' and shutil.which('gunicorn'))
+    if use_gunicorn:
+        command = ['gunicorn', '--workers', str(args.workers), '--threads', str(args.threads),
+                   '--bind', f'127.0.0.1:{args.port}', '--log-level', 'warning', 'app:app']
+    else:
+        command = [sys.executable, '-m', 'benchmarks.serve', '--port', str(args.port),
+                   '--workers', str(args.workers), '--threads', str(args.threads)]
+    print(f"Starting server: {' '.join(command)}", file=sys.stderr)
+    process = subprocess.Popen(command, cwd=PROJECT_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f'http://127.0.0.1:{args.port}'
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit('Server exited during startup')
+        try:
+            with urllib.request.urlopen(base_url + '/login', timeout=2):
+                return process, base_url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    process.terminate()
+    raise SystemExit('Server did not become ready within 60 s')
+
+
+def load_logins(database_path, password):
+    connection = sqlite3.connect(database_path)
+    try:
+        emails = [row[0] for row in connection.execute(
+            "SELECT email FROM user WHERE role = 'member' AND is_active = 1 ORDER BY id")]
+    finally:
+        connection.close()
+    return [(email, password) for email in emails] or [('admin@dseclab.com', password)]
+
+
+def summarize(samples, seconds):
+    if not samples:
+        return {'requests': 0}
+    latencies = [s[2] * 1000 for s in samples]
+    errors = sum(1 for s in samples if not s[3])
+    by_kind = {}
+    for kind in sorted({s[0] for s in samples}):
+        kind_latencies = [s[2] * 1000 for s in samples if s[0] == kind]
+        by_kind[kind] = {
+            'requests': len(kind_latencies),
+            'p50_ms': round(percentile(kind_latencies, 50), 1),
+            'p95_ms': round(percentile(kind_latencies, 95), 1),
+            'errors': sum(1 for s in samples if s[0] == kind and not s[3]),
+        }
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / seconds, 2),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'error_rate': round(errors / len(samples), 4),
+        'by_kind': by_kind,
+    }
+
+
+def run_step(base_url, logins, concurrency, args, seed):
+    recorder = Recorder()
+    sessions = [AnalystSession(base_url, *logins[i % len(logins)], recorder) for i in range(concurrency)]
+    failed_logins = sum(1 for session in sessions if not session.login())
+
+    started = time.time()
+    stop_at = started + args.step_seconds
+    threads = []
+    for i, session in enumerate(sessions):
+        thread = threading.Thread(
+            target=session.run,
+            args=(stop_at, random.Random(seed * 1000 + i), 30 * args.time_scale,
+                  args.think_time * args.time_scale, args.export_probability),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+    steady = [s for s in recorder.samples if s[1] >= started]
+    result = summarize(steady, time.time() - started)
+    result.update({'concurrency': concurrency, 'failed_logins': failed_logins,
+                   'login': summarize([s for s in recorder.samples if s[0] == 'login'], 1).get('p95_ms')})
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Concurrent analyst load test.')
+    parser.add_argument('--dataset', default='small', choices=sorted(DATASETS))
+    parser.add_argument('--server', default='auto', choices=['auto', 'gunicorn', 'werkzeug'])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32', help='Comma-separated session counts')
+    parser.add_argument('--step-seconds', type=float, default=30)
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean seconds between actions')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Multiplier for the 30 s poll interval and think time (0.1 = 10x faster)')
+    parser.add_argument('--export-probability', type=float, default=0.02)
+    parser.add_argument('--password', default='admin123', help='Password of the generated users')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--data-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data'))
+    parser.add_argument('--output', default=None, help='Write the results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    # Work on a copy: logins, audit rows and notifications write to the database
+    source = ensure_dataset(args.dataset, args.data_dir)
+    work_dir = tempfile.mkdtemp(prefix='cuba-loadtest-')
+    database_path = os.path.join(work_dir, 'loadtest.db')
+    shutil.copyfile(source, database_path)
+
+    server, base_url = start_server(args, database_path)
+    results = []
+    try:
+        logins = load_logins(database_path, args.password)
+        print(f"{'sessions':>8} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'errors':>7} {'login p95':>9}")
+        for step, concurrency in enumerate(int(c) for c in args.concurrency.split(',') if c):
+            result = run_step(base_url, logins, concurrency, args, args.seed + step)
+            results.append(result)
+            if not result.get('requests'):
+                print(f"{concurrency:>8} {'-':>7}  no completed requests")
+                continue
+            print(f"{concurrency:>8} {result['requests']:>7} {result['throughput_rps']:>8.1f} "
+                  f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                  f"{result['error_rate']:>7.1%} {result['login'] or 0:>9.1f}", flush=True)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'dataset': args.dataset, 'workers': args.workers, 'threads': args.threads,
+                       'steps': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Run the endpoint benchmarks and compare them with saved baselines.
+
+Each dataset is generated once into ``benchmarks/.data/<name>.db`` (SQLite,
+deterministic seed) and measured in a separate worker process. Results are
+written to ``benchmarks/results/latest.json``. With ``--save-baseline`` they
+become the new baselines in ``benchmarks/baselines/<dataset>.json``;
+otherwise every case is compared with its baseline and the run exits with
+status 1 when
+
+* p50 or p95 latency exceeds baseline * (1 + --latency-tolerance) + --latency-slack-ms, or
+* the query count exceeds the baseline by more than --query-tolerance, or
+* the HTTP status changed.
+
+Latency baselines are machine-specific; record them on the machine (or CI
+runner class) that enforces them. Query counts are deterministic.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import asdict
+
+from .scenarios import DATASETS, DEFAULT_DATASETS
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+
+
+def _worker(dataset_path, *worker_args):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{dataset_path}', SQL_SLOW_QUERY_MS='60000')
+    env.pop('SQLALCHEMY_DATABASE_URI', None)
+    return subprocess.run(
+        [sys.executable, '-m', 'benchmarks.worker', *worker_args],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.PIPE, text=True,
+    )
+
+
+def ensure_dataset(name, data_dir):
+    """Generate the dataset once; later runs reuse the file (migrations are applied on each run)."""
+    path = os.path.join(data_dir, f'{name}-seed{DATASETS[name].seed}.db')
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    for leftover in (tmp_path, f'{tmp_path}-wal', f'{tmp_path}-shm'):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    print(f"Generating dataset '{name}' ...", file=sys.stderr)
+    result = _worker(tmp_path, '--generate', name)
+    if result.returncode != 0:
+        raise SystemExit(f"Dataset generation failed for '{name}'")
+    # Fold the WAL back into the main file before renaming it
+    import sqlite3
+    connection = sqlite3.connect(tmp_path)
+    connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    connection.execute('PRAGMA journal_mode=DELETE')
+    connection.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def compare(dataset, current, baseline, args):
+    """Return a list of regression messages for one dataset."""
+    problems = []
+    for key, base in baseline.get('cases', {}).items():
+        now = current['cases'].get(key)
+        if now is None:
+            continue
+        if now['status'] != base['status']:
+            problems.append(f"{dataset} {key}: HTTP {base['status']} -> {now['status']}")
+        if now['queries'] > base['queries'] + args.query_tolerance:
+            problems.append(f"{dataset} {key}: queries {base['queries']} -> {now['queries']}")
+        for metric in ('p50_ms', 'p95_ms'):
+            limit = base[metric] * (1 + args.latency_tolerance) + args.latency_slack_ms
+            if now[metric] > limit:
+                problems.append(f"{dataset} {key}: {metric} {base[metric]:.2f} -> {now[metric]:.2f} "
+                                f"(limit {limit:.2f})")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Endpoint benchmarks with regression gates.')
+    parser.add_argument('--datasets', default=','.join(DEFAULT_DATASETS),
+                        help=f"Comma-separated datasets ({', '.join(DATASETS)})")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--heavy-iterations', type=int, default=3, help='Iterations for export cases')
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', default='', help='Comma-separated case names to run')
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, '.data'))
+    parser.add_argument('--baseline-dir', default=os.path.join(BENCH_DIR, 'baselines'))
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results', 'latest.json'))
+    parser.add_argument('--save-baseline', action='store_true', help='Store results as the new baselines')
+    parser.add_argument('--latency-tolerance', type=float, default=0.25, help='Allowed relative slowdown')
+    parser.add_argument('--latency-slack-ms', type=float, default=5.0, help='Allowed absolute slowdown')
+    parser.add_argument('--query-tolerance', type=int, default=0, help='Allowed extra queries per request')
+    args = parser.parse_args(argv)
+
+    datasets = [name for name in args.datasets.split(',') if name]
+    unknown = [name for name in datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+
+    all_results = {}
+    problems = []
+    for name in datasets:
+        path = ensure_dataset(name, args.data_dir)
+        print(f"Benchmarking '{name}' ({DATASETS[name].credentials:,} credentials)", file=sys.stderr)
+        worker_args = ['--iterations', str(args.iterations), '--heavy-iterations', str(args.heavy_iterations),
+                       '--warmup', str(args.warmup)]
+        if args.only:
+            worker_args += ['--only', args.only]
+        result = _worker(path, *worker_args)
+        if result.returncode != 0:
+            raise SystemExit(f"Benchmark worker failed for '{name}'")
+        current = json.loads(result.stdout)
+        current.update({
+            'dataset': name,
+            'spec': {k: str(v) if k == 'anchor' else v for k, v in asdict(DATASETS[name]).items()},
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        })
+        all_results[name] = current
+
+        baseline_path = os.path.join(args.baseline_dir, f'{name}.json')
+        if args.save_baseline:
+            os.makedirs(args.baseline_dir, exist_ok=True)
+            with open(baseline_path, 'w') as f:
+                json.dump(current, f, indent=2, sort_keys=True)
+            print(f"✓ Saved baseline {baseline_path}", file=sys.stderr)
+        elif os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                problems += compare(name, current, json.load(f), args)
+        else:
+            print(f"No baseline for '{name}' (run with --save-baseline)", file=sys.stderr)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(all_results, f, indent=2, sort_keys=True)
+
+    if problems:
+        print("\nPerformance regressions:", file=sys.stderr)
+        for problem in problems:
+            print(f"  ✗ {problem}", file=sys.stderr)
+        return 1
+    print("\n✓ No performance regressions", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
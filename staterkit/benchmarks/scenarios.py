@@ -0,0 +1,61 @@
+"""
+Datasets and endpoint cases measured by the benchmark suite.
+"""
+from datetime import datetime
+
+from cuba.services.datagen import DatasetSpec
+
+
+# Fixed anchor so every machine generates byte-identical datasets
+ANCHOR = datetime(2026, 1, 1)
+
+DATASETS = {
+    'small': DatasetSpec(companies=20, users_per_company=2, credentials=5_000,
+                         notifications_per_user=20, audit_rows=2_000, seed=1, anchor=ANCHOR),
+    'medium': DatasetSpec(companies=100, users_per_company=3, credentials=50_000,
+                          notifications_per_user=50, audit_rows=20_000, seed=2, anchor=ANCHOR),
+    'large': DatasetSpec(companies=300, users_per_company=3, credentials=500_000,
+                         notifications_per_user=100, audit_rows=200_000, seed=3, anchor=ANCHOR),
+}
+DEFAULT_DATASETS = ('small', 'medium')
+
+# Logins created by the data generator (see cuba/services/datagen.py)
+USERS = {
+    'admin': ('admin@dseclab.com', 'admin123'),
+    # Member of the largest tenant, so watchlist filtering covers the most rows
+    'member': ('analyst0@techcorp.com', 'admin123'),
+}
+
+LIST_URL = '/threat-intelligence/breached-creds'
+EXPORT_URL = '/threat-intelligence/breached-creds/export'
+
+# (case name, role, url)
+CASES = [
+    ('index', 'admin', '/'),
+    ('index', 'member', '/'),
+    ('breached_creds_list', 'admin', LIST_URL),
+    ('breached_creds_list', 'member', LIST_URL),
+    ('breached_creds_list?type', 'member', f'{LIST_URL}?type=stealer'),
+    ('breached_creds_list?source', 'member', f'{LIST_URL}?source=Telegram'),
+    ('breached_creds_list?domain', 'admin', f'{LIST_URL}?domain=techcorp'),
+    ('breached_creds_list?search', 'member', f'{LIST_URL}?search=smith'),
+    ('breached_creds_list?date_today', 'member', f'{LIST_URL}?date_filter=today'),
+    ('breached_creds_list?date_week', 'member', f'{LIST_URL}?date_filter=week'),
+    ('breached_creds_list?date_month', 'member', f'{LIST_URL}?date_filter=month'),
+    ('breached_creds_list?page5', 'admin', f'{LIST_URL}?page=5'),
+    ('analysis', 'admin', '/threat-intelligence/analysis'),
+    ('analysis', 'member', '/threat-intelligence/analysis'),
+    ('api_search', 'admin', '/api/search?q=smith'),
+    ('api_search', 'member', '/api/search?q=smith'),
+    ('api_notifications', 'member', '/api/notifications'),
+    ('api_notifications?unread', 'member', '/api/notifications?unread_only=1&limit=20'),
+    ('export_csv', 'member', f'{EXPORT_URL}?format=csv'),
+    ('export_json', 'member', f'{EXPORT_URL}?format=json'),
+    ('export_xlsx', 'member', f'{EXPORT_URL}?format=xlsx'),
+    ('export_pdf', 'member', f'{EXPORT_URL}?format=pdf'),
+    ('company_management', 'admin', '/admin/companies'),
+]
+
+
+def case_key(name: str, role: str) -> str:
+    return f'{name}[{role}]'
@@ -0,0 +1,70 @@
+"""
+Minimal pre-forking WSGI server for load tests when gunicorn is not installed.
+
+The parent binds the listening socket and forks ``--workers`` children; each
+child imports the application *after* the fork (so no database connection is
+shared between processes) and serves requests from the shared socket with
+werkzeug, optionally threaded.
+
+    python -m benchmarks.serve --port 8100 --workers 4 --threads 1
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+
+
+def _serve_child(sock, threads):
+    from werkzeug.serving import make_server
+
+    from cuba import create_app
+
+    server = make_server(sock.getsockname()[0], sock.getsockname()[1], create_app(),
+                         threaded=threads > 1, fd=sock.fileno())
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-forking werkzeug server for load tests.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=1, help='Threads per worker (werkzeug threaded mode)')
+    args = parser.parse_args(argv)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(512)
+    sock.set_inheritable(True)
+
+    children = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                _serve_child(sock, args.threads)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers", file=sys.stderr, flush=True)
+    for pid in children:
+        os.waitpid(pid, 0)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
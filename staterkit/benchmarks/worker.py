@@ -0,0 +1,114 @@
+"""
+Benchmark worker: measures every case against one dataset.
+
+Runs in its own process because the application reads DATABASE_URL at import
+time. Prints one JSON document to stdout::
+
+    {"cases": {"<case>[<role>]": {"p50_ms": .., "p95_ms": .., "queries": .., "status": ..}}}
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+from sqlalchemy import event
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    # Smallest value with at least pct% of the samples at or below it; multiplying
+    # before dividing keeps e.g. 95% of 20 at exactly rank 19
+    index = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100.0) - 1))
+    return ordered[index]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure endpoint latency and query counts.')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--heavy-iterations', type=int, default=3, help='Iterations for export cases')
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', default='', help='Comma-separated case names to run')
+    parser.add_argument('--generate', metavar='DATASET', help='Create the schema and generate DATASET, then exit')
+    args = parser.parse_args(argv)
+
+    from flask_migrate import upgrade
+
+    from cuba import create_app, db
+    from .scenarios import CASES, DATASETS, USERS, case_key
+
+    app = create_app()
+    with app.app_context():
+        # Benchmarks run against the migrated schema, including indexes added by later revisions
+        upgrade(directory=MIGRATIONS_DIR)
+        if args.generate:
+            from cuba.services.datagen import generate_dataset
+            counts = generate_dataset(DATASETS[args.generate])
+            print(f"  generated {args.generate}: {counts}", file=sys.stderr)
+            return 0
+
+    # Measure the request path, not log formatting
+    logging.getLogger('cuba.sql').setLevel(logging.WARNING)
+    app.config['WTF_CSRF_ENABLED'] = False
+
+    query_count = [0]
+
+    def count_query(*_):
+        query_count[0] += 1
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+
+    clients = {}
+    for role, (email, password) in USERS.items():
+        client = app.test_client()
+        response = client.post('/login', data={'email': email, 'password': password})
+        if response.status_code != 302:
+            print(f"Login failed for {email}: HTTP {response.status_code}", file=sys.stderr)
+            return 2
+        clients[role] = client
+
+    only = {name for name in args.only.split(',') if name}
+    results = {}
+    for name, role, url in CASES:
+        if only and name not in only:
+            continue
+        client = clients[role]
+        iterations = args.heavy_iterations if name.startswith('export') else args.iterations
+        for _ in range(args.warmup):
+            client.get(url)
+
+        timings, queries, status = [], [], None
+        for _ in range(iterations):
+            query_count[0] = 0
+            started = time.perf_counter()
+            response = client.get(url)
+            response.get_data()
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(query_count[0])
+            status = response.status_code
+
+        result = {
+            'url': url,
+            'status': status,
+            'iterations': iterations,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'queries': max(queries),
+        }
+        results[case_key(name, role)] = result
+        print(f"  {case_key(name, role):<45} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms"
+              f"  {result['queries']:>4} queries  HTTP {status}", file=sys.stderr)
+
+    json.dump({'cases': results}, sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,11 +2,12 @@
 """
 Script to clear all breached credential data
 """
-from cuba import app, db
+from cuba import create_app, db
 from cuba.models import BreachedCredential
 
 def clear_breached_data():
     """Clear all breached credential data"""
+    app = create_app()
     with app.app_context():
         count = BreachedCredential.query.count()
         print(f"Found {count} breached credentials to delete...")
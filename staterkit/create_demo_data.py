@@ -1,239 +1,96 @@
 #!/usr/bin/env python
 """
-Script to create demo data for the Threat Intelligence Platform
-Creates 4 companies with 20 breached credentials each (80 total)
-"""
-import random
-from datetime import date, timedelta, datetime
-from cuba import app, db
-from cuba.models import Company, BreachedCredential, User
-
-# Company data
-COMPANIES = [
-    {
-        'name': 'TechCorp Bank',
-        'domain': 'techcorp.com',
-        'company_type': 'bank'
-    },
-    {
-        'name': 'Global Telecom',
-        'domain': 'globaltel.com',
-        'company_type': 'operator'
-    },
-    {
-        'name': 'National Security Agency',
-        'domain': 'nsa.gov',
-        'company_type': 'government'
-    },
-    {
-        'name': 'Mega Retail Inc',
-        'domain': 'megaretail.com',
-        'company_type': 'other'
-    }
-]
-
-# Leak types
-LEAK_TYPES = ['combolist', 'stealer', 'malware', 'pastebin', 'breach', 'phishing', 'darkweb']
-
-# Leak categories
-LEAK_CATEGORIES = ['consumer', 'corporate']
-
-# Status options
-STATUS_OPTIONS = ['active', 'new']
-
-# Sample names for generating emails
-FIRST_NAMES = ['john', 'jane', 'mike', 'sarah', 'david', 'emily', 'chris', 'lisa', 'robert', 'amanda',
-               'james', 'jennifer', 'william', 'michelle', 'richard', 'karen', 'joseph', 'nancy',
-               'thomas', 'betty', 'charles', 'helen', 'daniel', 'sandra', 'matthew', 'donna']
-
-LAST_NAMES = ['smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis', 'rodriguez',
-              'martinez', 'hernandez', 'lopez', 'wilson', 'anderson', 'thomas', 'taylor', 'moore',
-              'jackson', 'martin', 'lee', 'thompson', 'white', 'harris', 'sanchez', 'clark']
-
-# IP address ranges for generating IPs
-IP_RANGES = [
-    '192.168.1.',
-    '10.0.0.',
-    '172.16.0.',
-    '203.0.113.',
-    '198.51.100.'
-]
-
-# Device info samples
-DEVICE_INFOS = [
-    'Windows 10 Pro',
-    'Windows 11 Enterprise',
-    'macOS 13.5',
-    'Ubuntu 22.04',
-    'Android 12',
-    'iOS 16.5',
-    'Chrome Browser',
-    'Firefox Browser',
-    'Edge Browser'
-]
+Script to create demo, load-test and benchmark data for the Threat Intelligence Platform
 
-# Sources
-SOURCES = [
-    'Dark Web Marketplace',
-    'Pastebin',
-    'Telegram Channel',
-    'Data Breach Forum',
-    'Stealer Log',
-    'Malware Analysis',
-    'Threat Intelligence Feed',
-    'Security Researcher'
-]
+Without arguments it creates the classic demo set (4 companies, 80 breached
+credentials). Larger datasets are generated with skewed distributions and
+bulk inserts, deterministically for a given --seed:
 
+    python create_demo_data.py --companies 500 --credentials 10000000 --seed 7
 
-def generate_email(domain, first_name, last_name, index):
-    """Generate email address"""
-    patterns = [
-        f"{first_name}.{last_name}@{domain}",
-        f"{first_name}{last_name}@{domain}",
-        f"{first_name}{index}@{domain}",
-        f"{last_name}.{first_name}@{domain}",
-        f"{first_name[0]}{last_name}@{domain}",
-    ]
-    return random.choice(patterns).lower()
-
-
-def generate_ip_address():
-    """Generate random IP address"""
-    base = random.choice(IP_RANGES)
-    last_octet = random.randint(1, 254)
-    return f"{base}{last_octet}"
-
+The target database is taken from DATABASE_URL (see cuba/database.py).
+"""
+import argparse
+import time
+from datetime import datetime
+
+from cuba import create_app, db
+from cuba.models import BreachedCredential, Company
+from cuba.services.datagen import DatasetSpec, generate_dataset
+
+
+def parse_args(argv=None):
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--companies', type=int, default=defaults.companies, help='Number of companies')
+    parser.add_argument('--users-per-company', type=int, default=defaults.users_per_company)
+    parser.add_argument('--watchlist-per-company', type=int, default=defaults.watchlist_per_company)
+    parser.add_argument('--credentials', type=int, default=defaults.credentials,
+                        help='Breached credentials to append')
+    parser.add_argument('--notifications-per-user', type=int, default=defaults.notifications_per_user)
+    parser.add_argument('--audit-rows', type=int, default=defaults.audit_rows)
+    parser.add_argument('--days', type=int, default=defaults.days, help='Spread of created_at in days')
+    parser.add_argument('--freemail-share', type=float, default=defaults.freemail_share,
+                        help='Share of credentials on consumer mail domains (0-1)')
+    parser.add_argument('--skew', type=float, default=defaults.skew,
+                        help='Zipf exponent of the company distribution')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--anchor-date', type=datetime.fromisoformat, default=None,
+                        help='Date treated as "now" for generated timestamps (YYYY-MM-DD); default today')
+    parser.add_argument('--batch-size', type=int, default=defaults.batch_size, help='Rows per executemany')
+    parser.add_argument('--commit-every', type=int, default=defaults.commit_every, help='Rows per transaction')
+    parser.add_argument('--password', default='admin123', help='Password for generated users')
+    parser.add_argument('--create-tables', action='store_true',
+                        help='Create missing tables first (for throwaway benchmark databases)')
+    return parser.parse_args(argv)
+
+
+def create_demo_data(argv=None):
+    """Create demo data for companies and breached credentials"""
+    args = parse_args(argv)
+    spec = DatasetSpec(
+        companies=args.companies,
+        users_per_company=args.users_per_company,
+        watchlist_per_company=args.watchlist_per_company,
+        credentials=args.credentials,
+        notifications_per_user=args.notifications_per_user,
+        audit_rows=args.audit_rows,
+        days=args.days,
+        freemail_share=args.freemail_share,
+        skew=args.skew,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        commit_every=args.commit_every,
+        anchor=args.anchor_date,
+    )
+
+    app = create_app()
+    with app.app_context():
+        if args.create_tables:
+            db.create_all()
 
-def generate_date_range(days_back=90):
-    """Generate random date within range"""
-    start_date = date.today() - timedelta(days=days_back)
-    end_date = date.today()
-    days_between = (end_date - start_date).days
-    random_days = random.randint(0, days_between)
-    return start_date + timedelta(days=random_days)
+        started = time.perf_counter()
 
+        def report(table, rows):
+            print(f"  ✓ {table}: {rows:,} rows ({time.perf_counter() - started:.1f}s)")
 
-def create_demo_data():
-    """Create demo data for companies and breached credentials"""
-    with app.app_context():
-        # Get or create admin user for created_by field
-        admin_user = User.query.filter_by(role='admin').first()
-        if not admin_user:
-            # Create a default admin user if none exists
-            admin_user = User(
-                username='admin',
-                email='admin@dseclab.com',
-                role='admin',
-                isAdmin=True,
-                is_active=True
-            )
-            admin_user.set_password('admin123')
-            db.session.add(admin_user)
-            db.session.commit()
-            print("Created admin user for demo data")
+        print(f"Generating dataset (seed {spec.seed}) into {db.engine.url.render_as_string(hide_password=True)}")
+        counts = generate_dataset(spec, password=args.password, progress=report)
+        elapsed = time.perf_counter() - started
 
-        companies_created = []
-        
-        # Create companies and their breached credentials
-        for company_data in COMPANIES:
-            # Get or create company
-            company = Company.query.filter_by(domain=company_data['domain']).first()
-            if not company:
-                company = Company(
-                    name=company_data['name'],
-                    domain=company_data['domain'],
-                    company_type=company_data['company_type'],
-                    description=f"Demo company: {company_data['name']}"
-                )
-                db.session.add(company)
-                db.session.commit()
-                print(f"✓ Created company: {company_data['name']} ({company_data['domain']})")
-            else:
-                print(f"✓ Company already exists: {company_data['name']} ({company_data['domain']})")
-            
-            companies_created.append(company)
-            
-            # Create 20 breached credentials for this company
-            existing_count = BreachedCredential.query.filter_by(domain=company.domain).count()
-            needed = 20 - existing_count
-            
-            if needed > 0:
-                print(f"  Creating {needed} breached credentials for {company.domain}...")
-                
-                for i in range(needed):
-                    # Random data generation
-                    first_name = random.choice(FIRST_NAMES)
-                    last_name = random.choice(LAST_NAMES)
-                    leak_type = random.choice(LEAK_TYPES)
-                    source = random.choice(SOURCES)
-                    
-                    # Generate username (can be email format or just username)
-                    if random.random() > 0.5:  # 50% chance of email format
-                        username = generate_email(company.domain, first_name, last_name, i)
-                    else:
-                        username = f"{first_name.lower()}{random.randint(1, 999)}"
-                    
-                    # Generate domain (use company domain or random domain)
-                    domain = company.domain
-                    if random.random() > 0.8:  # 20% chance of different domain
-                        domain = random.choice(['example.com', 'test.com', 'demo.org'])
-                    
-                    # Generate password (30% chance of having password)
-                    password = None
-                    if random.random() > 0.7:
-                        password = f"Pass{random.randint(1000, 9999)}!"
-                    
-                    # Generate URL (40% chance)
-                    url = None
-                    if random.random() > 0.6:
-                        url = f"https://{random.choice(['pastebin.com', 'github.com', 'example.com'])}/leak/{random.randint(1000, 9999)}"
-                    
-                    # Generate _id, _index, _score (Elasticsearch-like fields)
-                    _id = f"breach_{company.domain}_{i}_{random.randint(10000, 99999)}"
-                    _index = random.choice(['breaches-2024', 'leaks-2024', 'credentials-2024'])
-                    _score = round(random.uniform(0.5, 10.0), 2) if random.random() > 0.3 else None
-                    _ignored = random.random() > 0.9  # 10% chance of being ignored
-                    
-                    # Create breached credential with new field structure
-                    credential = BreachedCredential(
-                        _id=_id,
-                        _index=_index,
-                        _score=_score,
-                        _ignored=_ignored,
-                        username=username,
-                        domain=domain,
-                        password=password,
-                        source=source,
-                        type=leak_type,
-                        url=url,
-                        is_marked=random.random() > 0.7,  # 30% chance of being marked
-                        company_id=company.id,
-                        created_by=admin_user.id
-                    )
-                    
-                    db.session.add(credential)
-                
-                db.session.commit()
-                print(f"  ✓ Created {needed} breached credentials for {company.domain}")
-            else:
-                print(f"  ✓ Already have 20+ credentials for {company.domain}")
-        
         # Summary
         print("\n" + "="*50)
         print("Demo Data Creation Summary:")
         print("="*50)
-        for company in companies_created:
-            count = BreachedCredential.query.filter_by(domain=company.domain).count()
-            print(f"  {company.name} ({company.domain}): {count} credentials")
-        
-        total_creds = BreachedCredential.query.count()
-        total_companies = Company.query.count()
-        print(f"\nTotal Companies: {total_companies}")
-        print(f"Total Breached Credentials: {total_creds}")
+        for table, rows in counts.items():
+            print(f"  {table}: {rows:,} written")
+        print(f"\nTotal Companies: {Company.query.count():,}")
+        print(f"Total Breached Credentials: {BreachedCredential.query.count():,}")
+        if counts.get('breached_credential'):
+            print(f"Credential insert rate: {counts['breached_credential'] / elapsed:,.0f} rows/s overall")
         print("="*50)
         print("\n✓ Demo data creation completed!")
 
 
 if __name__ == '__main__':
     create_demo_data()
-
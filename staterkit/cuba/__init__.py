@@ -6,56 +6,244 @@ from flask_login import LoginManager, current_user
 # from flask_admin.contrib.sqla import ModelView
 from flask_assets import Environment
 from flask_wtf.csrf import CSRFProtect
-from flask_caching import Cache
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from datetime import timedelta
 import os
 
-app = Flask(__name__)
+from .bloom import init_identity_filter
+from .database import configure_database, init_database, is_read_only
+from .forwarder import init_forwarder
+from .metrics import InstrumentedCache, init_metrics
+from .profiling import init_profiling
+from .sql_instrumentation import init_sql_instrumentation
+from .static_assets import init_static_assets
+from .templating import init_template_cache
+from .throttle import init_login_throttle
+from .webhooks import init_webhooks
+
+# Extensions are created unbound and attached to each app in create_app(), so
+# modules can keep importing ``db`` and ``cache`` from the package
+db = SQLAlchemy()
+csrf = CSRFProtect()
+jwt = JWTManager()
+assets = Environment()
+# Lookups are counted per key namespace (see cuba/metrics.py)
+cache = InstrumentedCache()
+
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
+login_manager.login_message_category = "warning"
 
 
-assets = Environment(app)
+@login_manager.user_loader
+def load_user(user_id):
+    from .identity import load_identity
+    return load_identity(user_id)
 
-# Security Configuration
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'e5b446169dd49e3b7f1bb841-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///cuba.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # Performance: Disable modification tracking
-app.config['SQLALCHEMY_ECHO'] = False  # Performance: Disable SQL query logging in production
-app.config['WTF_CSRF_ENABLED'] = True
-app.config['WTF_CSRF_TIME_LIMIT'] = 3600
-app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production with HTTPS
-app.config['SESSION_COOKIE_HTTPONLY'] = True
-app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
-app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 hour
 
-# JWT configuration (for API authentication)
-app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', app.config['SECRET_KEY'])
-app.config['JWT_TOKEN_LOCATION'] = ['headers']
-app.config['JWT_HEADER_NAME'] = 'Authorization'
-app.config['JWT_HEADER_TYPE'] = 'Bearer'
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(minutes=15)
+@jwt.user_lookup_loader
+def load_jwt_user(_jwt_header, jwt_data):
+    from .identity import load_identity
+    return load_identity(jwt_data['sub'])
 
-# Performance: Caching configuration
-app.config['CACHE_TYPE'] = 'simple'  # Use 'redis' or 'memcached' in production
-app.config['CACHE_DEFAULT_TIMEOUT'] = 300  # 5 minutes
 
-# Initialize CSRF protection
-csrf = CSRFProtect(app)
+def create_app(config=None):
+    """
+    Application factory.
+
+    Args:
+        config: Optional mapping applied on top of the environment-based defaults
+            (e.g. ``{'SQLALCHEMY_DATABASE_URI': ..., 'TESTING': True}``)
 
-# Make CSRF token available in all templates
-@app.context_processor
-def inject_csrf_token():
-    from flask_wtf.csrf import generate_csrf
-    return dict(csrf_token=generate_csrf)
+    Blueprints are imported here rather than at package import, so scripts that
+    only need the models do not load the views, and export backends
+    (openpyxl, reportlab) are imported on the first export only.
+    """
+    config = dict(config or {})
+    app = Flask(__name__)
+
+    assets.init_app(app)
+
+    # Security Configuration
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'e5b446169dd49e3b7f1bb841-change-in-production')
+    # Database: URI, pool sizing and timeouts come from the environment (see cuba/database.py)
+    configure_database(app, config.pop('SQLALCHEMY_DATABASE_URI', None))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # Performance: Disable modification tracking
+    app.config['SQLALCHEMY_ECHO'] = False  # Performance: Disable SQL query logging in production
+    # Per-request SQL stats, Server-Timing header and slow query log (see cuba/sql_instrumentation.py)
+    app.config['SQL_SLOW_QUERY_MS'] = int(os.environ.get('SQL_SLOW_QUERY_MS', 200))
+    app.config['SQL_SLOW_QUERY_LOG'] = os.environ.get('SQL_SLOW_QUERY_LOG')
+    # Prometheus metrics at /metrics (see cuba/metrics.py)
+    app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR')
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+    app.config['METRICS_INTERNAL_PORT'] = os.environ.get('METRICS_INTERNAL_PORT')
+    # On-demand cProfile of single requests for admins (see cuba/profiling.py)
+    app.config['PROFILING_ENABLED'] = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes', 'on')
+    app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR')
+    # Fingerprinted, precompressed static files once "flask static build" has run (see cuba/static_assets.py)
+    app.config['STATIC_FINGERPRINT'] = os.environ.get('STATIC_FINGERPRINT', '1').lower() not in ('0', 'false', 'no', 'off')
+    # Compiled templates shared by all workers; "flask templates compile" warms it (see cuba/templating.py)
+    app.config['TEMPLATE_BYTECODE_CACHE'] = os.environ.get('TEMPLATE_BYTECODE_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+    app.config['TEMPLATE_CACHE_DIR'] = os.environ.get('TEMPLATE_CACHE_DIR')
+    # ETag/304 on the dashboard, /api/search and /api/notifications (see cuba/conditional.py)
+    app.config['CONDITIONAL_GET'] = os.environ.get('CONDITIONAL_GET', '1').lower() not in ('0', 'false', 'no', 'off')
+    app.config['WTF_CSRF_ENABLED'] = True
+    app.config['WTF_CSRF_TIME_LIMIT'] = 3600
+    app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production with HTTPS
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+    app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 hour
+
+    # JWT configuration (for API authentication)
+    app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', app.config['SECRET_KEY'])
+    app.config['JWT_TOKEN_LOCATION'] = ['headers']
+    app.config['JWT_HEADER_NAME'] = 'Authorization'
+    app.config['JWT_HEADER_TYPE'] = 'Bearer'
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(minutes=15)
+
+    # Performance: Caching configuration
+    app.config['CACHE_TYPE'] = os.environ.get('CACHE_TYPE', 'SimpleCache')  # Use 'RedisCache' or 'MemcachedCache' in production
+    app.config['CACHE_DEFAULT_TIMEOUT'] = 300  # 5 minutes
+    # User/company/watchlist snapshot per authenticated request, 0 disables (see cuba/identity.py)
+    app.config['IDENTITY_CACHE_TTL'] = int(os.environ.get('IDENTITY_CACHE_TTL', 60))
+    # Algorithm and cost for new password hashes; older hashes are upgraded on login (see cuba/passwords.py)
+    app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Failed-login limits per IP and per email; 'cache' shares counters between workers (see cuba/throttle.py)
+    app.config['LOGIN_THROTTLE_ENABLED'] = os.environ.get('LOGIN_THROTTLE_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off')
+    app.config['LOGIN_THROTTLE_BACKEND'] = os.environ.get('LOGIN_THROTTLE_BACKEND', 'memory')
+    app.config['LOGIN_THROTTLE_WINDOW'] = int(os.environ.get('LOGIN_THROTTLE_WINDOW', 300))
+    app.config['LOGIN_THROTTLE_IP_LIMIT'] = int(os.environ.get('LOGIN_THROTTLE_IP_LIMIT', 30))
+    app.config['LOGIN_THROTTLE_EMAIL_LIMIT'] = int(os.environ.get('LOGIN_THROTTLE_EMAIL_LIMIT', 5))
+    # Reverse proxies in front of the app whose X-Forwarded-* headers are trusted; 0 = use the socket address
+    app.config['TRUSTED_PROXY_HOPS'] = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+    # Shared-cache lifetime of /api/v1/range responses (see cuba/services/password_index.py)
+    app.config['PASSWORD_RANGE_MAX_AGE'] = int(os.environ.get('PASSWORD_RANGE_MAX_AGE', 3600))
+    # Memory-mapped "never breached" filter for identity lookups; built with 'flask bloom build' (see cuba/bloom.py)
+    app.config['BLOOM_FILTER_ENABLED'] = os.environ.get('BLOOM_FILTER_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off')
+    app.config['BLOOM_FILTER_PATH'] = os.environ.get('BLOOM_FILTER_PATH')
+    # Push new tenant matches to a SIEM as CEF/JSON syslog: tcp://, udp:// or file:// (see cuba/forwarder.py)
+    app.config['FORWARDER_URL'] = os.environ.get('FORWARDER_URL')
+    app.config['FORWARDER_FORMAT'] = os.environ.get('FORWARDER_FORMAT', 'cef')
+    app.config['FORWARDER_SPOOL_DIR'] = os.environ.get('FORWARDER_SPOOL_DIR')
+    # Per-company webhooks; web processes deliver from a thread unless 'flask webhooks run' does it (see cuba/webhooks.py)
+    app.config['WEBHOOKS_DISPATCH'] = os.environ.get('WEBHOOKS_DISPATCH', '1').lower() not in ('0', 'false', 'no', 'off')
+    app.config['WEBHOOK_WORKERS'] = int(os.environ.get('WEBHOOK_WORKERS', 8))
+    app.config['WEBHOOK_TIMEOUT'] = float(os.environ.get('WEBHOOK_TIMEOUT', 10))
+
+    app.config.update(config)
+
+    if app.config['TRUSTED_PROXY_HOPS']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        hops = app.config['TRUSTED_PROXY_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
+    # Initialize CSRF protection
+    csrf.init_app(app)
+
+    # Make CSRF token available in all templates
+    @app.context_processor
+    def inject_csrf_token():
+        from flask_wtf.csrf import generate_csrf
+        return dict(csrf_token=generate_csrf)
+
+    # Provide default breadcrumb if not set
+    @app.context_processor
+    def inject_default_breadcrumb():
+        return dict(breadcrumb=None)
+
+    app.add_template_filter(format_number_filter, 'format_number')
+    init_static_assets(app)
+    init_template_cache(app)
+
+    db.init_app(app)
+    init_database(app, db)
+    init_sql_instrumentation(app, db)
+    init_metrics(app)
+    init_profiling(app)
+    if not is_read_only():
+        # Alembic is only needed by ``flask db`` and is slow to import; a read-only
+        # deployment can never migrate. Batch mode lets Alembic emulate ALTER on
+        # SQLite; one transaction per revision keeps long data migrations from
+        # holding a single lock for the whole upgrade
+        from flask_migrate import Migrate
+        Migrate(app, db, render_as_batch=True, transaction_per_migration=True)
+    jwt.init_app(app)
+    cache.init_app(app)
+    init_login_throttle(app)
+    init_identity_filter(app)
+    init_forwarder(app)
+    init_webhooks(app)
+
+    app.after_request(add_security_headers)
+    login_manager.init_app(app)
+
+    from .routes import main as main_blueprint
+    app.register_blueprint(main_blueprint)
+
+    from .auth import auth as auth_blueprint
+    # The JSON login returns a bearer token and never touches the session cookie
+    csrf.exempt('cuba.auth.api_login')
+    app.register_blueprint(auth_blueprint)
+
+    from .threat_intel import threat_intel as threat_intel_blueprint
+    app.register_blueprint(threat_intel_blueprint)
+
+    from .admin_routes import admin_bp as admin_blueprint
+    app.register_blueprint(admin_blueprint)
+
+    from .search_routes import search_bp as search_blueprint
+    app.register_blueprint(search_blueprint)
+
+    from .notification_routes import notification_bp as notification_blueprint
+    app.register_blueprint(notification_blueprint)
+
+    from .metrics_routes import metrics_bp as metrics_blueprint
+    app.register_blueprint(metrics_blueprint)
+
+    from .api import api_bp as api_blueprint
+    # Bearer-token API: no cookie session to forge requests with
+    csrf.exempt(api_blueprint)
+    app.register_blueprint(api_blueprint)
+
+    from .cli import register_cli
+    register_cli(app)
+
+    app.register_error_handler(403, forbidden_error)
+    app.register_error_handler(404, not_found_error)
+    app.register_error_handler(500, internal_error)
+
+    # Optional: SassMiddleware for on-the-fly SCSS compilation
+    # Note: CSS files are already compiled and available in static/assets/css
+    # Uncomment the following lines if you need live SCSS compilation:
+    # try:
+    #     from sassutils.wsgi import SassMiddleware
+    #     app.wsgi_app = SassMiddleware(app.wsgi_app, {
+    #         'cuba': ('static/assets/scss', 'static/assets/css', '/static/assets/css')
+    #     })
+    # except ImportError:
+    #     # SassMiddleware not available, using pre-compiled CSS files
+    #     pass
+
+    return app
+
+
+_default_app = None
+
+
+def __getattr__(name):
+    """
+    ``from cuba import app`` keeps working for existing scripts: the first access
+    builds an app from the environment, later ones return the same instance.
+    """
+    global _default_app
+    if name == 'app':
+        if _default_app is None:
+            _default_app = create_app()
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Provide default breadcrumb if not set
-@app.context_processor
-def inject_default_breadcrumb():
-    return dict(breadcrumb=None)
 
 # Custom Jinja2 filter for number formatting
-@app.template_filter('format_number')
 def format_number_filter(value):
     """Format number with commas"""
     try:
@@ -64,15 +252,6 @@ def format_number_filter(value):
         return value
 
 
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-
-# Initialize caching for performance
-cache = Cache(app)
-
-
-@app.after_request
 def add_security_headers(response):
     """
     Add common security headers to all responses.
@@ -93,18 +272,6 @@ def add_security_headers(response):
     )
     return response
 
-# Optional: SassMiddleware for on-the-fly SCSS compilation
-# Note: CSS files are already compiled and available in static/assets/css
-# Uncomment the following lines if you need live SCSS compilation:
-# try:
-#     from sassutils.wsgi import SassMiddleware
-#     app.wsgi_app = SassMiddleware(app.wsgi_app, {
-#         'cuba': ('static/assets/scss', 'static/assets/css', '/static/assets/css')
-#     })
-# except ImportError:
-#     # SassMiddleware not available, using pre-compiled CSS files
-#     pass
-
 
 # Admin panel removed
 # class UserModelView(ModelView):
@@ -132,59 +299,19 @@ def add_security_headers(response):
 # admin = Admin(app,index_view=cubaAdminIndexView())
 
 
-login_manager = LoginManager()
-login_manager.login_view = 'auth.login'
-login_manager.login_message_category = "warning"
-login_manager.init_app(app)
-
-
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
-
-from .routes import main as main_blueprint
-app.register_blueprint(main_blueprint)
-
-from .auth import auth as auth_blueprint
-app.register_blueprint(auth_blueprint)
-
-from .threat_intel import threat_intel as threat_intel_blueprint
-app.register_blueprint(threat_intel_blueprint)
-
-from .admin_routes import admin_bp as admin_blueprint
-app.register_blueprint(admin_blueprint)
-
-from .search_routes import search_bp as search_blueprint
-app.register_blueprint(search_blueprint)
-
-from .notification_routes import notification_bp as notification_blueprint
-app.register_blueprint(notification_blueprint)
-
-from .models import User, Todo, BreachedCredential, Company, Notification, AuditLog, UserActivity
-# admin.add_view(ModelView(Todo,db.session))
-# admin.add_view(ModelView(User,db.session))
-
-# @login_manager.user_loader
-# def load_user(user_id):
-#     return User.query.get(int(user_id))
-
-
 # Error handlers
-@app.errorhandler(403)
 def forbidden_error(error):
     """Handle 403 Forbidden errors"""
     from flask import render_template
     return render_template('pages/error-pages/error-403.html'), 403
 
 
-@app.errorhandler(404)
 def not_found_error(error):
     """Handle 404 Not Found errors"""
     from flask import render_template
     return render_template('pages/error-pages/error-404.html'), 404
 
 
-@app.errorhandler(500)
 def internal_error(error):
     """Handle 500 Internal Server errors"""
     from flask import render_template
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort, send_file, current_app
 from flask_login import login_required, current_user
 from sqlalchemy import or_, func
 from sqlalchemy.sql import text
@@ -6,10 +6,20 @@ from datetime import datetime
 import re
 
 from . import db
-from .models import User, Company, BreachedCredential, WatchlistEntry, AuditLog, UserActivity
+from .models import User, Company, BreachedCredential, WatchlistEntry, AuditLog, UserActivity, WebhookOutbox
 from .auth import validate_password, validate_email
 from .audit_helpers import log_audit
-from .security import admin_required
+from .conditional import bump_data_version
+from .identity import invalidate_company_identities, invalidate_identity
+from .security import admin_only, admin_required
+from .profiling import (
+    get_profile,
+    issue_profile_token,
+    list_profiles,
+    profile_stats_path,
+    render_profile_stats,
+    SORT_KEYS,
+)
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -269,6 +279,7 @@ def edit_user(user_id):
             user.set_password(new_password)
         
         db.session.commit()
+        invalidate_identity(user_id)
         flash(f'User "{username}" updated successfully.', 'success')
         return redirect(url_for('admin.user_management'))
     
@@ -294,6 +305,7 @@ def delete_user(user_id):
     
     db.session.delete(user)
     db.session.commit()
+    invalidate_identity(user_id)
     
     flash(f'User "{username}" deleted successfully.', 'success')
     return redirect(url_for('admin.user_management'))
@@ -446,6 +458,7 @@ def add_company():
             db.session.add(entry)
         
         try:
+            bump_data_version()
             db.session.commit()
             flash(f'Company "{name}" added successfully with {len(watchlist_entries)} watchlist entries.', 'success')
         except Exception as e:
@@ -471,7 +484,14 @@ def delete_company(company_id):
 
     try:
         WatchlistEntry.query.filter_by(company_id=company.id).delete()
+        # Subscriptions go with the company (ORM cascade); their queues are bulk-deleted
+        # here because SQLite does not enforce the outbox's ON DELETE CASCADE
+        subscription_ids = [subscription.id for subscription in company.webhook_subscriptions]
+        if subscription_ids:
+            WebhookOutbox.query.filter(WebhookOutbox.subscription_id.in_(subscription_ids)).delete(
+                synchronize_session=False)
         db.session.delete(company)
+        bump_data_version()
         db.session.commit()
         flash(f'Company "{company.name}" deleted successfully.', 'success')
     except Exception as e:
@@ -546,7 +566,9 @@ def edit_company(company_id):
             db.session.add(entry)
         
         try:
+            bump_data_version()
             db.session.commit()
+            invalidate_company_identities(company_id)
             flash(f'Company "{name}" updated successfully with {len(watchlist_entries)} watchlist entries.', 'success')
         except Exception as e:
             db.session.rollback()
@@ -597,6 +619,7 @@ def add_watchlist_entry(company_id):
     try:
         db.session.add(entry)
         db.session.commit()
+        invalidate_company_identities(company_id)
         return jsonify({
             'success': True,
             'entry_id': entry.id,
@@ -620,6 +643,7 @@ def delete_watchlist_entry(company_id, entry_id):
     try:
         db.session.delete(entry)
         db.session.commit()
+        invalidate_company_identities(company_id)
         return jsonify({'success': True})
     except Exception as e:
         db.session.rollback()
@@ -685,6 +709,54 @@ def audit_logs():
                          breadcrumb=breadcrumb)
 
 
+@admin_bp.route('/admin/profiles', methods=['GET', 'POST'])
+@login_required
+@admin_only
+def profiles():
+    """List stored request profiles; POST issues a profile token - Admin only"""
+    profile_token = None
+    if request.method == 'POST':
+        profile_token = issue_profile_token(current_user.id)
+        log_audit("create", "profile_token", None, "Issued request profiling token")
+
+    breadcrumb = {"parent": "Request Profiles", "child": "Admin"}
+    return render_template('admin/profiles.html',
+                         profiles=list_profiles(),
+                         profiling_enabled=current_app.config['PROFILING_ENABLED'],
+                         profile_token=profile_token,
+                         token_max_age=current_app.config['PROFILE_TOKEN_MAX_AGE'],
+                         breadcrumb=breadcrumb)
+
+
+@admin_bp.route('/admin/profiles/<profile_id>')
+@login_required
+@admin_only
+def profile_detail(profile_id):
+    """Show the pstats report of one profiled request - Admin only"""
+    profile = get_profile(profile_id)
+    if profile is None:
+        abort(404)
+    sort = request.args.get('sort', 'cumulative')
+    breadcrumb = {"parent": "Request Profile", "child": "Admin"}
+    return render_template('admin/profile_detail.html',
+                         profile=profile,
+                         report=render_profile_stats(profile_id, sort=sort),
+                         sort=sort,
+                         sort_keys=SORT_KEYS,
+                         breadcrumb=breadcrumb)
+
+
+@admin_bp.route('/admin/profiles/<profile_id>/download')
+@login_required
+@admin_only
+def profile_download(profile_id):
+    """Download raw .pstats (for snakeviz, gprof2dot, ...) - Admin only"""
+    if get_profile(profile_id) is None:
+        abort(404)
+    return send_file(profile_stats_path(profile_id), as_attachment=True,
+                     download_name=f'{profile_id}.pstats', mimetype='application/octet-stream')
+
+
 @admin_bp.route('/admin/user-activities')
 @login_required
 @admin_required
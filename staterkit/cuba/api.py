@@ -0,0 +1,389 @@
+"""
+JSON API for breached credentials (``/api/v1``), authenticated with JWT.
+
+Get a token from ``POST /api/auth/login`` and send it as
+``Authorization: Bearer <token>``. Results are scoped to the caller's
+company and watchlist exactly like the HTML views.
+
+Rows are selected as Core rows (no ORM objects) and serialized directly.
+``fields=id,username,domain`` limits both the SELECT list and the payload.
+Lists are ordered newest first and paginated by an opaque ``cursor``. Pass
+the ``next_cursor`` of one page to get the next one. ``/changes`` is the
+delta feed for keeping a mirror in sync (see cuba/changes.py).
+"""
+import base64
+import binascii
+import hashlib
+import json
+import re
+from datetime import datetime
+from functools import wraps
+
+from flask import Blueprint, current_app, g, make_response, request
+from flask_jwt_extended import get_current_user, verify_jwt_in_request
+from sqlalchemy import and_, func, or_, select
+
+from . import db
+from .api_utils import json_error, json_success
+from .changes import current_sequence
+from .conditional import current_data_version
+from .models import BreachedCredential, ChangeLog
+from .security import get_user_company_domain
+from .services.breached_creds_service import apply_breached_domain_filter
+from .services.filters import build_date_filter
+from .services.identity_lookup import lookup_identities, normalize_identities, normalize_identity
+from .services.password_index import HASH_KINDS, PASSWORD_HASHES, PREFIX_LENGTH, password_range
+
+api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# Public field name -> column
+FIELDS = {
+    'id': BreachedCredential.id,
+    'external_id': BreachedCredential._id,
+    'index': BreachedCredential._index,
+    'score': BreachedCredential._score,
+    'ignored': BreachedCredential._ignored,
+    'username': BreachedCredential.username,
+    'domain': BreachedCredential.domain,
+    'password': BreachedCredential.password,
+    'source': BreachedCredential.source,
+    'type': BreachedCredential.type,
+    'url': BreachedCredential.url,
+    'is_marked': BreachedCredential.is_marked,
+    'marked_at': BreachedCredential.marked_at,
+    'company_id': BreachedCredential.company_id,
+    'created_by': BreachedCredential.created_by,
+    'created_at': BreachedCredential.created_at,
+    'updated_at': BreachedCredential.updated_at,
+}
+# Passwords are only returned when asked for by name
+DEFAULT_FIELDS = ['id', 'username', 'domain', 'source', 'type', 'url', 'is_marked', 'created_at']
+FACETS = {'type': BreachedCredential.type, 'source': BreachedCredential.source, 'domain': BreachedCredential.domain}
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_FACET_LIMIT = 100
+MAX_LOOKUP_IDENTITIES = 50_000
+HASH_PREFIX = re.compile(r'^[0-9A-Fa-f]{%d}$' % PREFIX_LENGTH)
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+@api_bp.errorhandler(ApiError)
+def handle_api_error(error):
+    return json_error(error.message, status_code=error.status_code)
+
+
+def jwt_user_required(view):
+    """Require a valid access token for an active user."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        user = get_current_user()
+        if user is None or not user.is_active:
+            return json_error('Unknown or inactive user.', status_code=401)
+        # The tenant helpers in security.py read Flask-Login's current_user;
+        # point it at the token's user for this request (no session is created)
+        g._login_user = user
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _requested_fields():
+    raw = request.args.get('fields', '').strip()
+    if not raw:
+        return DEFAULT_FIELDS
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(FIELDS)}")
+    return list(dict.fromkeys(names))
+
+
+def _int_arg(name: str, default: int, maximum: int) -> int:
+    value = request.args.get(name, default, type=int)
+    if value is None or value < 1:
+        raise ApiError(f"'{name}' must be a positive integer")
+    return min(value, maximum)
+
+
+def _apply_filters(stmt):
+    """Tenant scope plus the list view's filters (type, source, domain, search, date_filter)."""
+    stmt = apply_breached_domain_filter(stmt, get_user_company_domain())
+    stmt, _ = build_date_filter(stmt, BreachedCredential.created_at, request.args.get('date_filter', 'all'))
+
+    type_filter = request.args.get('type', '').strip()
+    source_filter = request.args.get('source', '').strip()
+    domain_filter = request.args.get('domain', '').strip()
+    search = request.args.get('search', '').strip()
+    if type_filter:
+        stmt = stmt.filter(BreachedCredential.type == type_filter)
+    if source_filter:
+        stmt = stmt.filter(BreachedCredential.source.ilike(f'%{source_filter}%'))
+    if domain_filter:
+        stmt = stmt.filter(BreachedCredential.domain.ilike(f'%{domain_filter}%'))
+    if search:
+        stmt = stmt.filter(or_(
+            BreachedCredential.username.ilike(f'%{search}%'),
+            BreachedCredential.domain.ilike(f'%{search}%'),
+            BreachedCredential.password.ilike(f'%{search}%'),
+            BreachedCredential.source.ilike(f'%{search}%'),
+        ))
+    return stmt
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise ApiError('Invalid cursor') from None
+
+
+def _after_cursor(stmt, cursor: str):
+    """Rows that come after the cursor in (created_at DESC, id DESC) order."""
+    created_at, row_id = decode_cursor(cursor)
+    column, pk = BreachedCredential.created_at, BreachedCredential.id
+    if created_at is None:
+        # Rows without a timestamp sort last; continue among them by id
+        return stmt.filter(column.is_(None), pk < row_id)
+    return stmt.filter(or_(
+        column < created_at,
+        and_(column == created_at, pk < row_id),
+        column.is_(None),
+    ))
+
+
+@api_bp.route('/breached-creds')
+@jwt_user_required
+def list_breached_creds():
+    """Newest first; ``limit`` (max 1000), ``cursor``, ``fields`` and the list view's filters."""
+    fields = _requested_fields()
+    limit = _int_arg('limit', DEFAULT_LIMIT, MAX_LIMIT)
+
+    # The cursor needs created_at and id even when they are not projected
+    columns = [FIELDS[name].label(name) for name in fields]
+    columns += [BreachedCredential.created_at.label('_cursor_at'), BreachedCredential.id.label('_cursor_id')]
+    stmt = _apply_filters(select(*columns))
+    cursor = request.args.get('cursor')
+    if cursor:
+        stmt = _after_cursor(stmt, cursor)
+    stmt = stmt.order_by(BreachedCredential.created_at.desc().nulls_last(),
+                         BreachedCredential.id.desc()).limit(limit + 1)
+
+    rows = db.session.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [{name: _serialize(row._mapping[name]) for name in fields} for row in rows]
+    next_cursor = encode_cursor(rows[-1]._cursor_at, rows[-1]._cursor_id) if has_more else None
+    return json_success({'items': items, 'count': len(items), 'next_cursor': next_cursor})
+
+
+@api_bp.route('/breached-creds/<int:cred_id>')
+@jwt_user_required
+def get_breached_cred(cred_id):
+    fields = _requested_fields() if request.args.get('fields') else list(FIELDS)
+    stmt = apply_breached_domain_filter(
+        select(*[FIELDS[name].label(name) for name in fields]), get_user_company_domain()
+    ).filter(BreachedCredential.id == cred_id)
+    row = db.session.execute(stmt).first()
+    if row is None:
+        return json_error('Not found.', status_code=404)
+    return json_success({'item': {name: _serialize(row._mapping[name]) for name in fields}})
+
+
+@api_bp.route('/breached-creds/stats')
+@jwt_user_required
+def breached_creds_stats():
+    """Totals for the filtered set: count, marked count and counts per type."""
+    totals = db.session.execute(_apply_filters(select(
+        func.count(BreachedCredential.id).label('total'),
+        func.count(BreachedCredential.id).filter(BreachedCredential.is_marked.is_(True)).label('marked'),
+        func.min(BreachedCredential.created_at).label('first_seen'),
+        func.max(BreachedCredential.created_at).label('last_seen'),
+    ))).one()
+    by_type = db.session.execute(
+        _apply_filters(select(BreachedCredential.type, func.count(BreachedCredential.id)))
+        .group_by(BreachedCredential.type)
+    ).all()
+    return json_success({
+        'total': totals.total,
+        'marked': totals.marked,
+        'first_seen': _serialize(totals.first_seen),
+        'last_seen': _serialize(totals.last_seen),
+        'by_type': {value or 'unknown': count for value, count in by_type},
+    })
+
+
+@api_bp.route('/breached-creds/facets')
+@jwt_user_required
+def breached_creds_facets():
+    """Top values with counts for ``facet=type,source,domain`` (default: all), ``limit`` per facet."""
+    names = [name.strip() for name in request.args.get('facet', ','.join(FACETS)).split(',') if name.strip()]
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ApiError(f"Unknown facet(s): {', '.join(unknown)}. Available: {', '.join(FACETS)}")
+    limit = _int_arg('limit', 20, MAX_FACET_LIMIT)
+
+    facets = {}
+    for name in dict.fromkeys(names):
+        column = FACETS[name]
+        count = func.count(BreachedCredential.id)
+        rows = db.session.execute(
+            _apply_filters(select(column, count))
+            .filter(column.isnot(None))
+            .group_by(column)
+            .order_by(count.desc(), column)
+            .limit(limit)
+        ).all()
+        facets[name] = [{'value': value, 'count': n} for value, n in rows]
+    return json_success({'facets': facets})
+
+
+@api_bp.route('/identities/lookup', methods=['POST'])
+@jwt_user_required
+def lookup_identities_batch():
+    """
+    Check many emails/usernames in one call.
+
+    Body: ``{"identities": ["a@corp.com", "jdoe", ...]}`` (case-insensitive,
+    at most 50,000). Returns a hit summary for each identity that matches.
+    """
+    data = request.get_json(silent=True) or {}
+    raw = data.get('identities')
+    if not isinstance(raw, list):
+        raise ApiError("Body must be JSON with an 'identities' list")
+    if len(raw) > MAX_LOOKUP_IDENTITIES:
+        raise ApiError(f"At most {MAX_LOOKUP_IDENTITIES} identities per call", status_code=413)
+
+    identities = normalize_identities(raw)
+    results = lookup_identities(identities, get_user_company_domain())
+    # The temporary table lives in this transaction only
+    db.session.commit()
+    for result in results:
+        result['first_seen'] = _serialize(result['first_seen'])
+        result['last_seen'] = _serialize(result['last_seen'])
+    return json_success({'checked': len(identities), 'matched': len(results), 'results': results})
+
+
+@api_bp.route('/identities/<path:identity>')
+@jwt_user_required
+def lookup_identity(identity):
+    """
+    Check one email/username. ``breached`` is false with a null ``summary``
+    when it has no credentials in the caller's scope. Addresses the Bloom
+    filter has never seen are answered without a query.
+    """
+    identity = normalize_identity(identity)
+    if not identity:
+        raise ApiError('Identity must not be empty')
+    results = lookup_identities([identity], get_user_company_domain())
+    db.session.commit()
+    summary = results[0] if results else None
+    if summary:
+        summary['first_seen'] = _serialize(summary['first_seen'])
+        summary['last_seen'] = _serialize(summary['last_seen'])
+    return json_success({'identity': identity, 'breached': summary is not None, 'summary': summary})
+
+
+@api_bp.route('/range/<prefix>')
+@jwt_user_required
+def password_hash_range(prefix):
+    """
+    Breached-password hash suffixes for a 5-character hash prefix (k-anonymity).
+
+    ``mode=sha1`` (default) or ``mode=ntlm``. The body is the Have I Been
+    Pwned range format: one ``SUFFIX:COUNT`` line per hash, upper-case hex.
+    Counts cover the whole corpus and no credential details are returned, so
+    the response is the same for every caller and may be kept by shared caches.
+    """
+    kind = request.args.get('mode', 'sha1').lower()
+    if kind not in HASH_KINDS:
+        raise ApiError(f"Unknown mode '{kind}'. Available: {', '.join(HASH_KINDS)}")
+    if not HASH_PREFIX.match(prefix):
+        raise ApiError(f'The prefix must be {PREFIX_LENGTH} hexadecimal characters')
+    prefix = prefix.upper()
+
+    version = current_data_version(PASSWORD_HASHES)
+    etag = hashlib.sha1(f'{kind}:{prefix}:{version}'.encode()).hexdigest()
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        rows = password_range(db.session, kind, prefix)
+        response = make_response(''.join(f'{suffix}:{count}\r\n' for suffix, count in rows))
+        response.mimetype = 'text/plain'
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('PASSWORD_RANGE_MAX_AGE', 3600)
+    return response
+
+
+@api_bp.route('/changes')
+@jwt_user_required
+def list_changes():
+    """
+    Credential changes after ``since`` (a ``seq``), oldest first, ``limit`` (max 1000) per batch.
+
+    Each credential appears once per batch with its newest change. ``item``
+    holds the credential's current ``fields`` and is null for deletes and for
+    credentials that are gone or out of the caller's scope. Continue with
+    ``since=next_since`` while ``has_more``. ``latest`` is the newest sequence
+    number overall. Read it before a full export to know where to resume.
+    """
+    since = request.args.get('since', '0')
+    if not since.isdigit():
+        raise ApiError("'since' must be a non-negative integer")
+    since = int(since)
+    limit = _int_arg('limit', MAX_LIMIT, MAX_LIMIT)
+    fields = _requested_fields()
+    user_domain = get_user_company_domain()
+
+    latest = current_sequence()
+    stmt = apply_breached_domain_filter(
+        select(ChangeLog.seq, ChangeLog.op, ChangeLog.credential_id).where(ChangeLog.seq > since),
+        user_domain, model=ChangeLog,
+    ).order_by(ChangeLog.seq).limit(limit + 1)
+    rows = db.session.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    newest = {}
+    for row in rows:
+        newest.pop(row.credential_id, None)
+        newest[row.credential_id] = row
+    live_ids = [row.credential_id for row in newest.values() if row.op != 'delete']
+    items = {}
+    if live_ids:
+        item_stmt = apply_breached_domain_filter(
+            select(BreachedCredential.id.label('_key'), *[FIELDS[name].label(name) for name in fields]),
+            user_domain,
+        ).filter(BreachedCredential.id.in_(live_ids))
+        items = {row._key: {name: _serialize(row._mapping[name]) for name in fields}
+                 for row in db.session.execute(item_stmt)}
+
+    changes = [{'seq': row.seq, 'op': row.op, 'id': row.credential_id, 'item': items.get(row.credential_id)}
+               for row in newest.values()]
+    return json_success({
+        'changes': changes,
+        'count': len(changes),
+        'next_since': rows[-1].seq if rows else since,
+        'has_more': has_more,
+        'latest': latest,
+    })
@@ -3,20 +3,21 @@ Audit logging helper functions for tracking system actions
 """
 from flask import request
 from flask_login import current_user
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from . import db
 from .models import AuditLog, UserActivity
 
 
 def get_client_ip():
-    """Get client IP address from request"""
-    if request.headers.get('X-Forwarded-For'):
-        return request.headers.get('X-Forwarded-For').split(',')[0].strip()
-    elif request.headers.get('X-Real-IP'):
-        return request.headers.get('X-Real-IP')
-    else:
-        return request.remote_addr
+    """
+    Get client IP address from request.
+
+    Forwarded headers are client-controlled and never read here. Behind a
+    reverse proxy set TRUSTED_PROXY_HOPS so ProxyFix rewrites ``remote_addr``
+    from the hops the proxies appended (see create_app).
+    """
+    return request.remote_addr
 
 
 def get_user_agent():
@@ -94,3 +95,42 @@ def log_user_activity(activity_type, user_id=None, status="success", failure_rea
         db.session.rollback()
         print(f"Failed to log user activity: {e}")
 
+
+def log_failed_attempt(activity_type, user_id=None, failure_reason=None, window=300):
+    """
+    Log a failed attempt, folding repeats into one row per window.
+
+    Attempts with the same type, IP, user and reason in the same ``window``
+    (seconds) bucket increment ``attempt_count`` on the bucket's row instead
+    of adding a row each, so a burst of failures costs one row.
+    """
+    try:
+        now = datetime.utcnow()
+        epoch = datetime(1970, 1, 1)
+        elapsed = (now - epoch).total_seconds()
+        window_start = epoch + timedelta(seconds=elapsed - elapsed % window)
+        ip_address = get_client_ip()
+
+        query = UserActivity.query.filter(
+            UserActivity.activity_type == activity_type,
+            UserActivity.ip_address == ip_address,
+            UserActivity.user_id.is_(None) if user_id is None else UserActivity.user_id == user_id,
+            UserActivity.failure_reason == failure_reason,
+            UserActivity.created_at >= window_start,
+        )
+        updated = query.update({UserActivity.attempt_count: UserActivity.attempt_count + 1},
+                               synchronize_session=False)
+        if not updated:
+            db.session.add(UserActivity(
+                user_id=user_id,
+                activity_type=activity_type,
+                ip_address=ip_address,
+                user_agent=get_user_agent(),
+                status="failed",
+                failure_reason=failure_reason,
+                attempt_count=1,
+            ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Failed to log user activity: {e}")
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from flask_wtf.csrf import generate_csrf
 from sqlalchemy import or_
@@ -10,12 +10,54 @@ import os
 
 from . import db
 from .models import User, Company
-from .audit_helpers import log_user_activity, log_audit
+from .audit_helpers import get_client_ip, log_failed_attempt, log_user_activity, log_audit
+from .identity import invalidate_identity
+from .throttle import get_login_throttle
 
 
 auth = Blueprint("auth", __name__)
 
 
+def _check_login_throttle(email, activity_type):
+    """Seconds the client must wait before another login attempt, or None (checked before hashing)."""
+    throttle = get_login_throttle()
+    if throttle is None:
+        return None
+    ip_address = get_client_ip()
+    wait = throttle.retry_after(ip_address, email)
+    if wait and throttle.rejected(ip_address):
+        # One row when throttling starts for this IP, not one per rejected attempt
+        log_failed_attempt(activity_type, None, "too_many_attempts", throttle.window)
+    return wait
+
+
+def _login_failed(activity_type, user_id, failure_reason, email):
+    """Count a failed login towards the throttle and log it (aggregated per window)."""
+    throttle = get_login_throttle()
+    if throttle is not None:
+        throttle.failed(get_client_ip(), email)
+    log_failed_attempt(activity_type, user_id, failure_reason,
+                       current_app.config.get("LOGIN_THROTTLE_WINDOW", 300))
+
+
+def _login_succeeded(email):
+    throttle = get_login_throttle()
+    if throttle is not None:
+        throttle.succeeded(email)
+
+
+def _upgrade_password_hash(user, password):
+    """
+    Rehash a verified password whose stored hash predates the current policy.
+
+    The change is committed by the caller. Returns True if the hash changed.
+    """
+    if not user.password_needs_rehash():
+        return False
+    user.set_password(password)
+    return True
+
+
 @auth.route("/login", methods=["GET", "POST"])
 def login():
     if current_user.is_authenticated:
@@ -26,19 +68,24 @@ def login():
         password = request.form.get("password") or ""
         remember = bool(request.form.get("remember"))
 
+        wait = _check_login_throttle(email, "login_throttled")
+        if wait:
+            flash(f"Too many failed sign-in attempts. Try again in {wait} seconds.", "danger")
+            return render_template("auth/login.html", email=email), 429, {"Retry-After": str(wait)}
+
         user = User.query.filter_by(email=email).first()
         if not user or not user.check_password(password):
             # Log failed login attempt
             if user:
-                log_user_activity("login_failed", user.id, status="failed", failure_reason="invalid_password")
+                _login_failed("login_failed", user.id, "invalid_password", email)
             else:
-                log_user_activity("login_failed", None, status="failed", failure_reason="user_not_found")
+                _login_failed("login_failed", None, "user_not_found", email)
             flash("Invalid email or password.", "danger")
             return render_template("auth/login.html", email=email)
 
         # Security: Check if user is active
         if not user.is_active:
-            log_user_activity("login_failed", user.id, status="failed", failure_reason="user_inactive")
+            _login_failed("login_failed", user.id, "user_inactive", email)
             flash("Your account has been deactivated. Please contact an administrator.", "danger")
             return render_template("auth/login.html", email=email)
 
@@ -47,7 +94,9 @@ def login():
         if not os.getenv("READ_ONLY_DB", "").lower() in {"1", "true", "yes"}:
             try:
                 user.last_login = datetime.utcnow()
+                _upgrade_password_hash(user, password)
                 db.session.commit()
+                invalidate_identity(user.id)
             except OperationalError as e:
                 # Silently ignore readonly database errors (e.g., on Vercel with SQLite)
                 if "readonly" in str(e).lower():
@@ -56,6 +105,7 @@ def login():
                     raise
 
         login_user(user, remember=remember)
+        _login_succeeded(email)
         
         # Log successful login
         log_user_activity("login", user.id, status="success")
@@ -82,19 +132,35 @@ def api_login():
     if not email or not password:
         return jsonify({"success": False, "error": "Email and password are required."}), 400
 
+    wait = _check_login_throttle(email, "api_login_throttled")
+    if wait:
+        return (jsonify({"success": False, "error": "Too many failed login attempts.", "retry_after": wait}),
+                429, {"Retry-After": str(wait)})
+
     user = User.query.filter_by(email=email).first()
     if not user or not user.check_password(password):
         if user:
-            log_user_activity("api_login_failed", user.id, status="failed", failure_reason="invalid_password")
+            _login_failed("api_login_failed", user.id, "invalid_password", email)
         else:
-            log_user_activity("api_login_failed", None, status="failed", failure_reason="user_not_found")
+            _login_failed("api_login_failed", None, "user_not_found", email)
         return jsonify({"success": False, "error": "Invalid credentials."}), 401
 
     if not user.is_active:
-        log_user_activity("api_login_failed", user.id, status="failed", failure_reason="user_inactive")
+        _login_failed("api_login_failed", user.id, "user_inactive", email)
         return jsonify({"success": False, "error": "Account is inactive."}), 403
 
-    access_token = create_access_token(identity=user.id)
+    _login_succeeded(email)
+    if not os.getenv("READ_ONLY_DB", "").lower() in {"1", "true", "yes"} and _upgrade_password_hash(user, password):
+        try:
+            db.session.commit()
+            invalidate_identity(user.id)
+        except OperationalError as e:
+            if "readonly" in str(e).lower():
+                db.session.rollback()
+            else:
+                raise
+    # PyJWT requires a string subject
+    access_token = create_access_token(identity=str(user.id))
 
     log_user_activity("api_login", user.id, status="success")
     log_audit("api_login", "user", user.id, f"User {user.username} obtained API token")
@@ -257,6 +323,7 @@ def profile():
 
         try:
             db.session.commit()
+            invalidate_identity(current_user.id)
             flash("Profile updated successfully.", "success")
         except OperationalError as e:
             # On read-only DB (Vercel), profile updates will fail
@@ -0,0 +1,273 @@
+"""
+Resumable, throttled data backfills.
+
+A backfill walks a table in key ranges ``(last_key, last_key + chunk_size]``
+and commits each chunk separately, so locks are held only for one chunk and
+the application keeps serving traffic while it runs. Progress is stored in
+the ``backfill_checkpoint`` table after every chunk; an interrupted run
+resumes from the last committed key.
+
+Backfills are registered with :func:`register_backfill` and run either from
+an Alembic revision (``op.get_context().autocommit_block()``) or from the
+``flask backfill run <name>`` command.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import text
+
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_PAUSE = 0.05  # Seconds to sleep between chunks so other writers can get the lock
+
+
+@dataclass
+class Backfill:
+    """A registered backfill over an integer-keyed table."""
+    name: str
+    table: str
+    process_chunk: Callable  # (connection, lower, upper) -> rows changed
+    key: str = 'id'
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    pause: float = DEFAULT_PAUSE
+    description: str = ''
+
+
+@dataclass
+class BackfillResult:
+    name: str
+    chunks: int
+    rows_changed: int
+    last_key: int
+    completed: bool
+
+
+BACKFILLS: Dict[str, Backfill] = {}
+
+
+def register_backfill(name: str, table: str, key: str = 'id', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      pause: float = DEFAULT_PAUSE, description: str = ''):
+    """
+    Decorator registering a chunk processor as a named backfill.
+
+    The decorated function receives ``(connection, lower, upper)`` and must only
+    touch rows with ``lower < key <= upper``. It should be idempotent, since a
+    chunk may be re-run if the process dies between the update and the checkpoint.
+    It returns the number of rows it changed.
+    """
+    def decorator(func):
+        BACKFILLS[name] = Backfill(
+            name=name,
+            table=table,
+            process_chunk=func,
+            key=key,
+            chunk_size=chunk_size,
+            pause=pause,
+            description=description or (func.__doc__ or '').strip().split('\n')[0],
+        )
+        return func
+    return decorator
+
+
+def _load_checkpoint(connection, name: str):
+    return connection.execute(
+        text("SELECT last_key, rows_changed, completed_at FROM backfill_checkpoint WHERE name = :name"),
+        {"name": name},
+    ).first()
+
+
+def _save_checkpoint(connection, name: str, last_key: int, rows_changed: int, completed: bool = False) -> None:
+    params = {
+        "name": name,
+        "last_key": last_key,
+        "rows_changed": rows_changed,
+        "completed_at": datetime.utcnow() if completed else None,
+        "updated_at": datetime.utcnow(),
+    }
+    result = connection.execute(
+        text(
+            "UPDATE backfill_checkpoint SET last_key = :last_key, rows_changed = :rows_changed, "
+            "completed_at = :completed_at, updated_at = :updated_at WHERE name = :name"
+        ),
+        params,
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            text(
+                "INSERT INTO backfill_checkpoint (name, last_key, rows_changed, completed_at, updated_at) "
+                "VALUES (:name, :last_key, :rows_changed, :completed_at, :updated_at)"
+            ),
+            params,
+        )
+
+
+def _commit(connection) -> None:
+    # Inside an Alembic autocommit block every statement is already committed
+    if connection.get_execution_options().get('isolation_level') == 'AUTOCOMMIT':
+        return
+    if connection.in_transaction():
+        connection.commit()
+
+
+def run_backfill(connection, name: str, chunk_size: Optional[int] = None, pause: Optional[float] = None,
+                 max_chunks: Optional[int] = None, restart: bool = False,
+                 progress: Optional[Callable[[int, int, int], None]] = None) -> BackfillResult:
+    """
+    Run (or resume) a registered backfill on the given connection.
+
+    Args:
+        connection: SQLAlchemy Connection not inside a long-running transaction
+        name: Registered backfill name
+        chunk_size: Keys per chunk (defaults to the backfill's setting)
+        pause: Seconds to sleep between chunks (defaults to the backfill's setting)
+        max_chunks: Stop after this many chunks (the run can be resumed later)
+        restart: Ignore the stored checkpoint and start from the beginning
+        progress: Optional callback ``(last_key, max_key, rows_changed)`` called after each chunk
+
+    Returns:
+        BackfillResult with the chunk count and rows changed in this run
+    """
+    backfill = BACKFILLS[name]
+    chunk_size = chunk_size or backfill.chunk_size
+    pause = backfill.pause if pause is None else pause
+
+    checkpoint = None if restart else _load_checkpoint(connection, name)
+    last_key = int(checkpoint[0]) if checkpoint else 0
+    total_changed = int(checkpoint[1]) if checkpoint else 0
+
+    # Rows inserted after this point are written by application code that already
+    # populates the new values, so the key range is fixed at the start of the run
+    max_key = connection.execute(
+        text(f"SELECT MAX({backfill.key}) FROM {backfill.table}")
+    ).scalar() or 0
+    _commit(connection)
+
+    chunks = 0
+    changed_this_run = 0
+    while last_key < max_key:
+        if max_chunks is not None and chunks >= max_chunks:
+            break
+        upper = min(last_key + chunk_size, max_key)
+        changed = backfill.process_chunk(connection, last_key, upper) or 0
+        total_changed += changed
+        changed_this_run += changed
+        _save_checkpoint(connection, name, upper, total_changed)
+        _commit(connection)
+
+        last_key = upper
+        chunks += 1
+        if progress:
+            progress(last_key, max_key, total_changed)
+        if pause and last_key < max_key:
+            time.sleep(pause)
+
+    completed = last_key >= max_key
+    if completed:
+        _save_checkpoint(connection, name, last_key, total_changed, completed=True)
+        _commit(connection)
+
+    return BackfillResult(name=name, chunks=chunks, rows_changed=changed_this_run,
+                          last_key=last_key, completed=completed)
+
+
+# ---------------------------------------------------------------------------
+# Registered backfills
+# ---------------------------------------------------------------------------
+
+@register_backfill('breached_credential_domain', table='breached_credential')
+def backfill_credential_domain(connection, lower, upper):
+    """Populate breached_credential.domain from email-style or domain-like usernames."""
+    rows = connection.execute(
+        text(
+            "SELECT id, username FROM breached_credential "
+            "WHERE id > :lower AND id <= :upper "
+            "AND username IS NOT NULL AND username != '' "
+            "AND (domain IS NULL OR domain = '')"
+        ),
+        {"lower": lower, "upper": upper},
+    ).all()
+
+    updates = []
+    for record_id, username in rows:
+        if '@' in username:
+            domain = username.split('@')[1].lower().strip()
+        elif '.' in username:
+            # Username looks like a domain itself
+            domain = username.lower().strip()
+        else:
+            continue
+        if domain:
+            updates.append({"id": record_id, "domain": domain})
+
+    if updates:
+        connection.execute(
+            text("UPDATE breached_credential SET domain = :domain WHERE id = :id"),
+            updates,
+        )
+    return len(updates)
+
+
+@register_backfill('password_hash', table='breached_credential')
+def backfill_password_hash(connection, lower, upper):
+    """Index SHA-1/NTLM hash prefixes of breached passwords for /api/v1/range."""
+    from .services.password_index import index_credentials
+
+    return index_credentials(connection, lower, upper)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+backfill_cli = AppGroup('backfill', help='Resumable online data backfills.')
+
+
+@backfill_cli.command('list')
+def backfill_list():
+    """List registered backfills and their checkpoints."""
+    from . import db
+
+    with db.engine.connect() as connection:
+        for name, backfill in sorted(BACKFILLS.items()):
+            checkpoint = _load_checkpoint(connection, name)
+            if checkpoint is None:
+                state = 'not started'
+            elif checkpoint[2]:
+                state = f'completed (last key {checkpoint[0]}, {checkpoint[1]} rows changed)'
+            else:
+                state = f'in progress (last key {checkpoint[0]}, {checkpoint[1]} rows changed)'
+            click.echo(f"{name}: {state}")
+            if backfill.description:
+                click.echo(f"    {backfill.description}")
+
+
+@backfill_cli.command('run')
+@click.argument('name')
+@click.option('--chunk-size', type=int, default=None, help='Keys per chunk.')
+@click.option('--pause', type=float, default=None, help='Seconds to sleep between chunks.')
+@click.option('--max-chunks', type=int, default=None, help='Stop after N chunks (resume later).')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint and start over.')
+def backfill_run(name, chunk_size, pause, max_chunks, restart):
+    """Run or resume a backfill."""
+    from . import db
+    from .conditional import bump_data_version
+
+    if name not in BACKFILLS:
+        raise click.ClickException(f"Unknown backfill '{name}'. Known: {', '.join(sorted(BACKFILLS))}")
+
+    def report(last_key, max_key, rows_changed):
+        click.echo(f"  {name}: key {last_key}/{max_key}, {rows_changed} rows changed")
+
+    with db.engine.connect() as connection:
+        result = run_backfill(connection, name, chunk_size=chunk_size, pause=pause,
+                              max_chunks=max_chunks, restart=restart, progress=report)
+        if result.rows_changed:
+            bump_data_version(connection=connection)
+            connection.commit()
+
+    status = 'completed' if result.completed else 'paused'
+    click.echo(f"✓ {name} {status}: {result.chunks} chunks, {result.rows_changed} rows changed")
@@ -0,0 +1,196 @@
+"""
+Memory-mapped Bloom filter of every breached username/email.
+
+Most identity checks are for addresses that have never been breached. The
+filter answers "definitely not present" from a few bit tests on a
+memory-mapped file, without a database query. A positive answer ("maybe")
+falls through to the database. A Bloom filter never produces false
+negatives, so skipping the query for a negative answer cannot hide a
+breach. This holds as long as every writer adds its usernames to the file.
+
+The file (``BLOOM_FILTER_PATH``, default ``instance/identity_bloom.bin``)
+is built offline with ``flask bloom build``. Ingest, the add/edit forms and
+the data generator set the new bits in place under an exclusive file lock,
+and every worker sees them through the shared mapping. A rebuild writes a
+new file and renames it over the old one. Workers notice the new inode and
+remap. Writes that land in the old file while the rebuild scans are added
+to the new one afterwards: inserts by id, edits from the change log. Without a file the fast path is off and every check goes to the
+database.
+
+Deleted credentials keep their bits until the next rebuild. Such stale
+positives only cost a query.
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterable, Optional
+
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer deployments only
+    fcntl = None
+
+MAGIC = b'CUBABLM1'
+HEADER = struct.Struct('<8sQIIQ')  # magic, bits, hashes, reserved, items added
+DEFAULT_FP_RATE = 0.001
+MIN_CAPACITY = 100_000
+STAT_INTERVAL = 1.0  # Seconds between checks for a rebuilt file
+
+
+def _positions(value: str, bits: int, hashes: int):
+    """Double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest."""
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+    h1, h2 = struct.unpack('<QQ', digest)
+    h2 |= 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def optimal_parameters(capacity: int, fp_rate: float = DEFAULT_FP_RATE):
+    """(bits, hashes) for ``capacity`` items at the target false-positive rate."""
+    capacity = max(capacity, 1)
+    bits = int(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """A Bloom filter stored in a file and accessed through ``mmap``."""
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        self._file = open(path, 'r+b' if writable else 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, self.bits, self.hashes, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) < HEADER.size + self.bits // 8:
+            self.close()
+            raise ValueError(f'{path} is not a Bloom filter file')
+        self.identity = os.fstat(self._file.fileno())[1:3]  # (inode, device)
+
+    @classmethod
+    def create(cls, path: str, capacity: int, fp_rate: float = DEFAULT_FP_RATE) -> 'BloomFilter':
+        """Write an empty filter sized for ``capacity`` items and open it for writing."""
+        bits, hashes = optimal_parameters(capacity, fp_rate)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, bits, hashes, 0, 0))
+            f.truncate(HEADER.size + bits // 8)
+        return cls(path, writable=True)
+
+    @property
+    def count(self) -> int:
+        """Items added so far (duplicates included)."""
+        return HEADER.unpack_from(self._map, 0)[4]
+
+    def __contains__(self, value: str) -> bool:
+        data = self._map
+        for position in _positions(value, self.bits, self.hashes):
+            if not data[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add_many(self, values: Iterable[str]) -> int:
+        """Set the bits of ``values``; safe against concurrent writers in other processes."""
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            data, added = self._map, 0
+            for value in values:
+                for position in _positions(value, self.bits, self.hashes):
+                    data[HEADER.size + (position >> 3)] |= 1 << (position & 7)
+                added += 1
+            HEADER.pack_into(data, 0, MAGIC, self.bits, self.hashes, 0, self.count + added)
+            data.flush()
+            return added
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def estimated_fp_rate(self) -> float:
+        """False-positive rate for the current item count (grows past the build capacity)."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class IdentityFilter:
+    """The app's filter file, reopened when it is rebuilt."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._filter: Optional[BloomFilter] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current(self) -> Optional[BloomFilter]:
+        now = time.monotonic()
+        if now - self._checked_at < STAT_INTERVAL:
+            return self._filter
+        with self._lock:
+            self._checked_at = now
+            try:
+                identity = os.stat(self.path)[1:3]
+            except FileNotFoundError:
+                identity = None
+            if self._filter is not None and self._filter.identity != identity:
+                self._filter.close()
+                self._filter = None
+            if self._filter is None and identity is not None:
+                try:
+                    self._filter = BloomFilter(self.path)
+                except (OSError, ValueError):
+                    current_app.logger.warning('Ignoring unreadable Bloom filter %s', self.path)
+            return self._filter
+
+    @property
+    def available(self) -> bool:
+        return self._current() is not None
+
+    def might_contain(self, value: str) -> bool:
+        """False only if ``value`` was never added; True when there is no filter."""
+        bloom = self._current()
+        return bloom is None or value in bloom
+
+    def add_many(self, values: Iterable[str]) -> int:
+        """Add values to the file on disk; a no-op when there is no filter yet."""
+        values = list(values)
+        if not values or not os.path.exists(self.path):
+            return 0
+        writer = BloomFilter(self.path, writable=True)
+        try:
+            return writer.add_many(values)
+        finally:
+            writer.close()
+
+
+def init_identity_filter(app) -> None:
+    app.config.setdefault('BLOOM_FILTER_ENABLED', True)
+    path = app.config.get('BLOOM_FILTER_PATH') or os.path.join(app.instance_path, 'identity_bloom.bin')
+    app.config['BLOOM_FILTER_PATH'] = path
+    app.extensions['identity_filter'] = IdentityFilter(path)
+
+
+def get_identity_filter() -> Optional[IdentityFilter]:
+    """The app's identity filter for lookups, or None when the fast path is disabled."""
+    if not current_app.config.get('BLOOM_FILTER_ENABLED', True):
+        return None
+    return current_app.extensions.get('identity_filter')
+
+
+def add_identities(values: Iterable[str]) -> int:
+    """
+    Add normalized identities to the filter file, if there is one.
+
+    Writers call this even when lookups are disabled in their process, since
+    another worker may rely on the same file.
+    """
+    identity_filter = current_app.extensions.get('identity_filter')
+    return identity_filter.add_many(values) if identity_filter is not None else 0
@@ -0,0 +1,129 @@
+"""
+Change feed of breached credentials for delta sync (``/api/v1/changes``).
+
+Every insert, update, delete and mark toggle of a credential appends a row to
+``change_log`` with a sequence number. A consumer keeps the last ``seq`` it
+processed and asks for ``since=<seq>``, so each pull costs the size of the
+delta, not the corpus.
+
+Sequence numbers come from a ``data_version`` counter (scope
+``change_log``) that is incremented with ``UPDATE ... RETURNING`` in the
+writing transaction. The row lock is held until commit, so transactions
+commit in sequence order. A reader can therefore never see seq 102 while
+101 is still in flight and then skip it.
+
+Change rows copy the credential's domain, username and url. A tenant's feed
+is filtered on these copies with the same watchlist rules as every other
+view, which also works for deleted credentials. When an edit moves a
+credential out of a tenant's scope, the old values are logged as a
+``delete`` first.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, literal, select, update
+
+from . import db
+
+CHANGE_SEQUENCE = 'change_log'  # data_version scope used as the sequence
+SCOPE_COLUMNS = ('domain', 'username', 'url')
+OPS = ('insert', 'update', 'delete', 'mark', 'unmark')
+
+
+def _allocate(executor, count: int) -> int:
+    """Reserve ``count`` sequence numbers; returns the first one."""
+    from .models import DataVersion
+
+    last = executor.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == CHANGE_SEQUENCE)
+        .values(version=DataVersion.version + count, updated_at=datetime.utcnow())
+        .returning(DataVersion.version)
+    ).scalar()
+    if last is None:
+        # Seeded by migration a3e6c9f2b718; only reached on a hand-made schema
+        executor.execute(insert(DataVersion), {'scope': CHANGE_SEQUENCE, 'version': count,
+                                               'updated_at': datetime.utcnow()})
+        last = count
+    return last - count + 1
+
+
+def scope_values(credential) -> Dict[str, Optional[str]]:
+    """The columns tenant filtering looks at, as they are now (capture before an edit)."""
+    return {name: getattr(credential, name) for name in SCOPE_COLUMNS}
+
+
+def record_changes(changes: List[Dict], connection=None) -> None:
+    """
+    Append changes (``credential_id``, ``op`` and the scope columns) in order.
+
+    Call before committing the write, in the same transaction.
+    ``connection`` works as in ``bump_data_version``.
+    """
+    from .models import ChangeLog
+
+    if not changes:
+        return
+    executor = connection if connection is not None else db.session
+    first = _allocate(executor, len(changes))
+    now = datetime.utcnow()
+    executor.execute(insert(ChangeLog), [
+        {'seq': first + offset, 'created_at': now, **change} for offset, change in enumerate(changes)
+    ])
+
+
+def record_credential_change(credential, op: str, previous: Optional[Dict] = None) -> None:
+    """
+    Log one change of an ORM credential (flushed, so it has an id).
+
+    For edits pass ``previous=scope_values(credential)`` taken before the
+    form was applied. If the scope columns changed, a ``delete`` with the old
+    values is logged first, so tenants that could see the old version drop it.
+    """
+    assert op in OPS, op
+    changes = []
+    if previous is not None and previous != scope_values(credential):
+        changes.append({'credential_id': credential.id, 'op': 'delete', **previous})
+    changes.append({'credential_id': credential.id, 'op': op, **scope_values(credential)})
+    record_changes(changes)
+
+
+def lock_sequence(connection=None) -> None:
+    """
+    Take the sequence row lock for the rest of the transaction.
+
+    Bulk loaders call this before reading the highest credential id. Other
+    bulk loads then wait, so the ids above it are exactly this load's rows.
+    """
+    _allocate(connection if connection is not None else db.session, 0)
+
+
+def record_inserts_since(connection, after_id: int, op: str = 'insert') -> int:
+    """
+    Log every credential with ``id > after_id`` in one INSERT ... SELECT.
+
+    For bulk loaders, after ``lock_sequence`` and the insert.
+    """
+    from .models import BreachedCredential, ChangeLog
+
+    count = connection.execute(
+        select(func.count(BreachedCredential.id)).where(BreachedCredential.id > after_id)
+    ).scalar() or 0
+    if not count:
+        return 0
+    first = _allocate(connection, count)
+    source = select(
+        (literal(first - 1) + func.row_number().over(order_by=BreachedCredential.id)),
+        BreachedCredential.id, literal(op),
+        BreachedCredential.domain, BreachedCredential.username, BreachedCredential.url,
+        literal(datetime.utcnow()),
+    ).where(BreachedCredential.id > after_id)
+    connection.execute(insert(ChangeLog).from_select(
+        ['seq', 'credential_id', 'op', 'domain', 'username', 'url', 'created_at'], source))
+    return count
+
+
+def current_sequence() -> int:
+    from .conditional import current_data_version
+
+    return current_data_version(CHANGE_SEQUENCE)
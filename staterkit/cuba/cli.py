@@ -0,0 +1,334 @@
+"""
+Flask CLI commands (``flask database ...``, ``flask ingest ...``, ``flask static ...``,
+``flask templates ...``, ``flask passwords ...``, ``flask bloom ...``, ``flask forwarder ...``,
+``flask webhooks ...``).
+"""
+import os
+
+import click
+from flask.cli import AppGroup, with_appcontext
+
+from . import db
+from .backfill import backfill_cli
+from .bloom import DEFAULT_FP_RATE, BloomFilter
+from .database import create_search_indexes, describe_engine
+from .passwords import ALGORITHMS, calibrate, current_method, method_counts
+from .static_assets import BROTLI_AVAILABLE, build_static
+from .templating import compile_templates
+
+
+database_cli = AppGroup('database', help='Database engine utilities.')
+
+
+@database_cli.command('info')
+def database_info():
+    """Show the active engine, pool and SQLite pragmas."""
+    info = describe_engine(db.engine)
+    for key, value in info.items():
+        if isinstance(value, dict):
+            click.echo(f"{key}:")
+            for name, setting in value.items():
+                click.echo(f"  {name}: {setting}")
+        else:
+            click.echo(f"{key}: {value}")
+
+
+@database_cli.command('search-indexes')
+def database_search_indexes():
+    """Create dialect-specific search indexes (PostgreSQL pg_trgm GIN)."""
+    created = create_search_indexes(db.engine)
+    if not created:
+        click.echo(f"No search indexes for dialect '{db.engine.dialect.name}'.")
+        return
+    for name in created:
+        click.echo(f"✓ {name}")
+
+
+static_cli = AppGroup('static', help='Fingerprinted static files.')
+
+
+@static_cli.command('build')
+@click.option('--verbose', is_flag=True, help='Print each directory as it is processed.')
+def static_build(verbose):
+    """Hash static files, precompress text assets and write the manifest."""
+    from flask import current_app
+
+    build_dir = current_app.config['STATIC_BUILD_DIR']
+    progress = (lambda directory: click.echo(f"  {directory}")) if verbose else None
+    counts = build_static(current_app.static_folder, build_dir, progress=progress)
+    click.echo(f"✓ {counts['files']} files in manifest, {counts['compressed']} compressed variants written, "
+               f"{counts['removed']} stale variants removed ({build_dir})")
+    if not BROTLI_AVAILABLE:
+        click.echo("  brotli is not installed; only gzip variants were written")
+
+
+templates_cli = AppGroup('templates', help='Jinja template bytecode cache.')
+
+
+@templates_cli.command('compile')
+@click.option('--clear', is_flag=True, help='Drop cached bytecode first.')
+@click.option('--verbose', is_flag=True, help='Print each compiled template.')
+def templates_compile(clear, verbose):
+    """Compile all templates into the bytecode cache (run at deploy time)."""
+    from flask import current_app
+
+    cache = current_app.jinja_env.bytecode_cache
+    if cache is None:
+        raise click.ClickException("Template bytecode cache is disabled (TEMPLATE_BYTECODE_CACHE=0).")
+    if clear:
+        cache.clear()
+    progress = (lambda name: click.echo(f"  {name}")) if verbose else None
+    compiled, failed = compile_templates(current_app, progress=progress)
+    for name, error in failed:
+        click.echo(f"✗ {name}: {error}", err=True)
+    click.echo(f"✓ {compiled} templates compiled into {current_app.config['TEMPLATE_CACHE_DIR']}")
+    if failed:
+        raise SystemExit(1)
+
+
+passwords_cli = AppGroup('passwords', help='Password hashing policy.')
+
+
+@passwords_cli.command('calibrate')
+@click.option('--target-ms', type=float, default=250.0, show_default=True,
+              help='Acceptable time to verify one password.')
+@click.option('--algorithm', type=click.Choice(ALGORITHMS), default='scrypt', show_default=True)
+@click.option('--samples', type=int, default=3, show_default=True, help='Timings per setting (best is kept).')
+def passwords_calibrate(target_ms, algorithm, samples):
+    """Suggest a PASSWORD_HASH_METHOD that verifies within the target on this machine."""
+    method, seconds, tried = calibrate(algorithm, target_ms / 1000, samples=samples)
+    for candidate, elapsed in tried:
+        click.echo(f"  {candidate:<28} {elapsed * 1000:8.1f} ms")
+    click.echo(f"✓ PASSWORD_HASH_METHOD={method}  ({seconds * 1000:.1f} ms per login, "
+               f"current policy: {current_method()})")
+    if seconds > target_ms / 1000:
+        click.echo("  note: the suggested setting is still over the target on this machine")
+
+
+@passwords_cli.command('status')
+def passwords_status():
+    """Count users per hash method; outdated hashes are upgraded at their next login."""
+    from .models import User
+
+    policy = current_method()
+    counts = method_counts(password for (password,) in db.session.query(User.password))
+    for method, count in sorted(counts.items(), key=lambda item: -item[1]):
+        marker = '✓' if method == policy else ' '
+        click.echo(f"{marker} {method:<28} {count} users")
+    outdated = sum(count for method, count in counts.items() if method != policy)
+    click.echo(f"{outdated} users will be rehashed with {policy} at their next login")
+
+
+bloom_cli = AppGroup('bloom', help='Bloom filter of breached usernames for identity lookups.')
+
+
+@bloom_cli.command('build')
+@click.option('--capacity', type=int, default=None,
+              help='Usernames to size the filter for (default: twice the current row count).')
+@click.option('--fp-rate', type=float, default=DEFAULT_FP_RATE, show_default=True,
+              help='Target false-positive rate at full capacity.')
+def bloom_build(capacity, fp_rate):
+    """Rebuild the filter file from the database; running workers pick it up within a second."""
+    from flask import current_app
+    from .services.identity_lookup import build_identity_filter
+
+    path = current_app.config['BLOOM_FILTER_PATH']
+
+    def report(last_key, max_key):
+        click.echo(f"  key {last_key}/{max_key}")
+
+    with db.engine.connect() as connection:
+        stats = build_identity_filter(connection, path, capacity=capacity, fp_rate=fp_rate, progress=report)
+    click.echo(f"✓ {stats['items']} usernames in {path} ({stats['bits'] // 8 // 1024} KiB, "
+               f"{stats['hashes']} hashes, {stats['seconds']:.1f}s)")
+
+
+@bloom_cli.command('status')
+def bloom_status():
+    """Show the filter's size, item count and estimated false-positive rate."""
+    from flask import current_app
+
+    path = current_app.config['BLOOM_FILTER_PATH']
+    try:
+        bloom = BloomFilter(path)
+    except FileNotFoundError:
+        raise click.ClickException(f"No filter at {path}; run 'flask bloom build'.")
+    try:
+        click.echo(f"path: {path}")
+        click.echo(f"size: {bloom.bits // 8 // 1024} KiB, {bloom.hashes} hashes")
+        click.echo(f"items: {bloom.count}")
+        click.echo(f"estimated false-positive rate: {bloom.estimated_fp_rate():.5f}")
+        if not current_app.config.get('BLOOM_FILTER_ENABLED', True):
+            click.echo("note: lookups are disabled (BLOOM_FILTER_ENABLED=0); writers still update the file")
+    finally:
+        bloom.close()
+
+
+forwarder_cli = AppGroup('forwarder', help='SIEM syslog/CEF forwarder.')
+
+
+@forwarder_cli.command('status')
+def forwarder_status():
+    """Show the destination and how much is waiting in the spool."""
+    from flask import current_app
+    from .forwarder import Spool
+
+    click.echo(f"destination: {current_app.config.get('FORWARDER_URL') or 'disabled (FORWARDER_URL not set)'}")
+    click.echo(f"format: {current_app.config.get('FORWARDER_FORMAT')}")
+    spool_dir = current_app.config['FORWARDER_SPOOL_DIR']
+    if not os.path.isdir(spool_dir):
+        click.echo(f"spool: empty ({spool_dir})")
+        return
+    size = Spool(spool_dir).size()
+    click.echo(f"spool: {size['files']} files, {size['bytes']} bytes ({spool_dir})")
+
+
+@forwarder_cli.command('drain')
+def forwarder_drain():
+    """Send spooled events now (stops at the first delivery error)."""
+    from .forwarder import get_forwarder
+
+    forwarder = get_forwarder()
+    if forwarder is None:
+        raise click.ClickException("FORWARDER_URL is not set.")
+    sent = forwarder.replay_spool()
+    remaining = forwarder.spool.size()
+    click.echo(f"✓ {sent} events sent, {remaining['files']} spool files left")
+    if remaining['files']:
+        raise SystemExit(1)
+
+
+webhooks_cli = AppGroup('webhooks', help='Per-company webhook subscriptions and delivery.')
+
+
+@webhooks_cli.command('add')
+@click.argument('domain')
+@click.argument('url')
+@click.option('--description', default=None, help='Free-text note shown by "list".')
+def webhooks_add(domain, url, description):
+    """Subscribe URL to new breach matches of the company with DOMAIN; prints the signing secret."""
+    from .models import Company, WebhookSubscription
+    from .webhooks import generate_secret, validate_url
+
+    company = Company.query.filter_by(domain=domain.strip().lower()).first()
+    if not company:
+        raise click.ClickException(f"Company not found: {domain}")
+    try:
+        validate_url(url)
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    subscription = WebhookSubscription(company_id=company.id, url=url, secret=generate_secret(),
+                                       description=description)
+    db.session.add(subscription)
+    db.session.commit()
+    click.echo(f"✓ Webhook {subscription.id} for {company.domain} -> {url}")
+    click.echo(f"secret: {subscription.secret}")
+
+
+@webhooks_cli.command('list')
+def webhooks_list():
+    """Show subscriptions with their queue and delivery state."""
+    from sqlalchemy import func
+    from .models import WebhookOutbox, WebhookSubscription
+
+    counts = {}
+    for subscription_id, status, count in db.session.execute(
+            db.select(WebhookOutbox.subscription_id, WebhookOutbox.status, func.count(WebhookOutbox.id))
+            .group_by(WebhookOutbox.subscription_id, WebhookOutbox.status)):
+        counts.setdefault(subscription_id, {})[status] = count
+    subscriptions = WebhookSubscription.query.order_by(WebhookSubscription.id).all()
+    if not subscriptions:
+        click.echo("No webhook subscriptions.")
+    for subscription in subscriptions:
+        queue = counts.get(subscription.id, {})
+        state = 'active' if subscription.is_active else 'disabled'
+        click.echo(f"{subscription.id}: {subscription.company.domain} -> {subscription.url} ({state}), "
+                   f"{queue.get('pending', 0)} pending, {queue.get('dead', 0)} dead")
+        if subscription.failure_count:
+            click.echo(f"  {subscription.failure_count} consecutive failures, next attempt {subscription.retry_at}: "
+                       f"{subscription.last_error}")
+        elif subscription.last_success_at:
+            click.echo(f"  last delivered {subscription.last_success_at}")
+
+
+@webhooks_cli.command('remove')
+@click.argument('subscription_id', type=int)
+def webhooks_remove(subscription_id):
+    """Delete a subscription and its queued events."""
+    from .models import WebhookOutbox, WebhookSubscription
+
+    subscription = db.session.get(WebhookSubscription, subscription_id)
+    if subscription is None:
+        raise click.ClickException(f"Webhook not found: {subscription_id}")
+    # SQLite does not enforce the ON DELETE CASCADE unless foreign keys are switched on
+    dropped = WebhookOutbox.query.filter_by(subscription_id=subscription_id).delete()
+    db.session.delete(subscription)
+    db.session.commit()
+    click.echo(f"✓ Webhook {subscription_id} removed ({dropped} queued events dropped)")
+
+
+@webhooks_cli.command('requeue')
+@click.argument('subscription_id', type=int)
+def webhooks_requeue(subscription_id):
+    """Retry a subscription's dead events now and clear its backoff."""
+    from .models import WebhookOutbox, WebhookSubscription
+
+    subscription = db.session.get(WebhookSubscription, subscription_id)
+    if subscription is None:
+        raise click.ClickException(f"Webhook not found: {subscription_id}")
+    requeued = (WebhookOutbox.query.filter_by(subscription_id=subscription_id, status='dead')
+                .update({'status': 'pending', 'attempts': 0}))
+    subscription.retry_at = None
+    db.session.commit()
+    click.echo(f"✓ {requeued} events requeued for webhook {subscription_id}")
+
+
+@webhooks_cli.command('run')
+@click.option('--once', is_flag=True, help='Deliver what is due, then exit.')
+def webhooks_run(once):
+    """Deliver queued events (a dedicated worker; set WEBHOOKS_DISPATCH=0 on the web processes)."""
+    from .webhooks import get_dispatcher
+
+    dispatcher = get_dispatcher()
+    if once:
+        dispatcher.run_once()
+        dispatcher.stop()
+        return
+    click.echo(f"Delivering webhooks with {dispatcher.workers} workers (Ctrl+C to stop)")
+    dispatcher.run_forever()
+
+
+@click.command('ingest')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--created-by', 'created_by_email', required=True,
+              help='Email of the user recorded as creator.')
+@click.option('--batch-size', type=int, default=None,
+              help='Records per transaction (default 50000); the file is streamed, not loaded whole.')
+@with_appcontext
+def ingest_command(path, created_by_email, batch_size):
+    """Bulk-load breached credentials from a JSON, JSONL or CSV file."""
+    from .models import User
+    from .services.ingest import DEFAULT_BATCH_SIZE, bulk_insert_credentials, iter_batches, iter_records
+
+    user = User.query.filter_by(email=created_by_email.strip().lower()).first()
+    if not user:
+        raise click.ClickException(f"User not found: {created_by_email}")
+
+    inserted = 0
+    for batch in iter_batches(iter_records(path), batch_size or DEFAULT_BATCH_SIZE):
+        inserted += bulk_insert_credentials(batch, created_by=user.id)
+        click.echo(f"  {inserted} records committed")
+    click.echo(f"✓ Ingested {inserted} breached credentials from {path}")
+
+
+def register_cli(app):
+    """Attach CLI commands to the application."""
+    app.cli.add_command(database_cli)
+    app.cli.add_command(backfill_cli)
+    app.cli.add_command(static_cli)
+    app.cli.add_command(templates_cli)
+    app.cli.add_command(passwords_cli)
+    app.cli.add_command(bloom_cli)
+    app.cli.add_command(forwarder_cli)
+    app.cli.add_command(webhooks_cli)
+    app.cli.add_command(ingest_command)
@@ -0,0 +1,140 @@
+"""
+Conditional GET (ETag / 304) for per-tenant JSON and pages.
+
+Writes to tenant-visible data (credentials, companies) bump a counter in the
+``data_version`` table in the same transaction. A view decorated with
+``conditional_get`` derives its ETag from a small key (the data version, the
+user's tenant, the notification high-water mark, ...) *before* running, so a
+client that sends a matching ``If-None-Match`` gets a 304 without the view's
+queries or serialization. Responses are ``private, no-cache``: only the
+browser stores them and it always revalidates.
+"""
+import hashlib
+import time
+from datetime import date, datetime
+from functools import wraps
+from typing import Callable, Optional, Tuple
+
+from flask import Response, current_app, make_response, request, session
+from flask_login import current_user
+from sqlalchemy import func, insert, update
+
+from . import db
+
+
+TENANT_DATA = 'tenant_data'
+
+
+def bump_data_version(scope: str = TENANT_DATA, connection=None) -> None:
+    """
+    Invalidate ETags derived from ``scope``.
+
+    Call before committing the write so the bump is part of the same
+    transaction. Writers that use a Core connection instead of the ORM
+    session (bulk loaders, backfills) pass it as ``connection``.
+    """
+    from .models import DataVersion
+
+    executor = connection if connection is not None else db.session
+    now = datetime.utcnow()
+    result = executor.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == scope)
+        .values(version=DataVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        executor.execute(insert(DataVersion), {'scope': scope, 'version': 1, 'updated_at': now})
+
+
+def current_data_version(scope: str = TENANT_DATA) -> int:
+    from .models import DataVersion
+
+    version = db.session.query(DataVersion.version).filter(DataVersion.scope == scope).scalar()
+    return version or 0
+
+
+def tenant_data_key() -> Tuple:
+    """
+    What a user's view of tenant data depends on: the data version, the user
+    row (role, company, profile changes bump ``updated_at``) and their company.
+    """
+    return (current_data_version(), current_user.id, current_user.role, bool(current_user.isAdmin),
+            current_user.company_id, current_user.updated_at)
+
+
+def notification_key() -> Tuple:
+    """
+    The user's notification high-water mark: newest id and unread count.
+
+    New notifications raise the id and marking read lowers the count, so the
+    pair never repeats. ``time_ago`` strings are relative to now, so the key
+    also carries a time bucket sized to the newest notification's age.
+    """
+    from .models import Notification
+
+    newest_id, newest_at, unread = db.session.query(
+        func.max(Notification.id),
+        func.max(Notification.created_at),
+        func.count(Notification.id).filter(Notification.is_read.is_(False)),
+    ).filter(Notification.user_id == current_user.id).one()
+
+    if newest_at is None:
+        return current_user.id, 0, 0, 0
+    age = (datetime.utcnow() - newest_at).total_seconds()
+    granularity = 60 if age < 3600 else 3600 if age < 86400 else 86400
+    return current_user.id, newest_id, unread, int(time.time() // granularity)
+
+
+def page_key() -> Optional[Tuple]:
+    """
+    Extra key for full HTML pages built on ``base.html``.
+
+    Pages embed a CSRF token with a time limit and "today"-relative figures,
+    so the key changes with the session's token, the date and half the
+    token lifetime. Pages carrying flashed messages are never conditional.
+    """
+    if session.get('_flashes'):
+        return None
+    limit = current_app.config.get('WTF_CSRF_TIME_LIMIT') or 3600
+    field = current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token')
+    return session.get(field), date.today().isoformat(), int(time.time() // max(limit // 2, 60))
+
+
+def _etag_for(parts: Tuple) -> str:
+    raw = repr((request.path, sorted(request.args.items(multi=True)), parts))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _revalidate(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def conditional_get(key_func: Callable[[], Optional[Tuple]]):
+    """
+    Serve 304 Not Modified when ``key_func()`` yields the ETag the client has.
+
+    ``key_func`` runs inside the request (after login checks); returning
+    ``None`` serves the view unconditionally. Only 200 responses get an ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('CONDITIONAL_GET', True):
+                return view(*args, **kwargs)
+            parts = key_func()
+            if parts is None:
+                return view(*args, **kwargs)
+
+            etag = _etag_for(parts)
+            if etag in request.if_none_match:
+                return _revalidate(Response(status=304), etag)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _revalidate(response, etag)
+            return response
+        return wrapper
+    return decorator
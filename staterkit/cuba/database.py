@@ -0,0 +1,208 @@
+"""
+Database engine configuration.
+
+Builds the SQLAlchemy URI and engine options from the environment, applies
+SQLite connection pragmas and exposes a few dialect-specific helpers so the
+rest of the application can run unchanged on SQLite or PostgreSQL.
+"""
+import os
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, func, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+
+
+DEFAULT_DATABASE_URI = 'sqlite:///cuba.db'
+
+# Columns that are searched with ILIKE '%term%' and benefit from trigram indexes
+TRIGRAM_INDEXED_COLUMNS = ['username', 'domain', 'url', 'source']
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to default."""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def is_read_only() -> bool:
+    """True when the deployment runs against a read-only database file."""
+    return os.getenv("READ_ONLY_DB", "").lower() in {"1", "true", "yes"}
+
+
+def get_database_uri() -> str:
+    """
+    Resolve the database URI from the environment.
+
+    DATABASE_URL takes precedence over SQLALCHEMY_DATABASE_URI. Heroku-style
+    ``postgres://`` URLs are normalized to ``postgresql://``.
+    """
+    uri = os.environ.get('DATABASE_URL') or os.environ.get('SQLALCHEMY_DATABASE_URI') or DEFAULT_DATABASE_URI
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def build_engine_options(uri: str) -> Dict[str, Any]:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for the given URI.
+
+    Environment variables:
+        DB_POOL_SIZE: Persistent connections kept per process (default 5)
+        DB_MAX_OVERFLOW: Extra connections allowed under burst load (default 10)
+        DB_POOL_TIMEOUT: Seconds to wait for a pooled connection (default 30)
+        DB_POOL_RECYCLE: Recycle connections older than N seconds (default 1800)
+        DB_CONNECT_TIMEOUT: Seconds to wait when opening a connection / lock (default 30)
+        DB_STATEMENT_TIMEOUT_MS: PostgreSQL statement_timeout, 0 disables (default 0)
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {'pool_pre_ping': True}
+    connect_args: Dict[str, Any] = {}
+
+    if not _is_memory_sqlite(url):
+        # In-memory SQLite uses a static pool that does not accept sizing arguments
+        options.update({
+            'pool_size': _env_int('DB_POOL_SIZE', 5),
+            'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+            'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),
+        })
+
+    if backend == 'sqlite':
+        # sqlite3 "timeout" is the busy wait used before raising "database is locked"
+        connect_args['timeout'] = _env_int('DB_CONNECT_TIMEOUT', 30)
+        connect_args['check_same_thread'] = False
+    elif backend == 'postgresql':
+        connect_args['connect_timeout'] = _env_int('DB_CONNECT_TIMEOUT', 30)
+        statement_timeout = _env_int('DB_STATEMENT_TIMEOUT_MS', 0)
+        if statement_timeout:
+            connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+
+    if connect_args:
+        options['connect_args'] = connect_args
+    return options
+
+
+def get_sqlite_pragmas() -> Dict[str, Any]:
+    """
+    Pragmas applied to every new SQLite connection.
+
+    WAL lets readers proceed while a writer holds the lock, and NORMAL
+    synchronous is durable under WAL except on power loss.
+    """
+    pragmas = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': _env_int('SQLITE_MMAP_SIZE', 268435456),  # 256 MB
+        'cache_size': _env_int('SQLITE_CACHE_SIZE', -65536),  # negative = KiB, i.e. 64 MB
+        'busy_timeout': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+        'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+    }
+    if is_read_only():
+        # Switching journal mode writes to the database header
+        pragmas.pop('journal_mode')
+    return pragmas
+
+
+def _apply_sqlite_pragmas(pragmas, dbapi_connection, connection_record):
+    """Engine "connect" listener: run the configured PRAGMA statements."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            try:
+                cursor.execute(f"PRAGMA {name}={value}")
+            except Exception as e:
+                # A pragma that cannot be applied must not prevent the app from starting
+                print(f"Failed to apply PRAGMA {name}={value}: {e}")
+    finally:
+        cursor.close()
+
+
+def configure_database(app, uri: Optional[str] = None) -> None:
+    """
+    Populate database settings on the Flask config (before SQLAlchemy init).
+
+    An explicit ``uri`` (e.g. from ``create_app(config)``) overrides the environment.
+    """
+    uri = uri or get_database_uri()
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(uri)
+
+
+def init_database(app, db) -> None:
+    """Attach dialect-specific connection hooks to the application's engine."""
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', partial(_apply_sqlite_pragmas, get_sqlite_pragmas()))
+
+
+def dialect_name(session_or_engine) -> str:
+    """Return the dialect name ('sqlite', 'postgresql', ...) for a session or engine."""
+    bind = session_or_engine.get_bind() if hasattr(session_or_engine, 'get_bind') else session_or_engine
+    return bind.dialect.name
+
+
+def day_bucket(column, dialect: str):
+    """
+    SQL expression that formats a datetime column as 'YYYY-MM-DD'.
+
+    SQLite has no date type so strftime is used; PostgreSQL uses to_char.
+    """
+    if dialect == 'postgresql':
+        return func.to_char(column, 'YYYY-MM-DD')
+    return func.strftime('%Y-%m-%d', column)
+
+
+def create_search_indexes(engine) -> List[str]:
+    """
+    Create dialect-specific indexes that speed up substring search.
+
+    On PostgreSQL this installs pg_trgm and builds GIN trigram indexes so
+    ``ILIKE '%term%'`` filters can use an index. SQLite has no equivalent and
+    the call is a no-op.
+
+    Returns:
+        List of index names that were created (or already existed)
+    """
+    if engine.dialect.name != 'postgresql':
+        return []
+
+    created = []
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for column in TRIGRAM_INDEXED_COLUMNS:
+            index_name = f"ix_breached_credential_{column}_trgm"
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} "
+                f"ON breached_credential USING gin ({column} gin_trgm_ops)"
+            ))
+            created.append(index_name)
+    return created
+
+
+def describe_engine(engine) -> Dict[str, Any]:
+    """Return a summary of the active engine and, for SQLite, its effective pragmas."""
+    info: Dict[str, Any] = {
+        'url': engine.url.render_as_string(hide_password=True),
+        'dialect': engine.dialect.name,
+        'pool': type(engine.pool).__name__,
+    }
+    if engine.dialect.name == 'sqlite':
+        pragmas = {}
+        with engine.connect() as conn:
+            for name in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout'):
+                try:
+                    pragmas[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                except OperationalError:
+                    pragmas[name] = None
+        info['pragmas'] = pragmas
+    return info
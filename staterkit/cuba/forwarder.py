@@ -0,0 +1,433 @@
+"""
+Near-real-time forwarding of new breach matches to a SIEM.
+
+When ingest (bulk or the add form) commits credentials that match a tenant
+(``company_id`` set), each one is formatted as a syslog line (RFC 5424
+header, CEF or JSON payload) and queued for a background sender.
+``FORWARDER_URL`` selects the destination:
+
+- ``tcp://host:port``: one persistent connection, newline-framed, reconnected on error
+- ``udp://host:port``: one datagram per event
+- ``file:///path/to/breaches.log``: appended lines for a local log shipper
+
+The sender writes in batches of up to ``FORWARDER_BATCH_SIZE`` lines.
+Ingest never waits for the SIEM. When the in-memory queue is full, or a
+batch cannot be delivered, the lines go to ``FORWARDER_SPOOL_DIR``. They
+are re-sent once the destination is reachable again, every
+``FORWARDER_RETRY_INTERVAL`` seconds or with ``flask forwarder drain``.
+
+Passwords are never forwarded.
+"""
+import atexit
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from flask import current_app
+
+FORMATS = ('cef', 'json')
+FACILITY = 10  # security/authorization messages
+SYSLOG_SEVERITY = 4  # warning
+CEF_SEVERITY = {'stealer': 9, 'malware': 9, 'phishing': 8}
+DEFAULT_CEF_SEVERITY = 7
+APP_NAME = 'cuba'
+STALE_CLAIM_SECONDS = 600  # A '.sending' file this old belongs to a worker that died mid-send
+
+
+# ---------------------------------------------------------------------------
+# Formatting
+# ---------------------------------------------------------------------------
+
+def credential_event(row) -> Dict:
+    """The forwarded fields of a credential (row mapping or ORM object); no password."""
+    get = row.get if isinstance(row, dict) else (lambda name: getattr(row, name, None))
+    created_at = get('created_at') or datetime.utcnow()
+    return {
+        'id': get('id'),
+        'username': get('username'),
+        'domain': get('domain'),
+        'url': get('url'),
+        'source': get('source'),
+        'type': get('type'),
+        'company_id': get('company_id'),
+        'created_at': created_at.replace(tzinfo=timezone.utc) if created_at.tzinfo is None else created_at,
+    }
+
+
+def _cef_header(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('|', '\\|')
+
+
+def _cef_value(value) -> str:
+    return (str(value).replace('\\', '\\\\').replace('=', '\\=')
+            .replace('\r', '\\r').replace('\n', '\\n'))
+
+
+def format_cef(event: Dict) -> str:
+    severity = CEF_SEVERITY.get((event.get('type') or '').lower(), DEFAULT_CEF_SEVERITY)
+    extension = [
+        ('rt', int(event['created_at'].timestamp() * 1000)),
+        ('externalId', event.get('id')),
+        ('suser', event.get('username')),
+        ('dhost', event.get('domain')),
+        ('request', event.get('url')),
+        ('cs1Label', 'source'), ('cs1', event.get('source')),
+        ('cs2Label', 'type'), ('cs2', event.get('type')),
+        ('cn1Label', 'companyId'), ('cn1', event.get('company_id')),
+    ]
+    header = '|'.join(_cef_header(part) for part in (
+        'CEF:0', 'DSecLab', 'Cuba Threat Intelligence', '1.0',
+        'breached-credential', 'Breached credential matched', severity,
+    ))
+    return header + '|' + ' '.join(f'{key}={_cef_value(value)}' for key, value in extension if value is not None)
+
+
+def format_json(event: Dict) -> str:
+    payload = dict(event, created_at=event['created_at'].isoformat(), event='breached-credential')
+    return json.dumps(payload, separators=(',', ':'), default=str)
+
+
+def syslog_line(message: str, timestamp: Optional[datetime] = None, hostname: Optional[str] = None) -> str:
+    """RFC 5424 header + message (no structured data, no trailing newline)."""
+    timestamp = (timestamp or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    stamp = timestamp.strftime('%Y-%m-%dT%H:%M:%S.') + f'{timestamp.microsecond // 1000:03d}Z'
+    return f'<{FACILITY * 8 + SYSLOG_SEVERITY}>1 {stamp} {hostname or socket.gethostname()} {APP_NAME} ' \
+           f'{os.getpid()} breach - {message}'
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+class TcpTransport:
+    """One persistent, newline-framed TCP connection; reconnects on the next send after an error."""
+
+    def __init__(self, host: str, port: int, timeout: float = 5.0):
+        self.address = (host, port)
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def send(self, lines: List[str]) -> None:
+        if self._sock is None:
+            self._sock = socket.create_connection(self.address, timeout=self.timeout)
+        try:
+            self._sock.sendall(''.join(line + '\n' for line in lines).encode('utf-8'))
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+
+class UdpTransport:
+    """One datagram per line (RFC 5426); delivery is not confirmed."""
+
+    def __init__(self, host: str, port: int):
+        self.address = (host, port)
+        self._sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, lines: List[str]) -> None:
+        for line in lines:
+            self._sock.sendto(line.encode('utf-8'), self.address)
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+class FileTransport:
+    """Appends lines to a file for a local log shipper."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, lines: List[str]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(line + '\n' for line in lines))
+
+    def close(self) -> None:
+        pass
+
+
+def transport_from_url(url: str, timeout: float = 5.0):
+    parsed = urlparse(url)
+    if parsed.scheme == 'tcp':
+        return TcpTransport(parsed.hostname, parsed.port or 514, timeout=timeout)
+    if parsed.scheme == 'udp':
+        return UdpTransport(parsed.hostname, parsed.port or 514)
+    if parsed.scheme == 'file':
+        return FileTransport(parsed.path)
+    raise ValueError(f"Unsupported FORWARDER_URL {url!r} (expected tcp://, udp:// or file://)")
+
+
+# ---------------------------------------------------------------------------
+# Disk spool
+# ---------------------------------------------------------------------------
+
+class Spool:
+    """Undelivered lines as files in a directory, oldest first; safe to share between processes."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        with self._lock:
+            self._counter += 1
+            name = f'{time.time_ns():020d}-{os.getpid()}-{self._counter}.log'
+        temp = os.path.join(self.directory, name + '.tmp')
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(''.join(line + '\n' for line in lines))
+        os.replace(temp, os.path.join(self.directory, name))
+
+    def pending(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.log'))
+
+    def size(self) -> Dict[str, int]:
+        files = self.pending()
+        return {'files': len(files),
+                'bytes': sum(os.path.getsize(os.path.join(self.directory, name)) for name in files)}
+
+    def replay(self, send) -> int:
+        """
+        Send spooled files in order until one fails (the error propagates).
+
+        A file is claimed by renaming it, so concurrent workers never send
+        the same file twice. It is deleted once sent, or put back on failure.
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith('.sending') and time.time() - os.path.getmtime(path) > STALE_CLAIM_SECONDS:
+                    os.replace(path, path.rsplit('.', 2)[0])
+            except FileNotFoundError:
+                pass
+
+        sent = 0
+        for name in self.pending():
+            path = os.path.join(self.directory, name)
+            claimed = f'{path}.{os.getpid()}.sending'
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue  # Another worker took it
+            os.utime(claimed)  # The claim's age, not the spool file's
+            with open(claimed, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            try:
+                send(lines)
+            except Exception:
+                os.rename(claimed, path)
+                raise
+            os.remove(claimed)
+            sent += len(lines)
+        return sent
+
+
+# ---------------------------------------------------------------------------
+# Forwarder
+# ---------------------------------------------------------------------------
+
+class Forwarder:
+    """Queue + background sender thread with batching, spooling and retry."""
+
+    def __init__(self, transport, spool: Spool, fmt: str = 'cef', batch_size: int = 500,
+                 queue_size: int = 10_000, flush_interval: float = 0.5, retry_interval: float = 5.0,
+                 logger=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown forwarder format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        self.transport = transport
+        self.spool = spool
+        self.formatter = format_cef if fmt == 'cef' else format_json
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.logger = logger
+        self.stats = {'queued': 0, 'sent': 0, 'spooled': 0, 'errors': 0}
+        self._queue: 'queue.Queue[str]' = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._retry_at = 0.0
+
+    def _ensure_started(self) -> None:
+        # Started on first use and again after a fork: threads do not survive fork()
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='cuba-forwarder', daemon=True)
+                self._thread.start()
+
+    def submit(self, events: Iterable[Dict]) -> int:
+        """Format and queue events; spills to the spool instead of blocking when the queue is full."""
+        lines = [syslog_line(self.formatter(event), event['created_at']) for event in events]
+        if not lines:
+            return 0
+        self._ensure_started()
+        overflow = []
+        for index, line in enumerate(lines):
+            try:
+                self._queue.put_nowait(line)
+            except queue.Full:
+                overflow = lines[index:]
+                break
+        self.stats['queued'] += len(lines) - len(overflow)
+        if overflow:
+            self.spool.write(overflow)
+            self.stats['spooled'] += len(overflow)
+        return len(lines)
+
+    def _next_batch(self, wait: float) -> List[str]:
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=wait))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _deliver(self, batch: List[str]) -> None:
+        try:
+            if time.monotonic() < self._retry_at:
+                raise ConnectionError('destination unavailable, waiting to retry')
+            self.transport.send(batch)
+            self.stats['sent'] += len(batch)
+        except OSError as exc:
+            if time.monotonic() >= self._retry_at:
+                self.stats['errors'] += 1
+                if self.logger:
+                    self.logger.warning('SIEM forwarder: delivery failed (%s); spooling', exc)
+            self._retry_at = time.monotonic() + self.retry_interval
+            self.spool.write(batch)
+            self.stats['spooled'] += len(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def replay_spool(self) -> int:
+        """Send spooled lines now; returns how many were sent (stops at the first failure)."""
+        sent = 0
+
+        def send(lines):
+            nonlocal sent
+            self.transport.send(lines)
+            sent += len(lines)
+
+        try:
+            self.spool.replay(send)
+        except OSError as exc:
+            self._retry_at = time.monotonic() + self.retry_interval
+            if self.logger:
+                self.logger.warning('SIEM forwarder: spool replay failed (%s)', exc)
+        self.stats['sent'] += sent
+        return sent
+
+    def _run(self) -> None:
+        next_replay = 0.0
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._next_batch(self.flush_interval)
+            if batch:
+                self._deliver(batch)
+            now = time.monotonic()
+            if now >= next_replay and now >= self._retry_at:
+                next_replay = now + self.retry_interval
+                self.replay_spool()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued line was sent or spooled."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the sender; lines it could not send in time are spooled."""
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+                self._queue.task_done()
+            except queue.Empty:
+                break
+        self.spool.write(leftover)
+        self.transport.close()
+
+
+def init_forwarder(app) -> None:
+    app.config.setdefault('FORWARDER_URL', None)
+    app.config.setdefault('FORWARDER_FORMAT', 'cef')
+    app.config.setdefault('FORWARDER_BATCH_SIZE', 500)
+    app.config.setdefault('FORWARDER_QUEUE_SIZE', 10_000)
+    app.config.setdefault('FORWARDER_RETRY_INTERVAL', 5.0)
+    spool_dir = app.config.get('FORWARDER_SPOOL_DIR') or os.path.join(app.instance_path, 'forwarder_spool')
+    app.config['FORWARDER_SPOOL_DIR'] = spool_dir
+    if not app.config['FORWARDER_URL']:
+        return
+
+    forwarder = Forwarder(
+        transport_from_url(app.config['FORWARDER_URL']),
+        Spool(spool_dir),
+        fmt=app.config['FORWARDER_FORMAT'],
+        batch_size=app.config['FORWARDER_BATCH_SIZE'],
+        queue_size=app.config['FORWARDER_QUEUE_SIZE'],
+        retry_interval=app.config['FORWARDER_RETRY_INTERVAL'],
+        logger=app.logger,
+    )
+    app.extensions['forwarder'] = forwarder
+    atexit.register(forwarder.close)
+
+
+def get_forwarder() -> Optional[Forwarder]:
+    return current_app.extensions.get('forwarder')
+
+
+def forward_credentials(credentials: Iterable) -> int:
+    """Queue the tenant-matched ones among committed ORM credentials."""
+    forwarder = get_forwarder()
+    if forwarder is None:
+        return 0
+    return forwarder.submit(credential_event(credential) for credential in credentials if credential.company_id)
+
+
+def forward_credential_range(lower: int, upper: int) -> int:
+    """Queue the tenant-matched credentials with ``lower < id <= upper`` (bulk ingest, after commit)."""
+    from . import db
+    from .models import BreachedCredential
+
+    forwarder = get_forwarder()
+    if forwarder is None or upper <= lower:
+        return 0
+    columns = [BreachedCredential.id, BreachedCredential.username, BreachedCredential.domain,
+               BreachedCredential.url, BreachedCredential.source, BreachedCredential.type,
+               BreachedCredential.company_id, BreachedCredential.created_at]
+    rows = db.session.execute(
+        db.select(*columns)
+        .where(BreachedCredential.id > lower, BreachedCredential.id <= upper,
+               BreachedCredential.company_id.isnot(None))
+        .order_by(BreachedCredential.id)
+    )
+    return forwarder.submit(credential_event(dict(row._mapping)) for row in rows)
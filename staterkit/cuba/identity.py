@@ -0,0 +1,104 @@
+"""
+Cached identity for Flask-Login and JWT requests.
+
+Every authenticated request needs the user, their company and the company's
+watchlist (``security.get_user_watchlist_domains``). Loading them costs three
+queries before the view runs. Instead, a snapshot of the three rows is kept
+in the app cache for ``IDENTITY_CACHE_TTL`` seconds (0 disables it). On a hit
+the rows are merged into the session with ``load=False``: they behave like
+loaded objects and no SQL is emitted.
+
+Writes that change a snapshot must call ``invalidate_identity`` (one user) or
+``invalidate_company_identities`` (everyone in a company). The TTL bounds how
+long any other change, e.g. a direct SQL update, can go unnoticed.
+"""
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from . import cache, db
+
+
+def _key(user_id) -> str:
+    return f'identity:{int(user_id)}'
+
+
+def _ttl() -> int:
+    return int(current_app.config.get('IDENTITY_CACHE_TTL', 60) or 0)
+
+
+def _columns(obj) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _detached(model, values: Dict[str, Any]):
+    """Build an instance that looks freshly loaded (no pending changes), outside any session."""
+    obj = model.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _snapshot(user) -> Dict[str, Any]:
+    company = user.company
+    return {
+        'user': _columns(user),
+        'company': _columns(company) if company else None,
+        'watchlist': [_columns(entry) for entry in company.watchlist_entries] if company else [],
+    }
+
+
+def _restore(snapshot: Dict[str, Any]):
+    from .models import Company, User, WatchlistEntry
+
+    user = _detached(User, snapshot['user'])
+    company = None
+    if snapshot['company'] is not None:
+        company = _detached(Company, snapshot['company'])
+        set_committed_value(company, 'watchlist_entries',
+                            [_detached(WatchlistEntry, values) for values in snapshot['watchlist']])
+    set_committed_value(user, 'company', company)
+    return db.session.merge(user, load=False)
+
+
+def load_identity(user_id):
+    """Return the user for ``user_id`` (or None), from the identity cache when possible."""
+    from .models import Company, User
+
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    ttl = _ttl()
+    if ttl:
+        snapshot = cache.get(_key(user_id))
+        if snapshot is not None:
+            return _restore(snapshot)
+
+    user = (User.query
+            .options(selectinload(User.company).selectinload(Company.watchlist_entries))
+            .filter(User.id == user_id)
+            .first())
+    if user is not None and ttl:
+        cache.set(_key(user_id), _snapshot(user), timeout=ttl)
+    return user
+
+
+def invalidate_identity(*user_ids: int) -> None:
+    if user_ids:
+        cache.delete_many(*[_key(user_id) for user_id in user_ids])
+
+
+def invalidate_company_identities(company_id: Optional[int]) -> None:
+    """Drop the snapshots of every user in a company (company or watchlist changed)."""
+    from .models import User
+
+    if company_id is None:
+        return
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.company_id == company_id)]
+    invalidate_identity(*user_ids)
@@ -0,0 +1,460 @@
+"""
+Prometheus-format application metrics.
+
+Values are kept in per-thread shards: each thread only ever writes to its own
+dict, so the request path takes no locks. A snapshot merges the shards of the
+process (``dict.copy()`` is atomic under the GIL).
+
+With several worker processes set METRICS_DIR to a directory shared by the
+workers. Every process periodically writes its snapshot to
+``METRICS_DIR/metrics_<pid>_<start>.json`` (atomic rename) and a scrape sums
+the files of all workers. The start time (ms) tells apart processes that
+reuse a pid. A scrape folds the counters and histograms of exited workers
+into ``retired_metrics.json`` and deletes their files, so totals never go
+backwards and the directory does not grow with restarts. Gauges are only
+summed for live processes.
+
+Configuration:
+    METRICS_ENABLED: Collect request metrics (default True)
+    METRICS_DIR: Shared directory for multi-process aggregation (default: unset, single process)
+    METRICS_FLUSH_INTERVAL: Seconds between snapshot writes per process (default 5)
+    METRICS_TOKEN: Bearer token accepted by /metrics in addition to admin sessions
+    METRICS_INTERNAL_PORT: Also serve /metrics on 127.0.0.1:<port> without authentication
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import g, request
+from flask_caching import Cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: scrapes are not serialized
+    fcntl = None
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+EXPORT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+FANOUT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+INGEST_BATCH_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'cuba_http_requests_total': (
+        'counter', 'HTTP requests by blueprint, endpoint, method and status.', None),
+    'cuba_http_request_duration_seconds': (
+        'histogram', 'HTTP request latency by blueprint and endpoint.', LATENCY_BUCKETS),
+    'cuba_http_requests_in_flight': (
+        'gauge', 'HTTP requests currently being handled.', None),
+    'cuba_db_queries_total': (
+        'counter', 'SQL statements executed, by blueprint and endpoint.', None),
+    'cuba_db_time_seconds_total': (
+        'counter', 'Time spent executing SQL, by blueprint and endpoint.', None),
+    'cuba_cache_requests_total': (
+        'counter', 'Cache lookups by key namespace and result (hit/miss).', None),
+    'cuba_notification_fanout_size': (
+        'histogram', 'Notifications created per breach event.', FANOUT_BUCKETS),
+    'cuba_ingest_records_total': (
+        'counter', 'Breached credentials ingested, by ingest path.', None),
+    'cuba_ingest_batch_size': (
+        'histogram', 'Records per ingest batch, by ingest path.', INGEST_BATCH_BUCKETS),
+    'cuba_ingest_duration_seconds_total': (
+        'counter', 'Time spent ingesting breached credentials, by ingest path.', None),
+    'cuba_export_duration_seconds': (
+        'histogram', 'Export job duration by format.', EXPORT_BUCKETS),
+    'cuba_export_rows_total': (
+        'counter', 'Rows exported by format.', None),
+    'cuba_webhook_deliveries_total': (
+        'counter', 'Webhook POSTs by result (success/failure).', None),
+    'cuba_webhook_events_total': (
+        'counter', 'Events in webhook POSTs by result (success/failure).', None),
+    'cuba_webhook_delivery_duration_seconds': (
+        'histogram', 'Webhook POST latency by result.', LATENCY_BUCKETS),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Key = Tuple[str, Labels, str]  # (metric name, labels, sample suffix / bucket bound)
+
+
+class MetricsRegistry:
+    """Per-process metric storage with lock-free per-thread shards."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []  # (thread, dict) pairs; list.append is atomic
+        self._retired: Dict[Key, float] = {}  # values of exited threads
+        self._fold_lock = threading.Lock()  # only taken by snapshot(), never on the hot path
+
+    def _shard(self) -> Dict[Key, float]:
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = {}
+            self._local.values = shard
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1.0) -> None:
+        """Increment a counter (or move a gauge by ``amount``)."""
+        key = (name, _labels(labels), '')
+        shard = self._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record one histogram observation."""
+        buckets = METRICS[name][2]
+        label_key = _labels(labels)
+        bound = '+Inf'
+        for upper in buckets:
+            if value <= upper:
+                bound = _format_bound(upper)
+                break
+        shard = self._shard()
+        for suffix, amount in ((f'le={bound}', 1.0), ('sum', value), ('count', 1.0)):
+            key = (name, label_key, suffix)
+            shard[key] = shard.get(key, 0.0) + amount
+
+    def fold_dead_threads(self) -> None:
+        """Fold shards of exited threads into one dict so short-lived threads don't pile up."""
+        with self._fold_lock:
+            for pair in list(self._shards):
+                thread, shard = pair
+                if not thread.is_alive():
+                    _merge(self._retired, shard)
+                    self._shards.remove(pair)
+
+    def snapshot(self) -> Dict[Key, float]:
+        """Merge all shards of this process into one dict."""
+        self.fold_dead_threads()
+        with self._fold_lock:
+            merged = dict(self._retired)
+            for _, shard in list(self._shards):
+                _merge(merged, shard.copy())
+        return merged
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    if not labels:
+        return ()
+    return tuple(sorted((k, '' if v is None else str(v)) for k, v in labels.items()))
+
+
+def _format_bound(value: float) -> str:
+    return repr(float(value))
+
+
+def _merge(target: Dict, source: Dict) -> None:
+    for key, value in source.items():
+        target[key] = target.get(key, 0.0) + value
+
+
+registry = MetricsRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Helpers used by the rest of the application
+# ---------------------------------------------------------------------------
+
+def record_cache_lookup(key: str, hit: bool) -> None:
+    """Count a cache lookup under the key's namespace (text before the first ':')."""
+    namespace = key.split(':', 1)[0] if ':' in key else 'default'
+    registry.inc('cuba_cache_requests_total', {'namespace': namespace, 'result': 'hit' if hit else 'miss'})
+
+
+def record_notification_fanout(size: int) -> None:
+    registry.observe('cuba_notification_fanout_size', size)
+
+
+def record_ingest(path: str, records: int, duration: float) -> None:
+    """Record an ingest batch. ``path`` is 'form' or 'bulk'."""
+    registry.inc('cuba_ingest_records_total', {'path': path}, records)
+    registry.inc('cuba_ingest_duration_seconds_total', {'path': path}, duration)
+    registry.observe('cuba_ingest_batch_size', records, {'path': path})
+
+
+def record_export(export_format: str, rows: int, duration: float) -> None:
+    registry.observe('cuba_export_duration_seconds', duration, {'format': export_format})
+    registry.inc('cuba_export_rows_total', {'format': export_format}, rows)
+
+
+def record_webhook_delivery(success: bool, events: int, duration: float) -> None:
+    labels = {'result': 'success' if success else 'failure'}
+    registry.inc('cuba_webhook_deliveries_total', labels)
+    registry.inc('cuba_webhook_events_total', labels, events)
+    registry.observe('cuba_webhook_delivery_duration_seconds', duration, labels)
+
+
+class InstrumentedCache(Cache):
+    """Flask-Caching ``Cache`` that counts ``get`` hits and misses per key namespace."""
+
+    def get(self, key, *args, **kwargs):
+        value = super().get(key, *args, **kwargs)
+        record_cache_lookup(str(key), value is not None)
+        return value
+
+
+# ---------------------------------------------------------------------------
+# Multi-process aggregation
+# ---------------------------------------------------------------------------
+
+_last_flush = [0.0]
+_process = {'pid': None, 'started': 0}  # Start time in ms, set again in forked children
+
+RETIRED_FILE = 'retired_metrics.json'
+LOCK_FILE = 'metrics.lock'
+
+
+def _encode(snapshot: Dict[Key, float]):
+    return [[name, list(map(list, labels)), suffix, value] for (name, labels, suffix), value in snapshot.items()]
+
+
+def _decode(rows) -> Dict[Key, float]:
+    return {(name, tuple(tuple(pair) for pair in labels), suffix): value for name, labels, suffix, value in rows}
+
+
+def _read(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path: str, data: Dict) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def flush(metrics_dir: str) -> None:
+    """Write this process's snapshot to METRICS_DIR (atomic replace)."""
+    pid = os.getpid()
+    if _process['pid'] != pid:
+        _process.update(pid=pid, started=int(time.time() * 1000))
+    started = _process['started']
+    _write(os.path.join(metrics_dir, f'metrics_{pid}_{started}.json'),
+           {'pid': pid, 'started': started, 'values': _encode(registry.snapshot())})
+    _last_flush[0] = time.monotonic()
+
+
+def maybe_flush(app) -> None:
+    """Write the snapshot (or just compact thread shards) once per METRICS_FLUSH_INTERVAL."""
+    if time.monotonic() - _last_flush[0] < app.config['METRICS_FLUSH_INTERVAL']:
+        return
+    metrics_dir = app.config.get('METRICS_DIR')
+    if not metrics_dir:
+        registry.fold_dead_threads()
+        _last_flush[0] = time.monotonic()
+        return
+    try:
+        flush(metrics_dir)
+    except OSError as e:
+        print(f"Failed to flush metrics: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _locked(metrics_dir: str):
+    """Serialize scrapes across workers, so a dead worker's file is folded only once."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(metrics_dir, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def collect(app) -> Dict[Key, float]:
+    """Aggregate values across all worker processes (or just this one)."""
+    metrics_dir = app.config.get('METRICS_DIR')
+    if not metrics_dir:
+        return registry.snapshot()
+
+    flush(metrics_dir)
+    with _locked(metrics_dir):
+        workers = {}
+        for filename in os.listdir(metrics_dir):
+            if filename.startswith('metrics_') and filename.endswith('.json'):
+                data = _read(os.path.join(metrics_dir, filename))
+                if data is not None:
+                    workers[filename] = data
+        newest: Dict[int, int] = {}
+        for data in workers.values():
+            newest[data.get('pid', 0)] = max(newest.get(data.get('pid', 0), 0), data.get('started', 0))
+
+        retired_path = os.path.join(metrics_dir, RETIRED_FILE)
+        retired = _read(retired_path) or {}
+        # Files folded by a scrape that stopped before deleting them
+        already_folded = set(retired.get('folded', []))
+        retired_values = _decode(retired.get('values', []))
+
+        merged: Dict[Key, float] = {}
+        dead = []
+        for filename, data in workers.items():
+            values = _decode(data.get('values', []))
+            pid = data.get('pid', 0)
+            # An older file for a pid that is in use again belongs to an exited worker
+            if _pid_alive(pid) and data.get('started', 0) >= newest[pid]:
+                _merge(merged, values)
+                continue
+            dead.append(filename)
+            if filename not in already_folded:
+                _merge(retired_values, {key: value for key, value in values.items()
+                                        if METRICS.get(key[0], ('',))[0] != 'gauge'})
+
+        if dead:
+            _write(retired_path, {'folded': dead, 'values': _encode(retired_values)})
+            for filename in dead:
+                try:
+                    os.remove(os.path.join(metrics_dir, filename))
+                except FileNotFoundError:
+                    pass
+    _merge(merged, retired_values)
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _render_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render(values: Dict[Key, float]) -> str:
+    """Render values in the Prometheus text exposition format (0.0.4)."""
+    by_metric: Dict[str, Dict[Labels, Dict[str, float]]] = {}
+    for (name, labels, suffix), value in values.items():
+        by_metric.setdefault(name, {}).setdefault(labels, {})[suffix] = value
+
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        series = by_metric.get(name, {})
+        for labels in sorted(series):
+            samples = series[labels]
+            if metric_type != 'histogram':
+                lines.append(f'{name}{_render_labels(labels)} {_format_value(samples.get("", 0.0))}')
+                continue
+            cumulative = 0.0
+            for bound in [_format_bound(b) for b in buckets] + ['+Inf']:
+                cumulative += samples.get(f'le={bound}', 0.0)
+                lines.append(f'{name}_bucket{_render_labels(labels + (("le", bound),))} {_format_value(cumulative)}')
+            lines.append(f'{name}_sum{_render_labels(labels)} {_format_value(samples.get("sum", 0.0))}')
+            lines.append(f'{name}_count{_render_labels(labels)} {_format_value(samples.get("count", 0.0))}')
+    return '\n'.join(lines) + '\n'
+
+
+# ---------------------------------------------------------------------------
+# Request hooks
+# ---------------------------------------------------------------------------
+
+def _request_labels() -> Dict[str, str]:
+    endpoint = request.endpoint or 'unmatched'
+    return {'blueprint': request.blueprint or 'app', 'endpoint': endpoint}
+
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+    registry.inc('cuba_http_requests_in_flight')
+
+
+def _make_finish_request(app):
+    def _finish_request(response):
+        start = g.get('metrics_start')
+        if start is None:
+            return response
+        labels = _request_labels()
+        registry.observe('cuba_http_request_duration_seconds', time.perf_counter() - start, labels)
+        registry.inc('cuba_http_requests_total',
+                     dict(labels, method=request.method, status=str(response.status_code)))
+
+        sql_stats = g.get('sql_stats')
+        if sql_stats is not None:
+            registry.inc('cuba_db_queries_total', labels, sql_stats.count)
+            registry.inc('cuba_db_time_seconds_total', labels, sql_stats.total)
+        return response
+    return _finish_request
+
+
+def _make_teardown_request(app):
+    def _teardown_request(exc):
+        if g.pop('metrics_start', None) is not None:
+            registry.inc('cuba_http_requests_in_flight', amount=-1)
+        maybe_flush(app)
+    return _teardown_request
+
+
+def _start_internal_listener(app, port: int) -> None:
+    """Serve unauthenticated /metrics on the loopback interface from a daemon thread."""
+    from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    def metrics_app(environ, start_response):
+        if environ.get('PATH_INFO') != '/metrics':
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'Not Found']
+        body = render(collect(app)).encode('utf-8')
+        start_response('200 OK', [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')])
+        return [body]
+
+    try:
+        server = make_server('127.0.0.1', port, metrics_app, handler_class=QuietHandler)
+    except OSError:
+        # Another worker already owns the port; it serves the aggregated values
+        return
+    threading.Thread(target=server.serve_forever, name='metrics-listener', daemon=True).start()
+
+
+def init_metrics(app) -> None:
+    """Register request hooks and, if configured, the internal metrics listener."""
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('METRICS_DIR', None)
+    app.config.setdefault('METRICS_FLUSH_INTERVAL', 5)
+    app.config.setdefault('METRICS_TOKEN', None)
+    app.config.setdefault('METRICS_INTERNAL_PORT', None)
+
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    if app.config['METRICS_DIR']:
+        os.makedirs(app.config['METRICS_DIR'], exist_ok=True)
+
+    app.before_request(_start_request)
+    # Registered after the SQL instrumentation hooks, so this runs before they clear g.sql_stats
+    app.after_request(_make_finish_request(app))
+    app.teardown_request(_make_teardown_request(app))
+
+    if app.config['METRICS_INTERNAL_PORT']:
+        _start_internal_listener(app, int(app.config['METRICS_INTERNAL_PORT']))
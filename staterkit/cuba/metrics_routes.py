@@ -0,0 +1,28 @@
+import hmac
+
+from flask import Blueprint, Response, abort, current_app, request
+from flask_login import current_user
+
+from .metrics import collect, render
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _has_metrics_access() -> bool:
+    """Admins, or scrapers presenting METRICS_TOKEN as a bearer token."""
+    token = current_app.config.get('METRICS_TOKEN')
+    auth_header = request.headers.get('Authorization', '')
+    if token and auth_header.startswith('Bearer '):
+        if hmac.compare_digest(auth_header[len('Bearer '):].strip(), token):
+            return True
+    return current_user.is_authenticated and (current_user.role == 'admin' or current_user.isAdmin)
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """Prometheus text exposition of the application metrics."""
+    if not _has_metrics_access():
+        abort(403)
+    body = render(collect(current_app))
+    return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8',
+                    headers={'Cache-Control': 'no-store'})
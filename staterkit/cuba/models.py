@@ -1,7 +1,7 @@
 from . import db
+from .passwords import hash_password, needs_rehash, verify_password
 import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 import re
 
 
@@ -91,12 +91,16 @@ class User(db.Model, UserMixin):
 
     # Credential helpers
     def set_password(self, raw_password: str) -> None:
-        """Hash and store the password."""
-        self.password = generate_password_hash(raw_password)
+        """Hash and store the password with the current hashing policy."""
+        self.password = hash_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
         """Return True if the provided password matches the stored hash."""
-        return check_password_hash(self.password, raw_password)
+        return verify_password(self.password, raw_password)
+
+    def password_needs_rehash(self) -> bool:
+        """True if the stored hash was made with another method or cost than the current policy."""
+        return needs_rehash(self.password)
 
 
 class Todo(db.Model):
@@ -107,6 +111,11 @@ class Todo(db.Model):
 
 
 class Notification(db.Model):
+    __table_args__ = (
+        # Per-user dropdown and unread count (see migration c5a9e3f1d274)
+        db.Index('ix_notification_user_read_created', 'user_id', 'is_read', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     notification_type = db.Column(db.String(50), default='info')  # alert, info, warning, success
@@ -132,18 +141,18 @@ class BreachedCredential(db.Model):
     _score = db.Column(db.Float, nullable=True)  # Score value
     domain = db.Column(db.String(200), nullable=True, index=True)  # Domain
     password = db.Column(db.String(500), nullable=True)  # Password (plain text)
-    source = db.Column(db.String(200), nullable=True)  # Source
+    source = db.Column(db.String(200), nullable=True, index=True)  # Source
     type = db.Column(db.String(50), nullable=True, index=True)  # Type
     url = db.Column(db.String(500), nullable=True)  # URL
     username = db.Column(db.String(200), nullable=True, index=True)  # Username
     
     # Metadata fields (kept for system functionality)
-    is_marked = db.Column(db.Boolean, default=False)  # Marked by member for review
+    is_marked = db.Column(db.Boolean, default=False, index=True)  # Marked by member for review
     marked_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     marked_at = db.Column(db.DateTime, nullable=True)
     company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=True)
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     creator = db.relationship('User', foreign_keys=[created_by], backref='breached_credentials')
@@ -169,10 +178,14 @@ class BreachedCredential(db.Model):
         return type_colors.get(self.type.lower(), 'secondary')
 
 
+# Case-insensitive identity lookups join on lower(username) (see migration 9b6d4e2f8a13)
+db.Index('ix_breached_credential_username_lower', db.func.lower(BreachedCredential.username))
+
+
 class WatchlistEntry(db.Model):
     """Watchlist entries for companies - supports multiple entries per company"""
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=False, index=True)
     entry_type = db.Column(db.String(20), nullable=False)  # domain, url, email, slug, ip_address
     entry_value = db.Column(db.String(500), nullable=False)  # The actual value
     description = db.Column(db.Text, nullable=True)  # Optional description
@@ -216,10 +229,106 @@ class UserActivity(db.Model):
     location = db.Column(db.String(200), nullable=True)  # Geographic location (if available)
     status = db.Column(db.String(20), default='success', nullable=False)  # success, failed
     failure_reason = db.Column(db.String(200), nullable=True)  # Reason for failure (invalid_password, user_inactive, etc.)
+    attempt_count = db.Column(db.Integer, default=1, server_default='1', nullable=False)  # Repeated failures folded into this row
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, index=True)
     
     # Relationships
     user = db.relationship('User', backref='activities')
     
     def __repr__(self):
-        return f"UserActivity('{self.activity_type}', '{self.user_id}', '{self.status}', '{self.created_at}')"
\ No newline at end of file
+        return f"UserActivity('{self.activity_type}', '{self.user_id}', '{self.status}', '{self.created_at}')"
+
+class BackfillCheckpoint(db.Model):
+    """Progress of resumable data backfills (see cuba/backfill.py)"""
+    name = db.Column(db.String(100), primary_key=True)
+    last_key = db.Column(db.BigInteger, default=0, nullable=False)  # Highest key processed so far
+    rows_changed = db.Column(db.BigInteger, default=0, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"BackfillCheckpoint('{self.name}', '{self.last_key}')"
+
+
+class DataVersion(db.Model):
+    """Change counters behind conditional GET ETags (see cuba/conditional.py)"""
+    scope = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"DataVersion('{self.scope}', '{self.version}')"
+
+
+class PasswordHash(db.Model):
+    """SHA-1/NTLM hash of a breached password, split for k-anonymity range lookups (see cuba/services/password_index.py)"""
+    __table_args__ = (
+        db.Index('ix_password_hash_range', 'kind', 'prefix', 'suffix'),
+    )
+
+    credential_id = db.Column(db.Integer, db.ForeignKey('breached_credential.id', ondelete='CASCADE'), primary_key=True)
+    kind = db.Column(db.String(8), primary_key=True)  # sha1, ntlm
+    prefix = db.Column(db.String(5), nullable=False)  # First 5 hex characters (upper case)
+    suffix = db.Column(db.String(35), nullable=False)  # Remaining hex characters
+
+    def __repr__(self):
+        return f"PasswordHash('{self.kind}', '{self.prefix}', '{self.credential_id}')"
+
+
+class ChangeLog(db.Model):
+    """Ordered feed of breached credential changes for delta sync (see cuba/changes.py)"""
+    seq = db.Column(db.BigInteger, primary_key=True, autoincrement=False)  # From the 'change_log' data_version counter
+    credential_id = db.Column(db.Integer, nullable=False, index=True)  # No FK: deletes are logged too
+    op = db.Column(db.String(10), nullable=False)  # insert, update, delete, mark, unmark
+    # Copies of the columns tenant filtering matches on, as of this change
+    domain = db.Column(db.String(200), nullable=True)
+    username = db.Column(db.String(200), nullable=True)
+    url = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"ChangeLog('{self.seq}', '{self.op}', '{self.credential_id}')"
+
+
+class WebhookSubscription(db.Model):
+    """Company endpoint that receives new breach matches (see cuba/webhooks.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=False, index=True)
+    url = db.Column(db.String(500), nullable=False)
+    secret = db.Column(db.String(100), nullable=False)  # HMAC-SHA256 key for the X-Cuba-Signature header
+    description = db.Column(db.String(200), nullable=True)
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    # Delivery state: consecutive failures, backoff pause and the delivering worker's lease
+    failure_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    retry_at = db.Column(db.DateTime, nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_attempt_at = db.Column(db.DateTime, nullable=True)
+    last_success_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    company = db.relationship('Company', backref=db.backref('webhook_subscriptions', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f"WebhookSubscription('{self.company_id}', '{self.url}', '{self.is_active}')"
+
+
+class WebhookOutbox(db.Model):
+    """Webhook events waiting for delivery; deleted once delivered (see cuba/webhooks.py)"""
+    __table_args__ = (
+        # A subscription's queue, oldest first
+        db.Index('ix_webhook_outbox_queue', 'subscription_id', 'status', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subscription_id = db.Column(db.Integer, db.ForeignKey('webhook_subscription.id', ondelete='CASCADE'), nullable=False)
+    credential_id = db.Column(db.Integer, nullable=False)  # No FK: a credential deleted before delivery is dropped
+    event = db.Column(db.String(50), nullable=False)  # breach.matched
+    status = db.Column(db.String(10), default='pending', nullable=False)  # pending, dead
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"WebhookOutbox('{self.subscription_id}', '{self.event}', '{self.status}')"
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from datetime import datetime
 from . import db
+from .conditional import conditional_get, notification_key
 from .models import Notification
 from .api_utils import json_error, json_success
 
@@ -10,6 +11,7 @@ notification_bp = Blueprint('notifications', __name__)
 
 @notification_bp.route('/api/notifications')
 @login_required
+@conditional_get(notification_key)
 def get_notifications():
     """Get recent notifications for current user"""
     try:
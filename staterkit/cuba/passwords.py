@@ -0,0 +1,126 @@
+"""
+Password hashing policy.
+
+``PASSWORD_HASH_METHOD`` selects the algorithm and cost in werkzeug's method
+syntax: ``scrypt:<n>:<r>:<p>`` or ``pbkdf2:<hash>:<iterations>``. New
+passwords are hashed with it. A stored hash that uses any other method still
+verifies, and is rehashed with the policy on the user's next successful
+login. Changing the cost therefore needs no password reset.
+
+``flask passwords calibrate`` measures this machine and suggests a method
+that hits a target login latency. ``flask passwords status`` shows how many
+users are still on older methods.
+"""
+import secrets
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'  # werkzeug's default scrypt parameters
+ALGORITHMS = ('scrypt', 'pbkdf2')
+
+
+def normalize_method(method: str) -> str:
+    """Spell out werkzeug's implicit defaults, e.g. ``pbkdf2`` -> ``pbkdf2:sha256:1000000``."""
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        if len(args) not in (0, 3):
+            raise ValueError(f"'scrypt' takes 0 or 3 arguments, got '{method}'")
+        n, r, p = args or ('32768', '8', '1')
+        return f'scrypt:{int(n)}:{int(r)}:{int(p)}'
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f"Unsupported password hash method '{method}' (expected one of {', '.join(ALGORITHMS)})")
+
+
+def current_method() -> str:
+    method = current_app.config.get('PASSWORD_HASH_METHOD') if has_app_context() else None
+    return normalize_method(method or DEFAULT_METHOD)
+
+
+def hash_password(raw_password: str) -> str:
+    return generate_password_hash(raw_password, method=current_method())
+
+
+def verify_password(stored_hash: str, raw_password: str) -> bool:
+    return bool(stored_hash) and check_password_hash(stored_hash, raw_password)
+
+
+def hash_method(stored_hash: str) -> Optional[str]:
+    """The normalized method of a stored hash, or None if it is not a werkzeug hash."""
+    if not stored_hash or '$' not in stored_hash:
+        return None
+    try:
+        return normalize_method(stored_hash.split('$', 1)[0])
+    except ValueError:
+        return None
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    return hash_method(stored_hash) != current_method()
+
+
+def method_counts(stored_hashes) -> Dict[str, int]:
+    """Number of hashes per method (``'unknown'`` for anything unparseable)."""
+    counts: Dict[str, int] = {}
+    for stored_hash in stored_hashes:
+        method = hash_method(stored_hash) or 'unknown'
+        counts[method] = counts.get(method, 0) + 1
+    return counts
+
+
+def time_method(method: str, samples: int = 3) -> float:
+    """Best-of-``samples`` seconds to verify one password with ``method``."""
+    stored = generate_password_hash(secrets.token_urlsafe(12), method=method)
+    best = float('inf')
+    for _ in range(samples):
+        started = time.perf_counter()
+        check_password_hash(stored, 'calibration-probe')
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def calibrate(algorithm: str, target_seconds: float, samples: int = 3) -> Tuple[str, float, List[Tuple[str, float]]]:
+    """
+    Pick the strongest parameters for ``algorithm`` whose verification stays within the target.
+
+    scrypt doubles ``n`` (memory and time grow together); pbkdf2 scales the
+    iteration count linearly from the last measurement, refining a few times.
+
+    Returns:
+        (method, measured seconds, [(method tried, seconds), ...])
+    """
+    tried: List[Tuple[str, float]] = []
+    if algorithm == 'scrypt':
+        chosen = None
+        for log_n in range(12, 21):
+            method = f'scrypt:{2 ** log_n}:8:1'
+            seconds = time_method(method, samples)
+            tried.append((method, seconds))
+            if seconds > target_seconds:
+                break
+            chosen = (method, seconds)
+        # Even the cheapest setting is over target: use it anyway, weaker is not an option
+        chosen = chosen or tried[0]
+        return chosen[0], chosen[1], tried
+
+    if algorithm == 'pbkdf2':
+        iterations = 100_000
+        method = f'pbkdf2:sha256:{iterations}'
+        seconds = time_method(method, samples)
+        tried.append((method, seconds))
+        for _ in range(3):
+            iterations = max(10_000, int(iterations * target_seconds / seconds) // 10_000 * 10_000)
+            method = f'pbkdf2:sha256:{iterations}'
+            seconds = time_method(method, samples)
+            tried.append((method, seconds))
+            if seconds <= target_seconds:
+                break
+        return method, seconds, tried
+
+    raise ValueError(f"Unsupported algorithm '{algorithm}' (expected one of {', '.join(ALGORITHMS)})")
@@ -0,0 +1,201 @@
+"""
+On-demand request profiling.
+
+An admin can profile a single request in production by either
+
+* adding ``?_profile=1`` to the URL while logged in as an admin, or
+* sending an ``X-Profile-Token`` header obtained from the Request Profiles
+  admin page (signed with SECRET_KEY, valid for PROFILE_TOKEN_MAX_AGE
+  seconds). This also works for API clients that authenticate with a JWT.
+
+The request runs under ``cProfile`` and the stats are written to
+``PROFILE_DIR/<request id>.pstats`` with a ``.json`` sidecar describing the
+request. The request id is taken from ``X-Request-ID`` when present and is
+returned in the ``X-Profile-Id`` response header.
+
+The hooks are only registered when PROFILING_ENABLED is set, so ordinary
+requests pay nothing when profiling is off.
+
+Configuration:
+    PROFILING_ENABLED: Register the profiling hooks (default False)
+    PROFILE_DIR: Where profiles are stored (default <instance path>/profiles)
+    PROFILE_TOKEN_MAX_AGE: Lifetime of a profile token in seconds (default 900)
+    PROFILES_KEPT: Number of profiles kept before the oldest are removed (default 200)
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import current_app, g, request
+from flask_login import current_user
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_QUERY_FLAG = '_profile'
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+
+_PROFILE_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def _serializer() -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='cuba-request-profile')
+
+
+def issue_profile_token(user_id: int) -> str:
+    """Return a signed token that enables profiling for requests carrying it."""
+    return _serializer().dumps({'user_id': user_id})
+
+
+def _token_user_id(token: str) -> Optional[int]:
+    try:
+        data = _serializer().loads(token, max_age=current_app.config['PROFILE_TOKEN_MAX_AGE'])
+    except BadSignature:
+        return None
+    return data.get('user_id')
+
+
+def _is_admin() -> bool:
+    return current_user.is_authenticated and (current_user.role == 'admin' or current_user.isAdmin)
+
+
+def _profiling_requested() -> Optional[str]:
+    """Return who asked for profiling ('token:<id>' / 'admin:<id>'), or None."""
+    token = request.headers.get(PROFILE_HEADER)
+    if token:
+        user_id = _token_user_id(token)
+        return f'token:{user_id}' if user_id is not None else None
+    if request.args.get(PROFILE_QUERY_FLAG) and _is_admin():
+        return f'admin:{current_user.id}'
+    return None
+
+
+def profile_dir(app=None) -> str:
+    app = app or current_app
+    return app.config['PROFILE_DIR'] or os.path.join(app.instance_path, 'profiles')
+
+
+def _request_id() -> str:
+    request_id = request.headers.get('X-Request-ID', '')
+    if _PROFILE_ID.match(request_id):
+        return request_id
+    return uuid.uuid4().hex
+
+
+def _start_profile():
+    requested_by = _profiling_requested()
+    if requested_by is None:
+        return
+    g.profile = {
+        'id': _request_id(),
+        'requested_by': requested_by,
+        'started': time.perf_counter(),
+        'profiler': cProfile.Profile(),
+    }
+    g.profile['profiler'].enable()
+
+
+def _finish_profile(response):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    profile['profiler'].disable()
+    duration = time.perf_counter() - profile['started']
+
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = profile['id']
+    profile['profiler'].dump_stats(os.path.join(directory, f'{profile_id}.pstats'))
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w') as f:
+        json.dump({
+            'id': profile_id,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'requested_by': profile['requested_by'],
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        }, f)
+    _prune(directory, current_app.config['PROFILES_KEPT'])
+
+    response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+def _prune(directory: str, keep: int) -> None:
+    metas = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith('.json')),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in metas[keep:]:
+        base = entry.path[:-len('.json')]
+        for path in (entry.path, f'{base}.pstats'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[Dict]:
+    """Stored profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda p: p.get('created_at', ''), reverse=True)
+
+
+def get_profile(profile_id: str) -> Optional[Dict]:
+    """Metadata for one profile, or None if the id is unknown or malformed."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(profile_dir(), f'{profile_id}.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def profile_stats_path(profile_id: str) -> str:
+    return os.path.join(profile_dir(), f'{profile_id}.pstats')
+
+
+def render_profile_stats(profile_id: str, sort: str = 'cumulative', limit: int = 60) -> str:
+    """The pstats report for a profile as text, top ``limit`` functions by ``sort``."""
+    if sort not in SORT_KEYS:
+        sort = 'cumulative'
+    output = io.StringIO()
+    stats = pstats.Stats(profile_stats_path(profile_id), stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def init_profiling(app) -> None:
+    """Register the profiling hooks when PROFILING_ENABLED is set."""
+    app.config.setdefault('PROFILING_ENABLED', False)
+    app.config.setdefault('PROFILE_DIR', None)
+    app.config.setdefault('PROFILE_TOKEN_MAX_AGE', 900)
+    app.config.setdefault('PROFILES_KEPT', 200)
+
+    if not app.config['PROFILING_ENABLED']:
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
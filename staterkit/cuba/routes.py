@@ -4,6 +4,8 @@ from sqlalchemy import func, and_, or_
 from datetime import datetime, date, timedelta
 
 from . import db, cache
+from .conditional import conditional_get, page_key, tenant_data_key
+from .database import day_bucket, dialect_name
 from .models import BreachedCredential, Company
 
 main = Blueprint('main', __name__)
@@ -18,10 +20,16 @@ def get_user_company_domain():
     return None
 
 
+def _dashboard_key():
+    page = page_key()
+    return None if page is None else (tenant_data_key(), page)
+
+
 @main.route('/')
 @main.route('/index')
 @main.route('/dashboard')
 @login_required
+@conditional_get(_dashboard_key)
 def indexPage():
     """Dashboard with leak statistics"""
     user_domain = get_user_company_domain()
@@ -91,11 +99,11 @@ def indexPage():
     # Chart data: Leak trends over last 30 days
     days_ago_30 = date.today() - timedelta(days=30)
     
-    # Get daily leak counts - SQLite compatible approach
+    # Get daily leak counts - day bucket expression depends on the dialect
     daily_leaks_dict = {}
-    # Use strftime for SQLite date extraction
+    created_day = day_bucket(BreachedCredential.created_at, dialect_name(db.session))
     daily_leaks_query = db.session.query(
-        func.strftime('%Y-%m-%d', BreachedCredential.created_at).label('created_date'),
+        created_day.label('created_date'),
         func.count(BreachedCredential.id).label('count')
     ).filter(
         BreachedCredential.created_at >= datetime.combine(days_ago_30, datetime.min.time()),
@@ -103,7 +111,7 @@ def indexPage():
     )
     if user_domain:
         daily_leaks_query = daily_leaks_query.filter(BreachedCredential.domain == user_domain)
-    daily_leaks_query = daily_leaks_query.group_by(func.strftime('%Y-%m-%d', BreachedCredential.created_at)).all()
+    daily_leaks_query = daily_leaks_query.group_by(created_day).all()
     
     # Convert to dictionary for easy lookup (key is string 'YYYY-MM-DD')
     for item in daily_leaks_query:
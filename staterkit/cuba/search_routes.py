@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from sqlalchemy import or_
 from . import db
+from .conditional import conditional_get, tenant_data_key
 from .models import BreachedCredential, Company, User
 
 search_bp = Blueprint('search', __name__)
@@ -9,6 +10,7 @@ search_bp = Blueprint('search', __name__)
 
 @search_bp.route('/api/search')
 @login_required
+@conditional_get(tenant_data_key)
 def search():
     """Global search endpoint for header search"""
     query = request.args.get('q', '').strip()
@@ -1,6 +1,6 @@
 from functools import wraps
 
-from flask import redirect, url_for, flash
+from flask import abort, redirect, url_for, flash
 from flask_login import current_user
 
 
@@ -20,6 +20,18 @@ def admin_required(f):
     return decorated_function
 
 
+def admin_only(f):
+    """Decorator for admin views that answer 403 to other users instead of redirecting."""
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if current_user.role != "admin" and not current_user.isAdmin:
+            abort(403)
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
 def get_user_company_domain():
     """Get company domain for current user, None for admins."""
     if not current_user.is_authenticated:
@@ -7,7 +7,7 @@ from ..models import BreachedCredential
 from ..security import get_user_company_domain, get_user_watchlist_domains
 
 
-def _build_domain_match_query(domains):
+def _build_domain_match_query(domains, model=BreachedCredential):
     """
     Build a query filter that matches breached credentials using watchlist entries.
 
@@ -15,6 +15,9 @@ def _build_domain_match_query(domains):
     - Domain field matches watchlist entry (exact or contains)
     - Username field contains the watchlist domain
     - URL field contains the watchlist domain
+
+    ``model`` is any mapped class with ``domain``, ``username`` and ``url``
+    columns (the change feed filters its copies of them).
     """
     if not domains:
         return None
@@ -28,26 +31,26 @@ def _build_domain_match_query(domains):
             continue
 
         # Match domain field - exact match or contains
-        conditions.append(BreachedCredential.domain.ilike(f"%{domain}%"))
-        conditions.append(func.lower(BreachedCredential.domain) == domain)
+        conditions.append(model.domain.ilike(f"%{domain}%"))
+        conditions.append(func.lower(model.domain) == domain)
 
         # Match username field (handles both email format and username format)
         # For email format: user@test.com, user@e.test.com
-        conditions.append(BreachedCredential.username.ilike(f"%@{domain}"))
-        conditions.append(BreachedCredential.username.ilike(f"%@%.{domain}"))
+        conditions.append(model.username.ilike(f"%@{domain}"))
+        conditions.append(model.username.ilike(f"%@%.{domain}"))
         # For username format: if username equals domain or contains domain
-        conditions.append(func.lower(BreachedCredential.username) == domain)
-        conditions.append(BreachedCredential.username.ilike(f"%{domain}%"))
+        conditions.append(func.lower(model.username) == domain)
+        conditions.append(model.username.ilike(f"%{domain}%"))
 
         # Match URL field - contains domain
-        conditions.append(BreachedCredential.url.ilike(f"%{domain}%"))
+        conditions.append(model.url.ilike(f"%{domain}%"))
 
     if not conditions:
         return None
     return or_(*conditions)
 
 
-def apply_breached_domain_filter(query, user_domain: str):
+def apply_breached_domain_filter(query, user_domain: str, model=BreachedCredential):
     """
     Apply domain/watchlist-based filtering for BreachedCredential queries.
     """
@@ -55,10 +58,10 @@ def apply_breached_domain_filter(query, user_domain: str):
         return query
 
     domains_to_match = get_user_watchlist_domains()
-    domain_filter = _build_domain_match_query(domains_to_match)
+    domain_filter = _build_domain_match_query(domains_to_match, model)
     if domain_filter is not None:
         return query.filter(domain_filter)
-    return query.filter(BreachedCredential.domain == user_domain)
+    return query.filter(model.domain == user_domain)
 
 
 def build_analysis_stats() -> Dict[str, Any]:
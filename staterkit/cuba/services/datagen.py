@@ -0,0 +1,342 @@
+"""
+Synthetic dataset generator for load tests and benchmarks.
+
+Produces companies with watchlists and users, breached credentials with
+skewed (Zipf-like) distributions over domains, types, sources, passwords and
+dates, plus notifications and audit rows. All randomness comes from one
+``random.Random(seed)``, so the same spec on an empty database always
+produces the same rows.
+
+Rows are written in large transactions: on SQLite through the DBAPI
+cursor's ``executemany`` with plain tuples, on other dialects through
+SQLAlchemy Core ``insert()`` with executemany batches.
+"""
+import itertools
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select
+
+from .. import db
+from ..changes import lock_sequence, record_inserts_since
+from ..conditional import bump_data_version
+from ..models import AuditLog, BreachedCredential, Company, Notification, User, WatchlistEntry
+from .identity_lookup import record_credentials_since
+from .password_index import index_new_credentials, max_credential_id
+
+
+SEED_COMPANIES = [
+    ('TechCorp Bank', 'techcorp.com', 'bank'),
+    ('Global Telecom', 'globaltel.com', 'operator'),
+    ('National Security Agency', 'nsa.gov', 'government'),
+    ('Mega Retail Inc', 'megaretail.com', 'other'),
+]
+COMPANY_TYPES = ['bank', 'operator', 'government', 'other']
+
+# Ordered most to least common; the Zipf weights follow this order
+LEAK_TYPES = ['combolist', 'stealer', 'breach', 'malware', 'phishing', 'pastebin', 'darkweb']
+SOURCES = [
+    'Stealer Log', 'Telegram Channel', 'Data Breach Forum', 'Dark Web Marketplace',
+    'Pastebin', 'Threat Intelligence Feed', 'Malware Analysis', 'Security Researcher',
+]
+FREEMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'mail.ru', 'yandex.ru', 'icloud.com']
+COMMON_PASSWORDS = [
+    '123456', 'password', '123456789', 'qwerty', '12345678', '111111', 'abc123', 'password1',
+    'iloveyou', 'admin', 'welcome', 'monkey', 'dragon', 'letmein', 'football', 'sunshine',
+]
+FIRST_NAMES = ['john', 'jane', 'mike', 'sarah', 'david', 'emily', 'chris', 'lisa', 'robert', 'amanda',
+               'james', 'jennifer', 'william', 'michelle', 'richard', 'karen', 'joseph', 'nancy',
+               'thomas', 'betty', 'charles', 'helen', 'daniel', 'sandra', 'matthew', 'donna']
+LAST_NAMES = ['smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis', 'rodriguez',
+              'martinez', 'hernandez', 'lopez', 'wilson', 'anderson', 'thomas', 'taylor', 'moore',
+              'jackson', 'martin', 'lee', 'thompson', 'white', 'harris', 'sanchez', 'clark']
+INDEXES = ['breaches-2024', 'leaks-2024', 'credentials-2024', 'stealer-2025']
+LEAK_HOSTS = ['pastebin.com', 'github.com', 't.me', 'example.com']
+AUDIT_ACTIONS = [('view', 'breached_credential'), ('export', 'breached_credential'), ('login', 'user'),
+                 ('update', 'breached_credential'), ('create', 'watchlist'), ('update', 'company')]
+
+CREDENTIAL_COLUMNS = [
+    '_id', '_ignored', '_index', '_score', 'domain', 'password', 'source', 'type', 'url',
+    'username', 'is_marked', 'company_id', 'created_by', 'created_at', 'updated_at',
+]
+
+
+@dataclass
+class DatasetSpec:
+    """Size and shape of a generated dataset. The defaults match the old 4 x 20 demo."""
+    companies: int = 4
+    users_per_company: int = 2
+    watchlist_per_company: int = 2
+    credentials: int = 80
+    notifications_per_user: int = 10
+    audit_rows: int = 200
+    days: int = 365  # Spread of created_at, skewed towards recent days
+    freemail_share: float = 0.2  # Credentials on consumer mail domains instead of a company domain
+    skew: float = 1.1  # Zipf exponent; higher means a few companies hold most credentials
+    seed: int = 42
+    batch_size: int = 10000  # Rows per executemany call
+    commit_every: int = 500000  # Rows per transaction
+    anchor: Optional[datetime] = None  # "Now" for generated dates; fix it for byte-identical datasets
+
+
+def zipf_cum_weights(n: int, skew: float) -> List[float]:
+    """Cumulative weights for ``random.choices`` with P(rank k) ~ 1 / k**skew."""
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def _sampler(rng: random.Random, population: Sequence, skew: float) -> Callable[[int], list]:
+    cum_weights = zipf_cum_weights(len(population), skew)
+    return lambda k: rng.choices(population, cum_weights=cum_weights, k=k)
+
+
+def _sqlite_value(value):
+    # Same text format SQLAlchemy's SQLite DateTime type writes, so comparisons stay consistent
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+    return value
+
+
+class _Writer:
+    """Batched writer: raw executemany on SQLite, Core insert elsewhere; commits every N rows."""
+
+    def __init__(self, connection, batch_size: int, commit_every: int):
+        self.connection = connection
+        self.sqlite = connection.dialect.name == 'sqlite'
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self._since_commit = 0
+
+    def write(self, table, columns: List[str], rows: Iterator[tuple], commit: bool = True) -> int:
+        """Insert ``rows``; with ``commit=False`` the caller commits (no intermediate commits)."""
+        written = 0
+        if self.sqlite:
+            column_list = ', '.join(f'"{c}"' for c in columns)
+            placeholders = ', '.join('?' for _ in columns)
+            sql = f'INSERT INTO "{table.name}" ({column_list}) VALUES ({placeholders})'
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                break
+            if self.sqlite:
+                # Make SQLAlchemy own the transaction so connection.commit() reaches sqlite3
+                if not self.connection.in_transaction():
+                    self.connection.begin()
+                batch = [tuple(_sqlite_value(v) for v in row) for row in batch]
+                cursor = self.connection.connection.dbapi_connection.cursor()
+                try:
+                    cursor.executemany(sql, batch)
+                finally:
+                    cursor.close()
+            else:
+                self.connection.execute(insert(table), [dict(zip(columns, row)) for row in batch])
+            written += len(batch)
+            self._since_commit += len(batch)
+            if commit and self._since_commit >= self.commit_every:
+                self.connection.commit()
+                self._since_commit = 0
+        return written
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self._since_commit = 0
+
+
+def _company_rows(spec: DatasetSpec, now: datetime):
+    for i in range(spec.companies):
+        if i < len(SEED_COMPANIES):
+            name, domain, company_type = SEED_COMPANIES[i]
+        else:
+            name, domain = f'Synthetic Company {i:05d}', f'corp{i:05d}.example'
+            company_type = COMPANY_TYPES[i % len(COMPANY_TYPES)]
+        yield (name, domain, company_type, f'Demo company: {name}', now, now)
+
+
+def _ensure_companies(connection, writer: _Writer, spec: DatasetSpec,
+                      now: datetime) -> Tuple[List[Tuple[int, str]], int]:
+    """Insert missing companies; return (id, domain) for the spec's companies in rank order, and rows written."""
+    wanted = list(_company_rows(spec, now))
+    existing = {domain for (domain,) in connection.execute(select(Company.domain))}
+    written = writer.write(Company.__table__, ['name', 'domain', 'company_type', 'description', 'created_at', 'updated_at'],
+                 (row for row in wanted if row[1] not in existing))
+    ids = dict((domain, company_id) for company_id, domain in
+               connection.execute(select(Company.id, Company.domain)))
+    return [(ids[row[1]], row[1]) for row in wanted], written
+
+
+def _ensure_admin(connection, password_hash: str, now: datetime) -> int:
+    admin_id = connection.execute(
+        select(User.id).where(User.role == 'admin').order_by(User.id).limit(1)
+    ).scalar()
+    if admin_id is None:
+        admin_id = connection.execute(insert(User.__table__).values(
+            username='admin', email='admin@dseclab.com', password=password_hash, role='admin',
+            isAdmin=True, is_active=True, created_at=now, updated_at=now,
+        )).inserted_primary_key[0]
+    return admin_id
+
+
+def generate_dataset(spec: DatasetSpec, password: str = 'admin123',
+                     progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """
+    Write a synthetic dataset into the current database.
+
+    Companies and users are created only if missing; credentials, notifications
+    and audit rows are appended. Generated users share one password hash
+    (``password``) so hashing cost does not dominate large runs.
+
+    Returns:
+        Rows written per table
+    """
+    rng = random.Random(spec.seed)
+    now = spec.anchor or datetime.utcnow().replace(microsecond=0)
+    probe = User()
+    probe.set_password(password)
+    password_hash = probe.password
+    report = progress or (lambda table, rows: None)
+    counts: Dict[str, int] = {}
+
+    with db.engine.connect() as connection:
+        writer = _Writer(connection, spec.batch_size, spec.commit_every)
+        admin_id = _ensure_admin(connection, password_hash, now)
+        companies, counts['company'] = _ensure_companies(connection, writer, spec, now)
+
+        # Watchlists: the company domain plus a few subdomains / portals
+        existing = {(company_id, value) for company_id, value in
+                    connection.execute(select(WatchlistEntry.company_id, WatchlistEntry.entry_value))}
+        watchlist_rows = []
+        for company_id, domain in companies:
+            values = [domain] + [f'{prefix}.{domain}' for prefix in ('mail', 'vpn', 'portal', 'sso', 'crm')]
+            for value in values[:spec.watchlist_per_company]:
+                if (company_id, value) not in existing:
+                    watchlist_rows.append((company_id, 'domain', value, None, now, now))
+        counts['watchlist_entry'] = writer.write(
+            WatchlistEntry.__table__,
+            ['company_id', 'entry_type', 'entry_value', 'description', 'created_at', 'updated_at'],
+            iter(watchlist_rows))
+
+        # Users: members per company, shared password hash
+        existing_emails = {email for (email,) in connection.execute(select(User.email))}
+        user_rows = []
+        for company_id, domain in companies:
+            for n in range(spec.users_per_company):
+                email = f'analyst{n}@{domain}'
+                if email not in existing_emails:
+                    user_rows.append((f'analyst{n}.{company_id}', email, password_hash, 'member', False,
+                                      company_id, True, now, now))
+        counts['user'] = writer.write(
+            User.__table__,
+            ['username', 'email', 'password', 'role', 'isAdmin', 'company_id', 'is_active', 'created_at', 'updated_at'],
+            iter(user_rows))
+        writer.commit()
+        report('company/watchlist/user', counts['company'] + counts['watchlist_entry'] + counts['user'])
+
+        # One transaction per commit_every credentials, each with its password index,
+        # change log and Bloom filter rows: a commit releases the sequence lock and
+        # publishes the credentials, so the derived tables must already cover them
+        credential_rows = _credential_rows(rng, spec, companies, admin_id, now)
+        counts['breached_credential'] = 0
+        while True:
+            lock_sequence(connection)
+            first_new_id = max_credential_id(connection)
+            written = writer.write(BreachedCredential.__table__, CREDENTIAL_COLUMNS,
+                                   itertools.islice(credential_rows, spec.commit_every), commit=False)
+            if not written:
+                break
+            counts['breached_credential'] += written
+            index_new_credentials(connection, first_new_id)
+            record_inserts_since(connection, first_new_id)
+            record_credentials_since(connection, first_new_id)
+            bump_data_version(connection=connection)
+            writer.commit()
+        writer.commit()
+        report('breached_credential', counts['breached_credential'])
+
+        user_ids = [user_id for (user_id,) in connection.execute(select(User.id).order_by(User.id))]
+        counts['notification'] = writer.write(
+            Notification.__table__,
+            ['user_id', 'notification_type', 'title', 'message', 'link', 'is_read', 'read_at', 'created_at'],
+            _notification_rows(rng, spec, user_ids, now))
+        writer.commit()
+        report('notification', counts['notification'])
+
+        counts['audit_log'] = writer.write(
+            AuditLog.__table__,
+            ['user_id', 'action_type', 'resource_type', 'resource_id', 'description', 'ip_address',
+             'user_agent', 'status', 'created_at'],
+            _audit_rows(rng, spec, user_ids, now))
+        writer.commit()
+        report('audit_log', counts['audit_log'])
+
+    return counts
+
+
+def _recent_skewed(rng: random.Random, days: int, now: datetime) -> datetime:
+    # Squaring a uniform draw puts more rows in recent days, like a live feed
+    return now - timedelta(seconds=int((rng.random() ** 2) * days * 86400))
+
+
+def _credential_rows(rng: random.Random, spec: DatasetSpec, companies: List[Tuple[int, str]],
+                     admin_id: int, now: datetime) -> Iterator[tuple]:
+    pick_company = _sampler(rng, companies, spec.skew)
+    pick_freemail = _sampler(rng, FREEMAIL_DOMAINS, 1.0)
+    pick_type = _sampler(rng, LEAK_TYPES, 1.0)
+    pick_source = _sampler(rng, SOURCES, 0.8)
+    pick_password = _sampler(rng, COMMON_PASSWORDS, 1.2)
+    block = 1000
+
+    for start in range(0, spec.credentials, block):
+        k = min(block, spec.credentials - start)
+        for offset, (company, freemail, leak_type, source, common_password) in enumerate(zip(
+                pick_company(k), pick_freemail(k), pick_type(k), pick_source(k), pick_password(k))):
+            i = start + offset
+            company_id, domain = company
+            if rng.random() < spec.freemail_share:
+                company_id, domain = None, freemail
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            username = f'{first}.{last}{rng.randint(1, 9999)}@{domain}'
+
+            roll = rng.random()
+            if roll < 0.4:
+                password = common_password
+            elif roll < 0.7:
+                password = f'{first.capitalize()}{rng.randint(1, 9999)}!'
+            else:
+                password = None
+            url = f'https://{rng.choice(LEAK_HOSTS)}/leak/{rng.randint(1000, 999999)}' if rng.random() < 0.4 else None
+            created_at = _recent_skewed(rng, spec.days, now)
+            score = round(rng.uniform(0.5, 10.0), 2) if rng.random() < 0.7 else None
+
+            yield (
+                f'synthetic-{spec.seed}-{i}', rng.random() < 0.1, rng.choice(INDEXES), score, domain,
+                password, source, leak_type, url, username, rng.random() < 0.05, company_id, admin_id,
+                created_at, created_at,
+            )
+
+
+def _notification_rows(rng: random.Random, spec: DatasetSpec, user_ids: List[int], now: datetime) -> Iterator[tuple]:
+    for user_id in user_ids:
+        for _ in range(spec.notifications_per_user):
+            created_at = _recent_skewed(rng, spec.days, now)
+            is_read = rng.random() < 0.8
+            yield (
+                user_id, 'warning', 'New Breach Detected', f'Credential #{rng.randint(1, max(spec.credentials, 1))}',
+                '/threat-intelligence/breached-creds', is_read,
+                created_at + timedelta(hours=rng.randint(1, 72)) if is_read else None, created_at,
+            )
+
+
+def _audit_rows(rng: random.Random, spec: DatasetSpec, user_ids: List[int], now: datetime) -> Iterator[tuple]:
+    pick_user = _sampler(rng, user_ids or [None], 1.0)
+    pick_action = _sampler(rng, AUDIT_ACTIONS, 1.0)
+    block = 1000
+    for start in range(0, spec.audit_rows, block):
+        k = min(block, spec.audit_rows - start)
+        for user_id, (action_type, resource_type) in zip(pick_user(k), pick_action(k)):
+            yield (
+                user_id, action_type, resource_type, rng.randint(1, max(spec.credentials, 1)),
+                f'{action_type.capitalize()} {resource_type}', f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                'Mozilla/5.0 (synthetic)', 'success', _recent_skewed(rng, spec.days, now),
+            )
+
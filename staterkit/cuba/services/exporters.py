@@ -0,0 +1,179 @@
+"""
+Export formats for breached credentials.
+
+openpyxl and reportlab are only needed when someone exports, and importing
+them takes longer than loading the rest of the application, so each backend
+is imported on first use. ``available_formats`` only checks whether the
+packages are installed.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import FrozenSet, List, Sequence, Tuple
+
+
+EXPORT_HEADERS = ['ID', '_id', '_index', '_score', '_ignored', 'Username', 'Domain', 'Password',
+                  'Source', 'Type', 'URL', 'Marked', 'Created By', 'Created At']
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+PDF_MAX_ROWS = 100
+
+
+@lru_cache(maxsize=None)
+def available_formats() -> FrozenSet[str]:
+    """Formats that can be served; xlsx and pdf need their optional packages installed."""
+    formats = {'csv', 'json'}
+    if find_spec('openpyxl') is not None:
+        formats.add('xlsx')
+    if find_spec('reportlab') is not None:
+        formats.add('pdf')
+    return frozenset(formats)
+
+
+def _table_row(cred) -> List:
+    """One row of the CSV/Excel export (same columns as EXPORT_HEADERS)."""
+    return [
+        cred.id,
+        cred._id or '',
+        cred._index or '',
+        cred._score if cred._score is not None else '',
+        'Yes' if cred._ignored else 'No',
+        cred.username or '',
+        cred.domain or '',
+        cred.password or '',
+        cred.source or '',
+        cred.type or '',
+        cred.url or '',
+        'Yes' if cred.is_marked else 'No',
+        cred.creator.username if cred.creator else '',
+        cred.created_at.strftime('%Y-%m-%d %H:%M:%S') if cred.created_at else '',
+    ]
+
+
+def export_json(creds: Sequence) -> str:
+    data = []
+    for cred in creds:
+        data.append({
+            'id': cred.id,
+            '_id': cred._id,
+            '_index': cred._index,
+            '_score': cred._score,
+            '_ignored': cred._ignored,
+            'username': cred.username,
+            'domain': cred.domain,
+            'password': cred.password,
+            'source': cred.source,
+            'type': cred.type,
+            'url': cred.url,
+            'is_marked': cred.is_marked,
+            'created_by': cred.creator.username if cred.creator else None,
+            'created_at': cred.created_at.isoformat() if cred.created_at else None
+        })
+    return json.dumps(data, indent=2)
+
+
+def export_csv(creds: Sequence) -> str:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(EXPORT_HEADERS)
+    for cred in creds:
+        writer.writerow(_table_row(cred))
+    return output.getvalue()
+
+
+def export_xlsx(creds: Sequence) -> bytes:
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Breached Credentials"
+    ws.append(EXPORT_HEADERS)
+
+    # Style header row
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+
+    for cred in creds:
+        ws.append(_table_row(cred))
+
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def export_pdf(creds: Sequence) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = [
+        Paragraph("Breached Credentials Report", styles['Title']),
+        Spacer(1, 12),
+        Paragraph(f"Total Records: {len(creds)}<br/>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                  styles['Normal']),
+        Spacer(1, 12),
+    ]
+
+    data = [['ID', 'Username', 'Domain', 'Type', 'Source', 'Created']]
+    for cred in creds[:PDF_MAX_ROWS]:
+        data.append([
+            str(cred.id),
+            (cred.username or '')[:30],  # Truncate long values
+            (cred.domain or '')[:30],
+            cred.type or '',
+            (cred.source or '')[:30],
+            cred.created_at.strftime('%Y-%m-%d') if cred.created_at else ''
+        ])
+
+    table = Table(data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ]))
+    elements.append(table)
+    doc.build(elements)
+    return output.getvalue()
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'json': export_json,
+    'xlsx': export_xlsx,
+    'pdf': export_pdf,
+}
+
+
+def render_export(creds: Sequence, export_format: str) -> Tuple[str, object, str]:
+    """
+    Render credentials in the requested format.
+
+    Unknown formats and formats whose package is not installed fall back to CSV.
+
+    Returns:
+        (served format, body, mimetype)
+    """
+    if export_format not in available_formats():
+        export_format = 'csv'
+    return export_format, EXPORTERS[export_format](creds), MIMETYPES[export_format]
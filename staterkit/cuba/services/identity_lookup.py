@@ -0,0 +1,187 @@
+"""
+Batch identity lookup: which of many emails/usernames appear in the corpus.
+
+The normalized identities are written to a temporary table and joined on the
+``lower(username)`` index, so a 20k-address directory costs one indexed join
+instead of one scan per address. The caller's tenant filter is applied to
+the joined rows, and per-identity summaries are assembled from one grouped
+result set.
+
+Identities are first checked against the Bloom filter (``cuba/bloom.py``).
+Those it has never seen are answered without touching the database.
+"""
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import column, func, insert, select, table, text
+
+from .. import db
+from ..bloom import DEFAULT_FP_RATE, MIN_CAPACITY, BloomFilter, add_identities, get_identity_filter
+from ..changes import CHANGE_SEQUENCE, lock_sequence
+from ..models import BreachedCredential, ChangeLog, DataVersion
+from .breached_creds_service import apply_breached_domain_filter
+
+TEMP_TABLE = 'identity_lookup'
+lookup_table = table(TEMP_TABLE, column('identity'))
+INSERT_CHUNK = 5000
+
+
+def normalize_identity(value: Any) -> Optional[str]:
+    """The form usernames are matched in: stripped and lower-cased (None for blanks and non-strings)."""
+    if not isinstance(value, str):
+        return None
+    return value.strip().lower() or None
+
+
+def normalize_identities(values: Iterable[Any]) -> List[str]:
+    """Normalized, de-duplicated identities (order kept), skipping blanks and non-strings."""
+    seen = {}
+    for value in values:
+        identity = normalize_identity(value)
+        if identity:
+            seen.setdefault(identity, None)
+    return list(seen)
+
+
+def record_identities(usernames: Iterable[Any]) -> int:
+    """Add new credentials' usernames to the Bloom filter; call before committing them."""
+    return add_identities(identity for identity in map(normalize_identity, usernames) if identity)
+
+
+def possibly_breached(identities: List[str]) -> List[str]:
+    """The identities the Bloom filter cannot rule out (all of them without a filter)."""
+    identity_filter = get_identity_filter()
+    if identity_filter is None:
+        return identities
+    return [identity for identity in identities if identity_filter.might_contain(identity)]
+
+
+def _summaries(rows) -> Dict[str, Dict[str, Any]]:
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for identity, source, cred_type, hits, first_seen, last_seen in rows:
+        summary = summaries.setdefault(identity, {
+            'identity': identity, 'hits': 0, 'first_seen': None, 'last_seen': None,
+            'sources': {}, 'types': {},
+        })
+        summary['hits'] += hits
+        if first_seen and (summary['first_seen'] is None or first_seen < summary['first_seen']):
+            summary['first_seen'] = first_seen
+        if last_seen and (summary['last_seen'] is None or last_seen > summary['last_seen']):
+            summary['last_seen'] = last_seen
+        summary['sources'][source or 'unknown'] = summary['sources'].get(source or 'unknown', 0) + hits
+        summary['types'][cred_type or 'unknown'] = summary['types'].get(cred_type or 'unknown', 0) + hits
+    return summaries
+
+
+def lookup_identities(identities: List[str], user_domain) -> List[Dict[str, Any]]:
+    """
+    Hit summaries for the (normalized) identities that match at least one credential.
+
+    Args:
+        identities: Output of ``normalize_identities``
+        user_domain: The caller's company domain (None for admins); results are
+            restricted to the tenant's credentials like every other view
+
+    Returns:
+        [{'identity', 'hits', 'first_seen', 'last_seen', 'sources': {..}, 'types': {..}}, ...]
+        in the order the identities were given
+    """
+    candidates = possibly_breached(identities)
+    if not candidates:
+        return []
+
+    session = db.session
+    session.execute(text(f'CREATE TEMPORARY TABLE IF NOT EXISTS {TEMP_TABLE} (identity VARCHAR(500) PRIMARY KEY)'))
+    for start in range(0, len(candidates), INSERT_CHUNK):
+        session.execute(insert(lookup_table),
+                        [{'identity': value} for value in candidates[start:start + INSERT_CHUNK]])
+    # Autovacuum never sees temporary tables; give the planner the real row count
+    session.execute(text(f'ANALYZE {TEMP_TABLE}'))
+
+    identity = lookup_table.c.identity
+    stmt = (
+        select(identity, BreachedCredential.source, BreachedCredential.type,
+               func.count(BreachedCredential.id),
+               func.min(BreachedCredential.created_at), func.max(BreachedCredential.created_at))
+        .select_from(lookup_table.join(BreachedCredential.__table__,
+                                       func.lower(BreachedCredential.username) == identity))
+        .group_by(identity, BreachedCredential.source, BreachedCredential.type)
+    )
+    stmt = apply_breached_domain_filter(stmt, user_domain)
+    summaries = _summaries(session.execute(stmt).all())
+    # On error the transaction is rolled back, which also discards the table
+    session.execute(text(f'DROP TABLE {TEMP_TABLE}'))
+    return [summaries[value] for value in identities if value in summaries]
+
+
+def _usernames(connection, lower: int, upper: Optional[int] = None):
+    stmt = select(BreachedCredential.username).where(BreachedCredential.id > lower,
+                                                     BreachedCredential.username.isnot(None))
+    if upper is not None:
+        stmt = stmt.where(BreachedCredential.id <= upper)
+    return [identity for (username,) in connection.execute(stmt)
+            if (identity := normalize_identity(username))]
+
+
+def _changed_usernames(connection, after_seq: int):
+    """Usernames copied to the change log after ``after_seq`` (edits, as well as inserts)."""
+    stmt = select(ChangeLog.username).where(ChangeLog.seq > after_seq, ChangeLog.op != 'delete',
+                                            ChangeLog.username.isnot(None)).distinct()
+    return [identity for (username,) in connection.execute(stmt)
+            if (identity := normalize_identity(username))]
+
+
+def record_credentials_since(connection, after_id: int) -> int:
+    """Add the usernames of credentials with ``id > after_id`` to the Bloom filter (bulk loaders)."""
+    return add_identities(_usernames(connection, after_id))
+
+
+def build_identity_filter(connection, path: str, capacity: Optional[int] = None,
+                          fp_rate: float = DEFAULT_FP_RATE, chunk_size: int = 50_000,
+                          progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Rebuild the Bloom filter file from every username in the database.
+
+    The new filter is written next to ``path`` and renamed over it, so
+    running workers switch to it atomically. Credentials inserted while the
+    scan runs (id above the starting maximum) and usernames logged to the
+    change feed since it started (edits of rows already scanned) are added
+    afterwards. The connection's transaction is committed.
+
+    Args:
+        capacity: Items the filter is sized for (default: twice the current
+            row count, so incremental ingest has room before it degrades)
+        progress: Optional callback ``(last_key, max_key)`` after each chunk
+
+    Returns:
+        {'items', 'bits', 'hashes', 'seconds'}
+    """
+    started = time.perf_counter()
+    start_seq = connection.execute(
+        select(DataVersion.version).where(DataVersion.scope == CHANGE_SEQUENCE)).scalar() or 0
+    max_id = connection.execute(select(func.max(BreachedCredential.id))).scalar() or 0
+    rows = connection.execute(select(func.count(BreachedCredential.id))).scalar() or 0
+    capacity = capacity or max(2 * rows, MIN_CAPACITY)
+
+    temp_path = f'{path}.tmp'
+    bloom = BloomFilter.create(temp_path, capacity, fp_rate)
+    try:
+        for lower in range(0, max_id, chunk_size):
+            bloom.add_many(_usernames(connection, lower, min(lower + chunk_size, max_id)))
+            if progress:
+                progress(min(lower + chunk_size, max_id), max_id)
+        os.replace(temp_path, path)
+        # Writers add usernames to the file they opened before committing, under the
+        # sequence lock. Taking it waits for those that may still have used the old
+        # file, so their rows are visible to the catch-up below.
+        lock_sequence(connection)
+        bloom.add_many(_usernames(connection, max_id))
+        bloom.add_many(_changed_usernames(connection, start_seq))
+        connection.commit()
+        return {'items': bloom.count, 'bits': bloom.bits, 'hashes': bloom.hashes,
+                'seconds': time.perf_counter() - started}
+    finally:
+        bloom.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,229 @@
+"""
+Bulk ingest of breached credentials.
+
+Rows are written through SQLAlchemy Core instead of the ORM. On PostgreSQL
+the rows are streamed with ``COPY ... FROM STDIN``; other dialects use
+chunked ``executemany`` inserts inside a single transaction. The password
+hash-prefix index, the change feed and the webhook outbox are updated for
+the new rows in the same transaction, and their usernames are added to the
+identity Bloom filter before the commit. Tenant matches are handed to the
+SIEM forwarder after it.
+
+``flask ingest`` streams the file and calls ``bulk_insert_credentials`` per
+batch, so a file of any size is never held in memory and each batch is its
+own transaction.
+"""
+import csv
+import io
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert
+
+from .. import db
+from ..changes import lock_sequence, record_inserts_since
+from ..conditional import bump_data_version
+from ..forwarder import forward_credential_range
+from ..metrics import record_ingest
+from ..models import BreachedCredential, Company
+from ..webhooks import enqueue_credentials_since, wake_dispatcher
+from .identity_lookup import record_identities
+from .password_index import index_new_credentials, max_credential_id
+
+
+INGEST_COLUMNS = [
+    '_id', '_ignored', '_index', '_score', 'domain', 'password', 'source',
+    'type', 'url', 'username', 'is_marked', 'company_id', 'created_by',
+    'created_at', 'updated_at',
+]
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_BATCH_SIZE = 50_000  # Records per transaction when streaming a file
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """Naive UTC datetime from a datetime or ISO 8601 string; None when blank or unparseable."""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = _clean(value)
+        if not text:
+            return None
+        if text[-1] in 'Zz':
+            text = text[:-1] + '+00:00'
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def normalize_record(record: Dict[str, Any], created_by: int, company_ids: Dict[str, int],
+                     now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Normalize a raw record (dict from JSON/CSV) into a breached_credential row.
+
+    The domain is taken from the record, or extracted from the username when
+    the username is an email address. Records are linked to an existing company
+    by exact domain match. ``created_at`` is parsed as ISO 8601 (converted to
+    UTC); a missing or unparseable value falls back to ``now``.
+    """
+    now = now or datetime.utcnow()
+    username = _clean(record.get('username'))
+    domain = _clean(record.get('domain'))
+    if not domain and username and '@' in username:
+        domain = username.split('@')[1].lower().strip() or None
+    if domain:
+        domain = domain.lower()
+
+    score = record.get('_score')
+    try:
+        score = float(score) if score not in (None, '') else None
+    except (TypeError, ValueError):
+        score = None
+
+    ignored = record.get('_ignored')
+    if isinstance(ignored, str):
+        ignored = ignored.strip().lower() in ('1', 'true', 'yes')
+
+    return {
+        '_id': _clean(record.get('_id')),
+        '_ignored': bool(ignored),
+        '_index': _clean(record.get('_index')),
+        '_score': score,
+        'domain': domain,
+        'password': _clean(record.get('password')),
+        'source': _clean(record.get('source')),
+        'type': (_clean(record.get('type')) or '').lower() or None,
+        'url': _clean(record.get('url')),
+        'username': username,
+        'is_marked': False,
+        'company_id': company_ids.get(domain) if domain else None,
+        'created_by': created_by,
+        'created_at': _parse_datetime(record.get('created_at')) or now,
+        'updated_at': now,
+    }
+
+
+def _company_id_map() -> Dict[str, int]:
+    """Map of company domain -> company id, loaded once per ingest."""
+    return {domain.lower(): company_id for company_id, domain in
+            db.session.query(Company.id, Company.domain).all() if domain}
+
+
+def _copy_rows_postgres(rows: List[Dict[str, Any]]) -> None:
+    """Stream rows into breached_credential with COPY (psycopg2 or psycopg 3)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([r'\N' if row[col] is None else row[col] for col in INGEST_COLUMNS])
+    buffer.seek(0)
+
+    column_list = ', '.join(f'"{col}"' for col in INGEST_COLUMNS)
+    copy_sql = f"COPY breached_credential ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+
+    dbapi_connection = db.session.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2
+            cursor.copy_expert(copy_sql, buffer)
+        else:
+            # psycopg 3
+            with cursor.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+def bulk_insert_credentials(records: Iterable[Dict[str, Any]], created_by: int,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Insert many breached credentials in one transaction.
+
+    Args:
+        records: Iterable of raw record dicts (same keys as the add form)
+        created_by: User id recorded as the creator
+        chunk_size: Rows per executemany batch (ignored for COPY)
+
+    Returns:
+        Number of rows inserted
+    """
+    started = time.perf_counter()
+    company_ids = _company_id_map()
+    now = datetime.utcnow()
+    rows = [normalize_record(record, created_by, company_ids, now) for record in records]
+    if not rows:
+        return 0
+
+    try:
+        lock_sequence()
+        first_new_id = max_credential_id(db.session)
+        if db.session.get_bind().dialect.name == 'postgresql':
+            _copy_rows_postgres(rows)
+        else:
+            table = BreachedCredential.__table__
+            for start in range(0, len(rows), chunk_size):
+                db.session.execute(insert(table), rows[start:start + chunk_size])
+        index_new_credentials(db.session, first_new_id)
+        record_inserts_since(db.session, first_new_id)
+        queued_webhooks = enqueue_credentials_since(db.session, first_new_id)
+        record_identities(row['username'] for row in rows)
+        last_new_id = max_credential_id(db.session)
+        bump_data_version()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    forward_credential_range(first_new_id, last_new_id)
+    if queued_webhooks:
+        wake_dispatcher()
+
+    record_ingest('bulk', len(rows), time.perf_counter() - started)
+    return len(rows)
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a .jsonl or .csv file, one at a time.
+
+    A .json file (a list of objects, or one object) has to be parsed whole;
+    use .jsonl for large loads.
+    """
+    import json
+
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+        return
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    yield from (data if isinstance(data, list) else [data])
+
+
+def iter_batches(records: Iterable[Dict[str, Any]], size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Group a record stream into lists of at most ``size`` records."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,147 @@
+"""
+k-anonymity hash-prefix index of breached passwords.
+
+Every stored password is also kept as its SHA-1 and NTLM hash in the
+``password_hash`` table, split into a 5-character prefix and the remaining
+suffix. ``GET /api/v1/range/<prefix>`` returns every suffix (with counts)
+that shares a prefix, so a client can check a password by sending only
+five hex characters of its hash. This is the same protocol as Have I Been
+Pwned's range API.
+
+The ``(kind, prefix, suffix)`` index is a sorted B-tree. A range request is
+one index seek plus a short scan, and never touches the credential rows.
+
+Rows are written when credentials are ingested, added or edited, and
+removed with them. Existing data is indexed by the ``password_hash``
+backfill.
+"""
+import hashlib
+import struct
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+
+from ..conditional import bump_data_version
+from ..models import BreachedCredential, PasswordHash
+
+PREFIX_LENGTH = 5
+HASH_KINDS = ('sha1', 'ntlm')
+PASSWORD_HASHES = 'password_hash'  # data_version scope behind the range ETags
+INDEX_CHUNK = 5000
+
+
+def _md4(data: bytes) -> bytes:
+    """MD4 (RFC 1320); OpenSSL 3 no longer ships it, so hashlib often cannot."""
+    def rotl(x, n):
+        return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+    message = data + b'\x80' + b'\x00' * ((55 - len(data)) % 64) + struct.pack('<Q', len(data) * 8)
+    a, b, c, d = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476
+    for offset in range(0, len(message), 64):
+        x = struct.unpack('<16I', message[offset:offset + 64])
+        aa, bb, cc, dd = a, b, c, d
+        for i in range(16):
+            k, s = i, (3, 7, 11, 19)[i % 4]
+            a = rotl((a + ((b & c) | (~b & d)) + x[k]) & 0xFFFFFFFF, s)
+            a, b, c, d = d, a, b, c
+        for i in range(16):
+            k, s = (i % 4) * 4 + i // 4, (3, 5, 9, 13)[i % 4]
+            a = rotl((a + ((b & c) | (b & d) | (c & d)) + x[k] + 0x5A827999) & 0xFFFFFFFF, s)
+            a, b, c, d = d, a, b, c
+        for i in range(16):
+            k, s = (0, 8, 4, 12, 2, 10, 6, 14, 1, 9, 5, 13, 3, 11, 7, 15)[i], (3, 9, 11, 15)[i % 4]
+            a = rotl((a + (b ^ c ^ d) + x[k] + 0x6ED9EBA1) & 0xFFFFFFFF, s)
+            a, b, c, d = d, a, b, c
+        a, b, c, d = [(v + w) & 0xFFFFFFFF for v, w in zip((a, b, c, d), (aa, bb, cc, dd))]
+    return struct.pack('<4I', a, b, c, d)
+
+
+def ntlm_hash(password: str) -> str:
+    data = password.encode('utf-16-le')
+    try:
+        digest = hashlib.new('md4', data).digest()
+    except ValueError:
+        digest = _md4(data)
+    return digest.hex().upper()
+
+
+def sha1_hash(password: str) -> str:
+    return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+
+@lru_cache(maxsize=65536)
+def password_hashes(password: str) -> Dict[str, str]:
+    """Upper-case hex digests per kind. Breach corpora repeat passwords heavily, hence the cache."""
+    return {'sha1': sha1_hash(password), 'ntlm': ntlm_hash(password)}
+
+
+def _rows(credential_id: int, password: Optional[str]) -> List[Dict]:
+    if not password:
+        return []
+    return [{'credential_id': credential_id, 'kind': kind,
+             'prefix': digest[:PREFIX_LENGTH], 'suffix': digest[PREFIX_LENGTH:]}
+            for kind, digest in password_hashes(password).items()]
+
+
+def index_credentials(connection, lower: int, upper: int) -> int:
+    """
+    (Re)build the hash rows of credentials with ``lower < id <= upper``.
+
+    Rows in the range are deleted and rewritten, so re-running a range is
+    harmless. ``connection`` is a Core connection or the ORM session.
+
+    Returns:
+        Number of credentials with a password in the range
+    """
+    credentials = connection.execute(
+        select(BreachedCredential.id, BreachedCredential.password)
+        .where(BreachedCredential.id > lower, BreachedCredential.id <= upper,
+               BreachedCredential.password.isnot(None))
+    ).all()
+    connection.execute(delete(PasswordHash).where(PasswordHash.credential_id > lower,
+                                                  PasswordHash.credential_id <= upper))
+    rows = [row for credential_id, password in credentials for row in _rows(credential_id, password)]
+    if rows:
+        connection.execute(insert(PasswordHash), rows)
+    bump_data_version(PASSWORD_HASHES, connection=connection)
+    return len(credentials)
+
+
+def max_credential_id(connection) -> int:
+    return connection.execute(select(func.max(BreachedCredential.id))).scalar() or 0
+
+
+def index_new_credentials(connection, after_id: int, chunk_size: int = INDEX_CHUNK) -> int:
+    """
+    Index every credential with ``id > after_id`` in chunks.
+
+    Bulk loaders read ``max_credential_id`` before inserting and call this
+    afterwards, in the same transaction.
+    """
+    max_id = max_credential_id(connection)
+    indexed = 0
+    for lower in range(after_id, max_id, chunk_size):
+        indexed += index_credentials(connection, lower, min(lower + chunk_size, max_id))
+    return indexed
+
+
+def reindex_credential(session, credential) -> None:
+    """Rewrite one credential's rows after it was added (and flushed) or edited."""
+    index_credentials(session, credential.id - 1, credential.id)
+
+
+def forget_credential(session, credential_id: int) -> None:
+    """Drop one credential's rows; call before deleting the credential."""
+    session.execute(delete(PasswordHash).where(PasswordHash.credential_id == credential_id))
+    bump_data_version(PASSWORD_HASHES, connection=session)
+
+
+def password_range(session, kind: str, prefix: str) -> List[Tuple[str, int]]:
+    """``[(suffix, count), ...]`` in suffix order for one hash prefix."""
+    return session.execute(
+        select(PasswordHash.suffix, func.count())
+        .where(PasswordHash.kind == kind, PasswordHash.prefix == prefix)
+        .group_by(PasswordHash.suffix)
+        .order_by(PasswordHash.suffix)
+    ).all()
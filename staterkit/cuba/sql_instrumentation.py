@@ -0,0 +1,218 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor execution events on the engine record, for the current request, the
+number of statements, the total time spent in the database and the slowest
+statements. After the request the totals are added to a ``Server-Timing``
+header and written as one structured log line. Statements slower than
+SQL_SLOW_QUERY_MS are written to the ``cuba.sql.slow`` logger together with
+their query plan. In debug mode statements repeated many times within a
+request are reported as probable N+1 lazy loads.
+
+Configuration:
+    SQL_INSTRUMENTATION: Enable the hooks (default True)
+    SQL_SERVER_TIMING: Add the Server-Timing header (default True)
+    SQL_SLOW_QUERY_MS: Slow statement threshold in milliseconds (default 200)
+    SQL_SLOW_QUERY_LOG: Optional file path for the slow query log
+    SQL_SLOWEST_KEPT: How many of the slowest statements to keep per request (default 5)
+    SQL_N_PLUS_ONE_THRESHOLD: Repetitions of one statement that count as N+1 (default 10)
+"""
+import json
+import logging
+import os
+import re
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+
+logger = logging.getLogger('cuba.sql')
+slow_logger = logging.getLogger('cuba.sql.slow')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class RequestSQLStats:
+    """SQL statistics collected for one request."""
+
+    __slots__ = ('count', 'total', 'slowest', 'statements', 'keep')
+
+    def __init__(self, keep: int = 5):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = []  # list of (duration, statement) kept sorted, longest first
+        self.statements = {}  # statement -> executions (for N+1 detection)
+        self.keep = keep
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+        if len(self.slowest) < self.keep or duration > self.slowest[-1][0]:
+            self.slowest.append((duration, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.keep:]
+
+    def repeated(self, threshold: int):
+        """Statements executed at least ``threshold`` times, most repeated first."""
+        return sorted(
+            ((count, statement) for statement, count in self.statements.items() if count >= threshold),
+            reverse=True,
+        )
+
+
+def _short(statement: str, limit: int = 300) -> str:
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + '...'
+
+
+def get_request_stats():
+    """Return the RequestSQLStats for the current request, or None."""
+    if not has_request_context():
+        return None
+    return g.get('sql_stats')
+
+
+def _explain(cursor, statement, parameters, dialect):
+    """Return the query plan for a SELECT, run on the same DBAPI connection."""
+    if not statement.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute(prefix + statement, parameters)
+        rows = plan_cursor.fetchall()
+    except Exception as e:
+        return [f"<plan unavailable: {e}>"]
+    finally:
+        plan_cursor.close()
+    if dialect == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _make_after_cursor_execute(app):
+    slow_threshold = app.config['SQL_SLOW_QUERY_MS'] / 1000.0
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get('query_start_time')
+        if not start_times:
+            return
+        duration = time.perf_counter() - start_times.pop()
+
+        stats = get_request_stats()
+        if stats is not None:
+            stats.record(statement, duration)
+
+        if duration >= slow_threshold:
+            plan = None if executemany else _explain(cursor, statement, parameters, conn.dialect.name)
+            slow_logger.warning(json.dumps({
+                'event': 'slow_query',
+                'endpoint': request.endpoint if has_request_context() else None,
+                'duration_ms': round(duration * 1000, 2),
+                'statement': _short(statement, 2000),
+                'plan': plan,
+            }))
+
+    return _after_cursor_execute
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start_time'):
+        connection.info['query_start_time'].pop()
+
+
+def _config(name):
+    return current_app.config[name]
+
+
+def _start_request():
+    g.sql_stats = RequestSQLStats(keep=_config('SQL_SLOWEST_KEPT'))
+
+
+def _finish_request(response):
+    stats = g.pop('sql_stats', None)
+    if stats is None:
+        return response
+
+    total_ms = stats.total * 1000
+    if _config('SQL_SERVER_TIMING'):
+        timing = f'db;dur={total_ms:.2f};desc="{stats.count} queries"'
+        existing = response.headers.get('Server-Timing')
+        response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+
+    if stats.count:
+        logger.info(json.dumps({
+            'event': 'request_sql',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(total_ms, 2),
+            'slowest': [
+                {'ms': round(duration * 1000, 2), 'statement': _short(statement)}
+                for duration, statement in stats.slowest
+            ],
+        }))
+
+    if _config('DEBUG'):
+        for count, statement in stats.repeated(_config('SQL_N_PLUS_ONE_THRESHOLD')):
+            logger.warning(json.dumps({
+                'event': 'possible_n_plus_one',
+                'endpoint': request.endpoint,
+                'executions': count,
+                'statement': _short(statement),
+            }))
+
+    return response
+
+
+def init_sql_instrumentation(app, db) -> None:
+    """Register engine events and request hooks (no-op when SQL_INSTRUMENTATION is off)."""
+    app.config.setdefault('SQL_INSTRUMENTATION', True)
+    app.config.setdefault('SQL_SERVER_TIMING', True)
+    app.config.setdefault('SQL_SLOW_QUERY_MS', 200)
+    app.config.setdefault('SQL_SLOW_QUERY_LOG', None)
+    app.config.setdefault('SQL_SLOWEST_KEPT', 5)
+    app.config.setdefault('SQL_N_PLUS_ONE_THRESHOLD', 10)
+
+    if not app.config['SQL_INSTRUMENTATION']:
+        return
+
+    if not logger.handlers:
+        # Structured lines go to stderr unless the deployment configures logging itself.
+        # Not also through the app logger ('cuba') and its default handler: once is enough
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    slow_log = app.config['SQL_SLOW_QUERY_LOG']
+    # slow_logger is module-global: every create_app() would otherwise add another
+    # handler (and file descriptor) and write each slow query once per app built
+    if slow_log and not any(isinstance(handler, logging.FileHandler)
+                            and handler.baseFilename == os.path.abspath(slow_log)
+                            for handler in slow_logger.handlers):
+        handler = logging.FileHandler(slow_log)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        slow_logger.addHandler(handler)
+        slow_logger.propagate = False  # Slow queries go to their file only
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _make_after_cursor_execute(app))
+    event.listen(engine, 'handle_error', _handle_error)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
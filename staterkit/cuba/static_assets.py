@@ -0,0 +1,213 @@
+"""
+Fingerprinted, precompressed static files.
+
+``flask static build`` hashes every file under ``cuba/static`` and writes
+``static_build/manifest.json``, which maps ``assets/css/style.css`` to
+``assets/css/style.<hash>.css``. For text assets it also writes gzip and
+brotli variants next to the manifest. When the manifest exists:
+
+* ``url_for('static', filename=...)`` returns the fingerprinted name, so
+  templates need no changes,
+* fingerprinted URLs are served with ``Cache-Control: immutable`` for a year,
+  using the best precompressed variant the client accepts,
+* any other static URL (e.g. a ``url()`` inside a stylesheet) is served as
+  before, with normal revalidation.
+
+Rebuild after changing static files; without a manifest nothing changes.
+Brotli variants need the optional ``brotli`` package.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Callable, Dict, Optional
+
+from flask import current_app, request, send_file
+from flask.sessions import SecureCookieSessionInterface
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 10
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Sources and editor files that are never requested by a page
+SKIP_EXTENSIONS = {'.scss', '.pug', '.md', '.php'}
+SKIP_NAMES = {'.DS_Store'}
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.json', '.map', '.svg', '.txt', '.html', '.xml',
+                           '.ttf', '.eot', '.otf', '.ico'}
+MIN_COMPRESS_SIZE = 512
+# (Content-Encoding, file suffix), in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def fingerprinted_name(path: str, digest: str) -> str:
+    """``assets/js/app.min.js`` -> ``assets/js/app.min.<digest>.js``"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def _file_digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            sha.update(block)
+    return sha.hexdigest()[:HASH_LENGTH]
+
+
+def _write_variant(target: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, target)
+
+
+def _compress(source: str, hashed: str, build_dir: str) -> int:
+    """Write missing .gz/.br variants of one file; returns the number written."""
+    with open(source, 'rb') as f:
+        data = f.read()
+    written = 0
+    compressors = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if BROTLI_AVAILABLE:
+        compressors.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+    for suffix, compress in compressors:
+        target = os.path.join(build_dir, hashed + suffix)
+        if os.path.exists(target):
+            # The digest is in the name, so an existing variant is already current
+            continue
+        packed = compress(data)
+        if len(packed) < len(data) * 0.9:
+            _write_variant(target, packed)
+            written += 1
+    return written
+
+
+def build_static(static_folder: str, build_dir: str,
+                 progress: Optional[Callable[[str], None]] = None) -> Dict[str, int]:
+    """
+    Hash all static files, precompress text assets and write the manifest.
+
+    Variants of files that no longer exist (or changed) are removed.
+    """
+    manifest: Dict[str, str] = {}
+    compressed = 0
+    for dirpath, dirnames, filenames in os.walk(static_folder):
+        dirnames.sort()
+        for name in sorted(filenames):
+            ext = os.path.splitext(name)[1].lower()
+            if name in SKIP_NAMES or ext in SKIP_EXTENSIONS:
+                continue
+            source = os.path.join(dirpath, name)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            hashed = fingerprinted_name(relative, _file_digest(source))
+            manifest[relative] = hashed
+            if ext in COMPRESSIBLE_EXTENSIONS and os.path.getsize(source) >= MIN_COMPRESS_SIZE:
+                compressed += _compress(source, hashed, build_dir)
+        if progress and filenames:
+            progress(os.path.relpath(dirpath, static_folder))
+
+    expected = {hashed + suffix for hashed in manifest.values() for _, suffix in ENCODINGS}
+    removed = 0
+    for dirpath, _, filenames in os.walk(build_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            relative = os.path.relpath(path, build_dir).replace(os.sep, '/')
+            if relative != MANIFEST_NAME and relative not in expected:
+                os.remove(path)
+                removed += 1
+
+    _write_variant(os.path.join(build_dir, MANIFEST_NAME),
+                   json.dumps(manifest, indent=0, sort_keys=True).encode())
+    return {'files': len(manifest), 'compressed': compressed, 'removed': removed}
+
+
+class StaticManifest:
+    """Loaded manifest: original -> fingerprinted names and the reverse lookup."""
+
+    def __init__(self, build_dir: str, hashed: Dict[str, str]):
+        self.build_dir = build_dir
+        self.hashed = hashed
+        self.originals = {value: key for key, value in hashed.items()}
+
+    @classmethod
+    def load(cls, build_dir: str) -> Optional['StaticManifest']:
+        path = os.path.join(build_dir, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls(build_dir, json.load(f))
+
+
+def _accepted_encodings():
+    return {part.split(';')[0].strip() for part in request.headers.get('Accept-Encoding', '').split(',')}
+
+
+def _make_url_defaults(manifest: StaticManifest):
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == 'static':
+            filename = values.get('filename')
+            if filename in manifest.hashed:
+                values['filename'] = manifest.hashed[filename]
+    return fingerprint_static_urls
+
+
+def _make_static_view(manifest: StaticManifest, default_view):
+    def static(filename):
+        original = manifest.originals.get(filename)
+        if original is None:
+            return default_view(filename=filename)
+
+        accepted = _accepted_encodings()
+        path, encoding = os.path.join(current_app.static_folder, original), None
+        for name, suffix in ENCODINGS:
+            candidate = os.path.join(manifest.build_dir, filename + suffix)
+            if name in accepted and os.path.exists(candidate):
+                path, encoding = candidate, name
+                break
+
+        mimetype = mimetypes.guess_type(original)[0] or 'application/octet-stream'
+        response = send_file(path, mimetype=mimetype, conditional=True, max_age=IMMUTABLE_MAX_AGE)
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+    return static
+
+
+class StaticSkippingSessionInterface(SecureCookieSessionInterface):
+    """
+    Do not save the session on static responses.
+
+    Flask-Login touches the session after every request, which would add
+    ``Vary: Cookie`` (and possibly ``Set-Cookie``) and defeat the immutable cache.
+    """
+
+    def save_session(self, app, session, response):
+        if request.endpoint == 'static':
+            return
+        super().save_session(app, session, response)
+
+
+def init_static_assets(app) -> None:
+    """Serve fingerprinted static files when a built manifest is present."""
+    app.config.setdefault('STATIC_BUILD_DIR', os.path.join(app.root_path, 'static_build'))
+    app.config.setdefault('STATIC_FINGERPRINT', True)
+
+    if not app.config['STATIC_FINGERPRINT'] or not app.has_static_folder:
+        return
+    manifest = StaticManifest.load(app.config['STATIC_BUILD_DIR'])
+    if manifest is None:
+        return
+
+    app.extensions['static_manifest'] = manifest
+    app.session_interface = StaticSkippingSessionInterface()
+    app.url_defaults(_make_url_defaults(manifest))
+    app.view_functions['static'] = _make_static_view(manifest, app.view_functions['static'])
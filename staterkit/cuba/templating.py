@@ -0,0 +1,71 @@
+"""
+Persistent Jinja bytecode cache.
+
+Jinja normally parses and compiles every template the first time each worker
+renders it. With a bytecode cache the compiled code is stored in
+``TEMPLATE_CACHE_DIR`` (default ``instance/jinja_cache``), keyed by template
+name and source checksum. A new worker loads the bytecode instead of parsing
+the template, and an edited template is recompiled automatically.
+``flask templates compile`` fills the cache at deploy time.
+"""
+import logging
+import os
+from typing import Callable, List, Optional, Tuple
+
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+
+logger = logging.getLogger(__name__)
+
+
+class TolerantBytecodeCache(FileSystemBytecodeCache):
+    """
+    Filesystem bytecode cache that never fails a render because it cannot write.
+
+    Read-only deployments ship a cache compiled at deploy time; a template
+    missing from it is compiled in memory as usual.
+    """
+
+    def dump_bytecode(self, bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.debug("Template bytecode not cached for %s: %s", bucket.key, e)
+
+
+def init_template_cache(app) -> None:
+    """Attach the bytecode cache to the app's Jinja environment (unless disabled)."""
+    app.config.setdefault('TEMPLATE_BYTECODE_CACHE', True)
+    app.config.setdefault('TEMPLATE_CACHE_DIR', None)
+
+    if not app.config['TEMPLATE_BYTECODE_CACHE']:
+        return
+    directory = app.config['TEMPLATE_CACHE_DIR'] or os.path.join(app.instance_path, 'jinja_cache')
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning("Template bytecode cache disabled, cannot create %s: %s", directory, e)
+        return
+    app.config['TEMPLATE_CACHE_DIR'] = directory
+    app.jinja_env.bytecode_cache = TolerantBytecodeCache(directory)
+
+
+def compile_templates(app, progress: Optional[Callable[[str], None]] = None) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Compile every HTML template so its bytecode lands in the cache.
+
+    Returns:
+        (number compiled, [(template name, error), ...])
+    """
+    env = app.jinja_env
+    compiled, failed = 0, []
+    for name in env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        try:
+            env.get_template(name)
+        except TemplateError as e:
+            failed.append((name, str(e)))
+            continue
+        compiled += 1
+        if progress:
+            progress(name)
+    return compiled, failed
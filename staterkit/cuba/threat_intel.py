@@ -1,36 +1,28 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, Response, jsonify
 from flask_login import login_required, current_user
 from sqlalchemy import or_, func, and_
+from sqlalchemy.orm import joinedload
 from datetime import datetime, date, timedelta
 import html
-import csv
-import io
-import json
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib import colors
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+import time
 
 from . import db, cache
 from .models import BreachedCredential, Company, Notification, User
 from .audit_helpers import log_audit
+from .changes import record_credential_change, scope_values
+from .conditional import bump_data_version
+from .forwarder import forward_credentials
+from .metrics import record_export, record_ingest, record_notification_fanout
 from .security import (
     get_user_company_domain,
     get_user_watchlist_domains,
     can_user_access_breached_cred,
     requires_breached_cred_access,
 )
+from .services.exporters import render_export
 from .services.filters import build_date_filter
+from .services.identity_lookup import record_identities
+from .services.password_index import forget_credential, reindex_credential
 from .services.breached_creds_service import (
     build_analysis_stats,
     apply_breached_domain_filter,
@@ -40,6 +32,7 @@ from .security import (
     get_user_watchlist_domains,
     can_user_access_breached_cred,
 )
+from .webhooks import enqueue_credentials, wake_dispatcher
 
 threat_intel = Blueprint('threat_intel', __name__)
 
@@ -148,6 +141,7 @@ def _notify_new_breach(credential_id, company_domain, company_name, email):
             db.session.add(notification)
         
         db.session.commit()
+        record_notification_fanout(len(users))
     except Exception as e:
         # Log error but don't break the flow
         print(f"Error creating notifications: {e}")
@@ -270,6 +264,7 @@ def breached_creds_add():
         return redirect(url_for('threat_intel.breached_creds_list'))
     
     if request.method == 'POST':
+        started = time.perf_counter()
         # Security: Sanitize all inputs
         _id = sanitize_input(request.form.get('_id', ''))
         _index = sanitize_input(request.form.get('_index', ''))
@@ -317,7 +312,17 @@ def breached_creds_add():
         )
         
         db.session.add(breached_cred)
+        db.session.flush()
+        reindex_credential(db.session, breached_cred)
+        record_credential_change(breached_cred, 'insert')
+        record_identities([breached_cred.username])
+        queued_webhooks = enqueue_credentials([breached_cred])
+        bump_data_version()
         db.session.commit()
+        record_ingest('form', 1, time.perf_counter() - started)
+        forward_credentials([breached_cred])
+        if queued_webhooks:
+            wake_dispatcher()
         
         # Create notifications for users in the same company
         if domain:
@@ -349,6 +354,8 @@ def breached_creds_mark(id, breached_cred):
         breached_cred.marked_at = None
         flash('Mark removed.', 'info')
     
+    record_credential_change(breached_cred, 'mark' if breached_cred.is_marked else 'unmark')
+    bump_data_version()
     db.session.commit()
     
     # Performance: Clear cache when marking changes
@@ -371,6 +378,7 @@ def breached_creds_edit(id, breached_cred):
     # Additional check: ensure record is accessible (for future multi-tenant scenarios)
     
     if request.method == 'POST':
+        previous = scope_values(breached_cred)
         # Security: Sanitize all inputs
         breached_cred._id = sanitize_input(request.form.get('_id', '')) or None
         breached_cred._index = sanitize_input(request.form.get('_index', '')) or None
@@ -406,6 +414,10 @@ def breached_creds_edit(id, breached_cred):
         breached_cred.updated_at = datetime.utcnow()
                 
         try:
+            reindex_credential(db.session, breached_cred)
+            record_credential_change(breached_cred, 'update', previous)
+            record_identities([breached_cred.username])
+            bump_data_version()
             db.session.commit()
             flash('Breached credential updated successfully.', 'success')
         except OperationalError as e:
@@ -438,7 +450,10 @@ def breached_creds_delete(id, breached_cred):
     
     identifier = breached_cred.username or breached_cred.domain or str(breached_cred.id)
     
+    forget_credential(db.session, breached_cred.id)
+    record_credential_change(breached_cred, 'delete')
     db.session.delete(breached_cred)
+    bump_data_version()
     db.session.commit()
     
     # Performance: Clear cache when data is deleted
@@ -453,6 +468,7 @@ def breached_creds_delete(id, breached_cred):
 def breached_creds_export():
     """Export breached credentials - supports CSV, Excel, JSON, PDF"""
     export_format = request.args.get('format', 'csv').lower()  # csv, xlsx, json, pdf
+    export_started = time.perf_counter()
     # Security: Get user's company domain for filtering
     user_domain = get_user_company_domain()
     
@@ -500,176 +516,29 @@ def breached_creds_export():
             )
         )
     
-    breached_creds = query.order_by(BreachedCredential.created_at.desc()).all()
+    # Load creators in the same query; every export format prints creator.username
+    breached_creds = (
+        query.options(joinedload(BreachedCredential.creator))
+        .order_by(BreachedCredential.created_at.desc())
+        .all()
+    )
     
+    # Render before logging: the audit commit expires the loaded rows, and touching
+    # them afterwards would reload every credential and creator one by one
+    served_format, body, mimetype = render_export(breached_creds, export_format)
+    exported = len(breached_creds)
+
     # Log export action
     log_audit("export", "breached_credential", None, 
-              f"Exported {len(breached_creds)} breached credentials in {export_format.upper()} format")
-    
+              f"Exported {exported} breached credentials in {export_format.upper()} format")
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Handle different export formats
-    if export_format == 'json':
-        # JSON export
-        data = []
-        for cred in breached_creds:
-            data.append({
-                'id': cred.id,
-                '_id': cred._id,
-                '_index': cred._index,
-                '_score': cred._score,
-                '_ignored': cred._ignored,
-                'username': cred.username,
-                'domain': cred.domain,
-                'password': cred.password,
-                'source': cred.source,
-                'type': cred.type,
-                'url': cred.url,
-                'is_marked': cred.is_marked,
-                'created_by': cred.creator.username if cred.creator else None,
-                'created_at': cred.created_at.isoformat() if cred.created_at else None
-            })
-        
-        response = Response(
-            json.dumps(data, indent=2),
-            mimetype='application/json',
-            headers={'Content-Disposition': f'attachment; filename=breached_credentials_{timestamp}.json'}
-        )
-        return response
-    
-    elif export_format == 'xlsx' and OPENPYXL_AVAILABLE:
-        # Excel export
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Breached Credentials"
-        
-        # Headers
-        headers = ['ID', '_id', '_index', '_score', '_ignored', 'Username', 'Domain', 'Password',
-                  'Source', 'Type', 'URL', 'Marked', 'Created By', 'Created At']
-        ws.append(headers)
-        
-        # Style header row
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Data rows
-        for cred in breached_creds:
-            ws.append([
-                cred.id,
-                cred._id or '',
-                cred._index or '',
-                cred._score if cred._score is not None else '',
-                'Yes' if cred._ignored else 'No',
-                cred.username or '',
-                cred.domain or '',
-                cred.password or '',
-                cred.source or '',
-                cred.type or '',
-                cred.url or '',
-                'Yes' if cred.is_marked else 'No',
-                cred.creator.username if cred.creator else '',
-                cred.created_at.strftime('%Y-%m-%d %H:%M:%S') if cred.created_at else ''
-            ])
-        
-        # Save to BytesIO
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        response = Response(
-            output.getvalue(),
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            headers={'Content-Disposition': f'attachment; filename=breached_credentials_{timestamp}.xlsx'}
-        )
-        return response
-    
-    elif export_format == 'pdf' and REPORTLAB_AVAILABLE:
-        # PDF export
-        output = io.BytesIO()
-        doc = SimpleDocTemplate(output, pagesize=letter)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title = Paragraph("Breached Credentials Report", styles['Title'])
-        elements.append(title)
-        elements.append(Spacer(1, 12))
-        
-        # Summary
-        summary = Paragraph(f"Total Records: {len(breached_creds)}<br/>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                           styles['Normal'])
-        elements.append(summary)
-        elements.append(Spacer(1, 12))
-        
-        # Table data
-        data = [['ID', 'Username', 'Domain', 'Type', 'Source', 'Created']]
-        for cred in breached_creds[:100]:  # Limit to 100 rows for PDF
-            data.append([
-                str(cred.id),
-                (cred.username or '')[:30],  # Truncate long values
-                (cred.domain or '')[:30],
-                cred.type or '',
-                (cred.source or '')[:30],
-                cred.created_at.strftime('%Y-%m-%d') if cred.created_at else ''
-            ])
-        
-        # Create table
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        output.seek(0)
-        
-        response = Response(
-            output.getvalue(),
-            mimetype='application/pdf',
-            headers={'Content-Disposition': f'attachment; filename=breached_credentials_{timestamp}.pdf'}
-        )
-        return response
-    
-    else:
-        # Default: CSV export
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['ID', '_id', '_index', '_score', '_ignored', 'Username', 'Domain', 'Password',
-                        'Source', 'Type', 'URL', 'Marked', 'Created By', 'Created At'])
-    for cred in breached_creds:
-        writer.writerow([
-            cred.id,
-            cred._id or '',
-            cred._index or '',
-            cred._score if cred._score is not None else '',
-            'Yes' if cred._ignored else 'No',
-            cred.username or '',
-            cred.domain or '',
-            cred.password or '',
-            cred.source or '',
-            cred.type or '',
-            cred.url or '',
-            'Yes' if cred.is_marked else 'No',
-            cred.creator.username if cred.creator else '',
-            cred.created_at.strftime('%Y-%m-%d %H:%M:%S') if cred.created_at else ''
-        ])
-    
-    # Create response
-    output.seek(0)
     response = Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': f'attachment; filename=breached_credentials_{timestamp}.csv'}
+        body,
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=breached_credentials_{timestamp}.{served_format}'}
     )
+    record_export(served_format, exported, time.perf_counter() - export_started)
     return response
 
 
@@ -0,0 +1,162 @@
+"""
+Sliding-window login throttling.
+
+Failed logins are counted per client IP and per email. Once either count
+reaches its limit within ``LOGIN_THROTTLE_WINDOW`` seconds, further attempts
+are rejected *before* the user lookup and password hash, so a
+credential-stuffing burst costs a dictionary lookup per request instead of a
+hash check and a database write.
+
+The window is a sliding-window counter: the previous fixed window's count,
+weighted by how much of it still overlaps the sliding window, plus the
+current window's count. Counters live in process memory by default.
+``LOGIN_THROTTLE_BACKEND = 'cache'`` keeps them in the app cache instead,
+which multi-worker deployments should back with a shared store (e.g.
+``CACHE_TYPE = 'RedisCache'``).
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from flask import current_app
+
+
+class MemoryCounterStore:
+    """Per-process counters, grouped by window so old windows are dropped in one step."""
+
+    def __init__(self):
+        self._windows: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, window: int, ttl: int) -> int:
+        with self._lock:
+            for stale in [w for w in self._windows if w < window - 1]:
+                del self._windows[stale]
+            counts = self._windows.setdefault(window, {})
+            counts[key] = counts.get(key, 0) + 1
+            return counts[key]
+
+    def get_many(self, key: str, windows: Iterable[int]) -> List[int]:
+        with self._lock:
+            return [self._windows.get(window, {}).get(key, 0) for window in windows]
+
+    def reset(self, key: str, windows: Iterable[int]) -> None:
+        with self._lock:
+            for window in windows:
+                self._windows.get(window, {}).pop(key, None)
+
+
+class CacheCounterStore:
+    """Counters in the Flask-Caching app cache, shared between workers with a shared backend."""
+
+    def __init__(self, cache, prefix: str = 'throttle'):
+        self.cache = cache
+        self.prefix = prefix
+
+    def _key(self, key: str, window: int) -> str:
+        return f'{self.prefix}:{key}:{window}'
+
+    def incr(self, key: str, window: int, ttl: int) -> int:
+        cache_key = self._key(key, window)
+        # ``Cache`` does not proxy ``inc``; the backend's is atomic on shared stores (Redis INCR)
+        backend = self.cache.cache
+        backend.add(cache_key, 0, timeout=ttl)
+        return backend.inc(cache_key) or 0
+
+    def get_many(self, key: str, windows: Iterable[int]) -> List[int]:
+        return [int(value or 0) for value in self.cache.get_many(*[self._key(key, w) for w in windows])]
+
+    def reset(self, key: str, windows: Iterable[int]) -> None:
+        self.cache.delete_many(*[self._key(key, w) for w in windows])
+
+
+class SlidingWindowLimiter:
+    """At most ``limit`` hits per ``window`` seconds for each key."""
+
+    def __init__(self, store, limit: int, window: int):
+        self.store = store
+        self.limit = limit
+        self.window = window
+
+    def _position(self, now: Optional[float]):
+        now = time.time() if now is None else now
+        return int(now // self.window), (now % self.window) / self.window
+
+    def count(self, key: str, now: Optional[float] = None) -> float:
+        current, elapsed = self._position(now)
+        previous_hits, current_hits = self.store.get_many(key, [current - 1, current])
+        return previous_hits * (1 - elapsed) + current_hits
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> Optional[int]:
+        """Seconds until ``key`` may try again, or None if it is not limited."""
+        if self.count(key, now) < self.limit:
+            return None
+        _, elapsed = self._position(now)
+        return max(1, int(self.window * (1 - elapsed)))
+
+    def hit(self, key: str, now: Optional[float] = None) -> None:
+        current, _ = self._position(now)
+        self.store.incr(key, current, ttl=2 * self.window)
+
+    def reset(self, key: str, now: Optional[float] = None) -> None:
+        # Only the current and previous window count towards the limit
+        current, _ = self._position(now)
+        self.store.reset(key, [current - 1, current])
+
+
+class LoginThrottle:
+    """Failed-login limiters keyed by client IP and by email."""
+
+    def __init__(self, store, window: int, ip_limit: int, email_limit: int):
+        self.window = window
+        self.by_ip = SlidingWindowLimiter(store, ip_limit, window)
+        self.by_email = SlidingWindowLimiter(store, email_limit, window)
+
+    def retry_after(self, ip: Optional[str], email: str) -> Optional[int]:
+        """Seconds the client has to wait before another attempt, None if allowed."""
+        waits = [self.by_ip.retry_after(f'ip:{ip}'), self.by_email.retry_after(f'email:{email}')]
+        waits = [wait for wait in waits if wait is not None]
+        return max(waits) if waits else None
+
+    def failed(self, ip: Optional[str], email: str) -> None:
+        self.by_ip.hit(f'ip:{ip}')
+        self.by_email.hit(f'email:{email}')
+
+    def succeeded(self, email: str) -> None:
+        self.by_email.reset(f'email:{email}')
+
+    def rejected(self, ip: Optional[str]) -> bool:
+        """Count a rejected attempt; True only for the first one from ``ip`` in the window."""
+        current = int(time.time() // self.window)
+        return self.by_ip.store.incr(f'rejected:{ip}', current, ttl=2 * self.window) == 1
+
+
+def init_login_throttle(app) -> None:
+    app.config.setdefault('LOGIN_THROTTLE_ENABLED', True)
+    app.config.setdefault('LOGIN_THROTTLE_BACKEND', 'memory')
+    app.config.setdefault('LOGIN_THROTTLE_WINDOW', 300)
+    app.config.setdefault('LOGIN_THROTTLE_IP_LIMIT', 30)
+    app.config.setdefault('LOGIN_THROTTLE_EMAIL_LIMIT', 5)
+
+    if app.config['LOGIN_THROTTLE_BACKEND'] == 'cache':
+        from . import cache
+        store = CacheCounterStore(cache)
+    elif app.config['LOGIN_THROTTLE_BACKEND'] == 'memory':
+        store = MemoryCounterStore()
+    else:
+        raise ValueError(f"Unknown LOGIN_THROTTLE_BACKEND {app.config['LOGIN_THROTTLE_BACKEND']!r} "
+                         "(expected 'memory' or 'cache')")
+
+    app.extensions['login_throttle'] = LoginThrottle(
+        store,
+        window=app.config['LOGIN_THROTTLE_WINDOW'],
+        ip_limit=app.config['LOGIN_THROTTLE_IP_LIMIT'],
+        email_limit=app.config['LOGIN_THROTTLE_EMAIL_LIMIT'],
+    )
+
+
+def get_login_throttle() -> Optional[LoginThrottle]:
+    """The app's throttle, or None when throttling is disabled."""
+    if not current_app.config.get('LOGIN_THROTTLE_ENABLED', True):
+        return None
+    return current_app.extensions.get('login_throttle')
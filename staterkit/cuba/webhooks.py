@@ -0,0 +1,475 @@
+"""
+Per-company webhooks for new breach matches.
+
+A company can have webhook subscriptions (``flask webhooks add``). When
+ingest (bulk or the add form) inserts credentials that match a company
+(``company_id`` set), one ``breach.matched`` row per credential and active
+subscription is written to ``webhook_outbox``, in the same transaction as
+the credentials. An event is therefore never lost to a crash between the
+commit and the send, and it is never sent for a rolled-back insert.
+
+Each subscription is its own queue. The dispatcher leases due subscriptions
+(``locked_until``) and hands each one to a worker from a bounded thread
+pool. A subscription is only claimed when a worker is idle, so no work
+waits behind a slow endpoint. The worker POSTs up to
+``WEBHOOK_BATCH_SIZE`` queued events as one JSON payload over a keep-alive
+connection. A 2xx response deletes the rows. Any other outcome pauses that
+subscription (``retry_at``) with exponential backoff. Rows that fail
+``WEBHOOK_MAX_ATTEMPTS`` times are parked as ``dead`` until
+``flask webhooks requeue``. Leases make it safe to run a dispatcher in
+every process.
+
+Payloads are signed: ``X-Cuba-Signature: sha256=<hex>`` is the HMAC-SHA256
+of ``<X-Cuba-Timestamp>.<body>`` with the subscription secret. Event ids
+stay the same across retries, so receivers can drop duplicates. Passwords
+are never sent.
+
+The web processes deliver from a background thread that starts on the first
+enqueue (``WEBHOOKS_DISPATCH``). ``flask webhooks run`` is a dedicated
+worker that also picks up rows left from a restart.
+"""
+import atexit
+import hashlib
+import hmac
+import http.client
+import json
+import os
+import random
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from flask import current_app
+from sqlalchemy import and_, case, delete, insert, literal, or_, select, update
+
+from .forwarder import credential_event
+from .metrics import record_webhook_delivery
+
+EVENT_MATCHED = 'breach.matched'
+SIGNATURE_HEADER = 'X-Cuba-Signature'
+TIMESTAMP_HEADER = 'X-Cuba-Timestamp'
+DELIVERY_HEADER = 'X-Cuba-Delivery'
+USER_AGENT = 'cuba-webhooks/1.0'
+
+
+def generate_secret() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """Value of the ``X-Cuba-Signature`` header for ``body``."""
+    mac = hmac.new(secret.encode('utf-8'), timestamp.encode('ascii') + b'.' + body, hashlib.sha256)
+    return 'sha256=' + mac.hexdigest()
+
+
+def validate_url(url: str) -> str:
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise ValueError(f"Webhook URL must be http:// or https:// with a host, got {url!r}")
+    return url
+
+
+# ---------------------------------------------------------------------------
+# Enqueue (writers, before committing the credentials)
+# ---------------------------------------------------------------------------
+
+def enqueue_credentials(credentials: Iterable) -> int:
+    """Queue ``breach.matched`` for flushed ORM credentials of companies with active subscriptions."""
+    from . import db
+    from .models import WebhookOutbox, WebhookSubscription
+
+    by_company: Dict[int, List[int]] = {}
+    for credential in credentials:
+        if credential.company_id:
+            by_company.setdefault(credential.company_id, []).append(credential.id)
+    if not by_company:
+        return 0
+    subscriptions = db.session.execute(
+        select(WebhookSubscription.id, WebhookSubscription.company_id)
+        .where(WebhookSubscription.company_id.in_(by_company), WebhookSubscription.is_active.is_(True))
+    ).all()
+    now = datetime.utcnow()
+    rows = [{'subscription_id': subscription_id, 'credential_id': credential_id, 'event': EVENT_MATCHED,
+             'status': 'pending', 'attempts': 0, 'created_at': now}
+            for subscription_id, company_id in subscriptions for credential_id in by_company[company_id]]
+    if rows:
+        db.session.execute(insert(WebhookOutbox), rows)
+    return len(rows)
+
+
+def enqueue_credentials_since(connection, after_id: int) -> int:
+    """Queue ``breach.matched`` for every credential with ``id > after_id`` in one INSERT ... SELECT (bulk loaders)."""
+    from .models import BreachedCredential, WebhookOutbox, WebhookSubscription
+
+    source = (
+        select(WebhookSubscription.id, BreachedCredential.id, literal(EVENT_MATCHED), literal('pending'),
+               literal(0), literal(datetime.utcnow()))
+        .select_from(BreachedCredential)
+        .join(WebhookSubscription, and_(WebhookSubscription.company_id == BreachedCredential.company_id,
+                                        WebhookSubscription.is_active.is_(True)))
+        .where(BreachedCredential.id > after_id)
+        .order_by(BreachedCredential.id)
+    )
+    result = connection.execute(insert(WebhookOutbox).from_select(
+        ['subscription_id', 'credential_id', 'event', 'status', 'attempts', 'created_at'], source))
+    return max(result.rowcount or 0, 0)
+
+
+def wake_dispatcher() -> None:
+    """Tell this process's dispatcher there is new work; call after the commit."""
+    dispatcher = current_app.extensions.get('webhooks')
+    if dispatcher is not None:
+        dispatcher.wake()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class HttpClient:
+    """Keep-alive HTTP(S) connections, one per origin and worker thread."""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._open = set()
+        self._lock = threading.Lock()
+
+    def _connections(self) -> Dict[Tuple, http.client.HTTPConnection]:
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def _drop(self, key, connection) -> None:
+        self._connections().pop(key, None)
+        with self._lock:
+            self._open.discard(connection)
+        connection.close()
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes]:
+        """POST and return (status, body); raises OSError/HTTPException when there is no response."""
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.hostname, parsed.port)
+        path = (parsed.path or '/') + (f'?{parsed.query}' if parsed.query else '')
+        connections = self._connections()
+        for attempt in range(2):
+            connection = connections.get(key)
+            reused = connection is not None
+            if connection is None:
+                connection_class = (http.client.HTTPSConnection if parsed.scheme == 'https'
+                                    else http.client.HTTPConnection)
+                connection = connection_class(parsed.hostname, parsed.port, timeout=self.timeout)
+                connections[key] = connection
+                with self._lock:
+                    self._open.add(connection)
+            try:
+                connection.request('POST', path, body=body, headers=headers)
+                response = connection.getresponse()
+                content = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                self._drop(key, connection)
+                # The server may have closed an idle keep-alive connection; retry once on a new one
+                if reused and attempt == 0 and isinstance(exc, (ConnectionError, http.client.BadStatusLine)):
+                    continue
+                raise
+            if response.will_close:
+                self._drop(key, connection)
+            return response.status, content
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._open = list(self._open), set()
+        for connection in connections:
+            connection.close()
+
+
+# ---------------------------------------------------------------------------
+# Dispatcher
+# ---------------------------------------------------------------------------
+
+def backoff_delay(failures: int, base: float, maximum: float) -> float:
+    """Seconds to pause after ``failures`` consecutive failures: doubling, capped, with jitter."""
+    delay = min(maximum, base * 2 ** max(failures - 1, 0))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class WebhookDispatcher:
+    """Leases due subscriptions and delivers their queues from a bounded thread pool."""
+
+    def __init__(self, app, workers: int = 8, batch_size: int = 100, timeout: float = 10.0,
+                 retry_base: float = 30.0, retry_max: float = 21600.0, max_attempts: int = 12,
+                 poll_interval: float = 5.0):
+        self.app = app
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=2 * timeout + 60)  # Outlives one batch, even a slow one
+        self.http = HttpClient(timeout)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[int, Future] = {}
+        self._pid = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Pool threads do not survive fork(); a worker process builds its own
+        if self._executor is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._inflight = {}
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='cuba-webhook')
+        return self._executor
+
+    def _claim(self, limit: int) -> List[int]:
+        """Lease up to ``limit`` active, unpaused, unleased subscriptions that have pending events."""
+        from . import db
+        from .models import WebhookOutbox, WebhookSubscription
+
+        now = datetime.utcnow()
+        unleased = or_(WebhookSubscription.locked_until.is_(None), WebhookSubscription.locked_until < now)
+        pending = (select(WebhookOutbox.id)
+                   .where(WebhookOutbox.subscription_id == WebhookSubscription.id,
+                          WebhookOutbox.status == 'pending')
+                   .exists())
+        candidates = db.session.execute(
+            select(WebhookSubscription.id)
+            .where(WebhookSubscription.is_active.is_(True),
+                   or_(WebhookSubscription.retry_at.is_(None), WebhookSubscription.retry_at <= now),
+                   unleased, pending)
+            .order_by(WebhookSubscription.last_attempt_at.asc().nullsfirst(), WebhookSubscription.id)
+            .limit(limit)
+        ).scalars().all()
+        claimed = []
+        for subscription_id in candidates:
+            result = db.session.execute(
+                update(WebhookSubscription)
+                .where(WebhookSubscription.id == subscription_id, unleased)
+                .values(locked_until=now + self.lease)
+            )
+            if result.rowcount:
+                claimed.append(subscription_id)
+        db.session.commit()
+        return claimed
+
+    def _release(self, subscription_id: int) -> None:
+        from . import db
+        from .models import WebhookSubscription
+
+        db.session.execute(update(WebhookSubscription).where(WebhookSubscription.id == subscription_id)
+                           .values(locked_until=None))
+        db.session.commit()
+
+    def _payload(self, subscription, rows) -> Tuple[str, bytes]:
+        delivery_id = uuid.uuid4().hex
+        events = []
+        for outbox_id, event, credential in rows:
+            fields = credential_event(credential)
+            fields['created_at'] = fields['created_at'].isoformat()
+            events.append({'id': outbox_id, 'type': event, 'credential': fields})
+        body = json.dumps({
+            'delivery': delivery_id,
+            'company_id': subscription.company_id,
+            'sent_at': datetime.now(timezone.utc).isoformat(),
+            'events': events,
+        }, separators=(',', ':')).encode('utf-8')
+        return delivery_id, body
+
+    def deliver(self, subscription_id: int) -> int:
+        """
+        POST one batch of a leased subscription's queue and release the lease.
+
+        Returns:
+            Events delivered (0 on failure or when the queue was empty)
+        """
+        from . import db
+        from .models import BreachedCredential, WebhookOutbox, WebhookSubscription
+
+        session = db.session
+        subscription = session.get(WebhookSubscription, subscription_id)
+        if subscription is None:
+            return 0
+        queued = session.execute(
+            select(WebhookOutbox.id, WebhookOutbox.event, WebhookOutbox.credential_id)
+            .where(WebhookOutbox.subscription_id == subscription_id, WebhookOutbox.status == 'pending')
+            .order_by(WebhookOutbox.id)
+            .limit(self.batch_size)
+        ).all()
+        credentials = {row.id: dict(row._mapping) for row in session.execute(
+            select(BreachedCredential.id, BreachedCredential.username, BreachedCredential.domain,
+                   BreachedCredential.url, BreachedCredential.source, BreachedCredential.type,
+                   BreachedCredential.company_id, BreachedCredential.created_at)
+            .where(BreachedCredential.id.in_({credential_id for _, _, credential_id in queued}))
+        )} if queued else {}
+        rows = [(outbox_id, event, credentials[credential_id])
+                for outbox_id, event, credential_id in queued if credential_id in credentials]
+        # Credentials deleted before delivery are not announced
+        gone = [outbox_id for outbox_id, _, credential_id in queued if credential_id not in credentials]
+        if gone:
+            session.execute(delete(WebhookOutbox).where(WebhookOutbox.id.in_(gone)))
+
+        now = datetime.utcnow()
+        delivered = 0
+        if rows:
+            ids = [outbox_id for outbox_id, _, _ in rows]
+            delivery_id, body = self._payload(subscription, rows)
+            timestamp = str(int(time.time()))
+            headers = {
+                'Content-Type': 'application/json',
+                'User-Agent': USER_AGENT,
+                DELIVERY_HEADER: delivery_id,
+                TIMESTAMP_HEADER: timestamp,
+                SIGNATURE_HEADER: sign(subscription.secret, timestamp, body),
+            }
+            started = time.perf_counter()
+            try:
+                status, content = self.http.post(subscription.url, body, headers)
+                error = None if 200 <= status < 300 else f'HTTP {status}: {content[:200].decode("utf-8", "replace")}'
+            except (OSError, http.client.HTTPException) as exc:
+                error = f'{type(exc).__name__}: {exc}'
+            record_webhook_delivery(error is None, len(rows), time.perf_counter() - started)
+            subscription.last_attempt_at = now
+            if error is None:
+                session.execute(delete(WebhookOutbox).where(WebhookOutbox.id.in_(ids)))
+                subscription.failure_count = 0
+                subscription.retry_at = None
+                subscription.last_success_at = now
+                subscription.last_error = None
+                delivered = len(rows)
+            else:
+                session.execute(
+                    update(WebhookOutbox).where(WebhookOutbox.id.in_(ids)).values(
+                        attempts=WebhookOutbox.attempts + 1,
+                        last_error=error[:500],
+                        status=case((WebhookOutbox.attempts + 1 >= self.max_attempts, 'dead'), else_='pending'),
+                    )
+                )
+                subscription.failure_count += 1
+                subscription.retry_at = now + timedelta(
+                    seconds=backoff_delay(subscription.failure_count, self.retry_base, self.retry_max))
+                subscription.last_error = error[:500]
+                self.app.logger.warning('Webhook %s: delivery of %d events failed (%s); retrying at %s',
+                                        subscription_id, len(rows), error, subscription.retry_at)
+        subscription.locked_until = None
+        session.commit()
+        return delivered
+
+    def _work(self, subscription_id: int) -> int:
+        from . import db
+
+        with self.app.app_context():
+            try:
+                return self.deliver(subscription_id)
+            except Exception:
+                self.app.logger.exception('Webhook %s: delivery crashed', subscription_id)
+                db.session.rollback()
+                self._release(subscription_id)
+                return 0
+            finally:
+                self._wake.set()
+
+    def dispatch(self) -> int:
+        """Start a delivery for each due subscription that fits an idle worker; returns how many started."""
+        pool = self._pool()
+        for subscription_id, future in list(self._inflight.items()):
+            if future.done():
+                del self._inflight[subscription_id]
+        idle = self.workers - len(self._inflight)
+        if idle <= 0:
+            return 0
+        with self.app.app_context():
+            claimed = self._claim(idle)
+        for subscription_id in claimed:
+            self._inflight[subscription_id] = pool.submit(self._work, subscription_id)
+        return len(claimed)
+
+    def run_once(self) -> None:
+        """Deliver until no subscription is due (queues empty, paused by backoff or leased elsewhere)."""
+        while True:
+            started = self.dispatch()
+            if not started and not self._inflight:
+                return
+            if self._inflight:
+                wait(list(self._inflight.values()), return_when=FIRST_COMPLETED)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch()
+            except Exception:
+                self.app.logger.exception('Webhook dispatcher: claiming due subscriptions failed')
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def run_forever(self) -> None:
+        """Dispatch in the foreground until interrupted (``flask webhooks run``)."""
+        self._stop.clear()
+        try:
+            self._run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pool()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='cuba-webhook-dispatcher', daemon=True)
+                self._thread.start()
+
+    def wake(self) -> None:
+        if self.app.config.get('WEBHOOKS_DISPATCH', True):
+            self._ensure_started()
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop dispatching and let running deliveries finish; unfinished leases simply expire."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread() \
+                and self._pid == os.getpid():
+            self._thread.join(timeout)
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.http.close()
+
+
+def init_webhooks(app) -> None:
+    app.config.setdefault('WEBHOOKS_DISPATCH', True)
+    app.config.setdefault('WEBHOOK_WORKERS', 8)
+    app.config.setdefault('WEBHOOK_TIMEOUT', 10.0)
+    app.config.setdefault('WEBHOOK_BATCH_SIZE', 100)
+    app.config.setdefault('WEBHOOK_RETRY_BASE', 30.0)
+    app.config.setdefault('WEBHOOK_RETRY_MAX', 6 * 3600.0)
+    app.config.setdefault('WEBHOOK_MAX_ATTEMPTS', 12)
+    app.config.setdefault('WEBHOOK_POLL_INTERVAL', 5.0)
+    dispatcher = WebhookDispatcher(
+        app,
+        workers=app.config['WEBHOOK_WORKERS'],
+        batch_size=app.config['WEBHOOK_BATCH_SIZE'],
+        timeout=app.config['WEBHOOK_TIMEOUT'],
+        retry_base=app.config['WEBHOOK_RETRY_BASE'],
+        retry_max=app.config['WEBHOOK_RETRY_MAX'],
+        max_attempts=app.config['WEBHOOK_MAX_ATTEMPTS'],
+        poll_interval=app.config['WEBHOOK_POLL_INTERVAL'],
+    )
+    app.extensions['webhooks'] = dispatcher
+    atexit.register(dispatcher.stop)
+
+
+def get_dispatcher() -> WebhookDispatcher:
+    return current_app.extensions['webhooks']
@@ -0,0 +1,296 @@
+"""Baseline schema (replaces the legacy migrate_*.py scripts)
+
+Creates every table for a fresh database. For databases that were maintained
+with the old standalone sqlite3 scripts it brings the schema up to date
+instead: missing tables and columns are added, watchlist columns on company
+are moved into watchlist_entry, and a pre-2024 breached_credential layout is
+rebuilt with the current columns. Each step checks the live schema first, so
+the revision is safe to run on any database state.
+
+Revision ID: 3f1a2b7c9d01
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a2b7c9d01'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _columns(table):
+    return {col['name'] for col in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _create_company():
+    op.create_table(
+        'company',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('domain', sa.String(length=200), nullable=False),
+        sa.Column('company_type', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_index('ix_company_domain', 'company', ['domain'], unique=True)
+
+
+def _create_user():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('isAdmin', sa.Boolean(), nullable=True),
+        sa.Column('company_id', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username'),
+    )
+
+
+def _upgrade_user():
+    """Columns previously added by migrate_db.py."""
+    columns = _columns('user')
+    with op.batch_alter_table('user') as batch_op:
+        if 'role' not in columns:
+            batch_op.add_column(sa.Column('role', sa.String(length=20), server_default='member'))
+        if 'company_id' not in columns:
+            batch_op.add_column(sa.Column('company_id', sa.Integer(), nullable=True))
+        if 'is_active' not in columns:
+            batch_op.add_column(sa.Column('is_active', sa.Boolean(), server_default=sa.true()))
+        for name in ('created_at', 'updated_at', 'last_login'):
+            if name not in columns:
+                batch_op.add_column(sa.Column(name, sa.DateTime(), nullable=True))
+    if 'role' not in columns:
+        op.execute("UPDATE \"user\" SET role = 'member' WHERE role IS NULL")
+        op.execute(sa.text("UPDATE \"user\" SET role = 'admin' WHERE \"isAdmin\" = :is_admin")
+                   .bindparams(is_admin=True))
+
+
+def _create_todo():
+    op.create_table(
+        'todo',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(length=500), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('timeStamp', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('description'),
+    )
+
+
+def _breached_credential_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('_id', sa.String(length=200), nullable=True),
+        sa.Column('_ignored', sa.Boolean(), nullable=True),
+        sa.Column('_index', sa.String(length=200), nullable=True),
+        sa.Column('_score', sa.Float(), nullable=True),
+        sa.Column('domain', sa.String(length=200), nullable=True),
+        sa.Column('password', sa.String(length=500), nullable=True),
+        sa.Column('source', sa.String(length=200), nullable=True),
+        sa.Column('type', sa.String(length=50), nullable=True),
+        sa.Column('url', sa.String(length=500), nullable=True),
+        sa.Column('username', sa.String(length=200), nullable=True),
+        sa.Column('is_marked', sa.Boolean(), nullable=True),
+        sa.Column('marked_by', sa.Integer(), nullable=True),
+        sa.Column('marked_at', sa.DateTime(), nullable=True),
+        sa.Column('company_id', sa.Integer(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id']),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.ForeignKeyConstraint(['marked_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def _create_breached_credential_indexes():
+    for column in ('_id', 'domain', 'type', 'username'):
+        op.create_index(f'ix_breached_credential_{column}', 'breached_credential', [column], unique=False)
+
+
+def _rebuild_legacy_breached_credential():
+    """
+    Legacy layout (application/email/severity/...) -> current layout.
+
+    Equivalent of migrate_breached_creds_new_fields.py: only the columns that
+    exist in both layouts are copied, in one INSERT ... SELECT.
+    """
+    legacy_columns = _columns('breached_credential')
+    # Index names follow the table, free them before the new table claims them
+    for index in sa.inspect(op.get_bind()).get_indexes('breached_credential'):
+        op.drop_index(index['name'], table_name='breached_credential')
+    op.rename_table('breached_credential', 'breached_credential_old')
+    op.create_table('breached_credential', *_breached_credential_columns())
+
+    shared = [name for name in ('id', 'username', 'source', 'is_marked', 'marked_by',
+                                'marked_at', 'company_id', 'created_by', 'created_at', 'updated_at')
+              if name in legacy_columns]
+    # (target column, expression over breached_credential_old)
+    copied = [(name, name) for name in shared]
+    if 'severity' in legacy_columns:
+        # Same mapping as migrate_severity_to_type.py; anything else became combolist
+        severity_type = ("CASE WHEN severity = 'critical' THEN 'stealer' "
+                         "WHEN severity = 'high' THEN 'malware' ELSE 'combolist' END")
+        copied.append(('type', f'COALESCE(type, {severity_type})' if 'type' in legacy_columns else severity_type))
+    elif 'type' in legacy_columns:
+        copied.append(('type', 'type'))
+    if 'email_domain' in legacy_columns:
+        copied.append(('domain', 'email_domain'))
+
+    op.execute(
+        f"INSERT INTO breached_credential ({', '.join(target for target, _ in copied)}) "
+        f"SELECT {', '.join(expression for _, expression in copied)} FROM breached_credential_old"
+    )
+    op.drop_table('breached_credential_old')
+    _create_breached_credential_indexes()
+
+
+def _create_notification():
+    op.create_table(
+        'notification',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=True),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('link', sa.String(length=500), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.Column('read_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notification_created_at', 'notification', ['created_at'], unique=False)
+
+
+def _create_watchlist_entry():
+    op.create_table(
+        'watchlist_entry',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('entry_type', sa.String(length=20), nullable=False),
+        sa.Column('entry_value', sa.String(length=500), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def _move_company_watchlist_columns():
+    """Equivalent of migrate_add_watchlist_entry.py: old company.watchlist_* -> watchlist_entry."""
+    columns = _columns('company')
+    for entry_type in ('domain', 'url', 'email', 'slug'):
+        column = f'watchlist_{entry_type}'
+        if column not in columns:
+            continue
+        op.execute(
+            f"INSERT INTO watchlist_entry (company_id, entry_type, entry_value, created_at, updated_at) "
+            f"SELECT c.id, '{entry_type}', c.{column}, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM company c "
+            f"WHERE c.{column} IS NOT NULL AND c.{column} != '' AND NOT EXISTS ("
+            f"SELECT 1 FROM watchlist_entry w WHERE w.company_id = c.id "
+            f"AND w.entry_type = '{entry_type}' AND w.entry_value = c.{column})"
+        )
+
+
+def _create_audit_log():
+    op.create_table(
+        'audit_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('action_type', sa.String(length=50), nullable=False),
+        sa.Column('resource_type', sa.String(length=50), nullable=False),
+        sa.Column('resource_id', sa.Integer(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=500), nullable=True),
+        sa.Column('old_values', sa.Text(), nullable=True),
+        sa.Column('new_values', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_audit_log_action_type', 'audit_log', ['action_type'], unique=False)
+    op.create_index('ix_audit_log_resource_type', 'audit_log', ['resource_type'], unique=False)
+    op.create_index('ix_audit_log_created_at', 'audit_log', ['created_at'], unique=False)
+
+
+def _create_user_activity():
+    op.create_table(
+        'user_activity',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('activity_type', sa.String(length=50), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=500), nullable=True),
+        sa.Column('location', sa.String(length=200), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('failure_reason', sa.String(length=200), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_activity_activity_type', 'user_activity', ['activity_type'], unique=False)
+    op.create_index('ix_user_activity_ip_address', 'user_activity', ['ip_address'], unique=False)
+    op.create_index('ix_user_activity_created_at', 'user_activity', ['created_at'], unique=False)
+
+
+def upgrade():
+    tables = _tables()
+
+    if 'company' not in tables:
+        _create_company()
+    if 'user' not in tables:
+        _create_user()
+    else:
+        _upgrade_user()
+    if 'todo' not in tables:
+        _create_todo()
+
+    if 'breached_credential' not in tables:
+        op.create_table('breached_credential', *_breached_credential_columns())
+        _create_breached_credential_indexes()
+    elif not {'_id', 'domain', 'username'} <= _columns('breached_credential'):
+        _rebuild_legacy_breached_credential()
+
+    if 'notification' not in tables:
+        _create_notification()
+    if 'watchlist_entry' not in tables:
+        _create_watchlist_entry()
+    _move_company_watchlist_columns()
+    if 'audit_log' not in tables:
+        _create_audit_log()
+    if 'user_activity' not in tables:
+        _create_user_activity()
+
+
+def downgrade():
+    for table in ('user_activity', 'audit_log', 'watchlist_entry', 'notification',
+                  'breached_credential', 'todo', 'user', 'company'):
+        op.drop_table(table)
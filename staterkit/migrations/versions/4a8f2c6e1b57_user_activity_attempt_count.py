@@ -0,0 +1,26 @@
+"""Add user_activity.attempt_count for aggregated failed logins
+
+Revision ID: 4a8f2c6e1b57
+Revises: e7b3d91c5a20
+Create Date: 2026-10-19 16:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a8f2c6e1b57'
+down_revision = 'e7b3d91c5a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_activity') as batch_op:
+        batch_op.add_column(sa.Column('attempt_count', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user_activity') as batch_op:
+        batch_op.drop_column('attempt_count')
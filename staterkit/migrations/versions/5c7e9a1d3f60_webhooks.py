@@ -0,0 +1,60 @@
+"""Add webhook subscriptions and the delivery outbox
+
+Revision ID: 5c7e9a1d3f60
+Revises: a3e6c9f2b718
+Create Date: 2026-10-19 21:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7e9a1d3f60'
+down_revision = 'a3e6c9f2b718'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'webhook_subscription',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('secret', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('failure_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('retry_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('last_success_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_webhook_subscription_company_id', 'webhook_subscription', ['company_id'], unique=False)
+    op.create_table(
+        'webhook_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('subscription_id', sa.Integer(), nullable=False),
+        sa.Column('credential_id', sa.Integer(), nullable=False),
+        sa.Column('event', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['subscription_id'], ['webhook_subscription.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_webhook_outbox_queue', 'webhook_outbox', ['subscription_id', 'status', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_webhook_outbox_queue', table_name='webhook_outbox')
+    op.drop_table('webhook_outbox')
+    op.drop_index('ix_webhook_subscription_company_id', table_name='webhook_subscription')
+    op.drop_table('webhook_subscription')
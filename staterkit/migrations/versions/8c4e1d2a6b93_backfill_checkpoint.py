@@ -0,0 +1,32 @@
+"""Add backfill_checkpoint table for resumable data backfills
+
+Revision ID: 8c4e1d2a6b93
+Revises: 3f1a2b7c9d01
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e1d2a6b93'
+down_revision = '3f1a2b7c9d01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'backfill_checkpoint',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_key', sa.BigInteger(), nullable=False),
+        sa.Column('rows_changed', sa.BigInteger(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade():
+    op.drop_table('backfill_checkpoint')
@@ -0,0 +1,26 @@
+"""Add a lower(username) index for batch identity lookups
+
+Revision ID: 9b6d4e2f8a13
+Revises: 4a8f2c6e1b57
+Create Date: 2026-10-19 17:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b6d4e2f8a13'
+down_revision = '4a8f2c6e1b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /api/v1/identities/lookup joins lower(username) against a temp table of addresses
+    op.create_index('ix_breached_credential_username_lower', 'breached_credential',
+                    [sa.text('lower(username)')], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_breached_credential_username_lower', table_name='breached_credential', if_exists=True)
@@ -0,0 +1,40 @@
+"""Add change_log table for the credential change feed
+
+Revision ID: a3e6c9f2b718
+Revises: f2c8b5d9a146
+Create Date: 2026-10-19 18:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e6c9f2b718'
+down_revision = 'f2c8b5d9a146'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_log',
+        sa.Column('seq', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('credential_id', sa.Integer(), nullable=False),
+        sa.Column('op', sa.String(length=10), nullable=False),
+        sa.Column('domain', sa.String(length=200), nullable=True),
+        sa.Column('username', sa.String(length=200), nullable=True),
+        sa.Column('url', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index('ix_change_log_credential_id', 'change_log', ['credential_id'], unique=False)
+    # Sequence counter for change_log.seq (see cuba/changes.py)
+    data_version = sa.table('data_version', sa.column('scope', sa.String), sa.column('version', sa.BigInteger))
+    op.bulk_insert(data_version, [{'scope': 'change_log', 'version': 0}])
+
+
+def downgrade():
+    op.execute("DELETE FROM data_version WHERE scope = 'change_log'")
+    op.drop_index('ix_change_log_credential_id', table_name='change_log')
+    op.drop_table('change_log')
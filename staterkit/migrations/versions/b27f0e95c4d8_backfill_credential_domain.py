@@ -0,0 +1,33 @@
+"""Backfill breached_credential.domain from usernames (replaces fix_breached_creds_data.py)
+
+Runs the ``breached_credential_domain`` backfill in key-ranged chunks, each
+committed on its own, so the table is never locked for the whole update. If
+the upgrade is interrupted it resumes from the stored checkpoint; on very
+large tables it can also be run ahead of the deploy with
+``flask backfill run breached_credential_domain``.
+
+Revision ID: b27f0e95c4d8
+Revises: 8c4e1d2a6b93
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from alembic import op
+
+from cuba.backfill import run_backfill
+
+
+# revision identifiers, used by Alembic.
+revision = 'b27f0e95c4d8'
+down_revision = '8c4e1d2a6b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        run_backfill(op.get_bind(), 'breached_credential_domain')
+
+
+def downgrade():
+    # Data-only revision: derived domains are kept
+    pass
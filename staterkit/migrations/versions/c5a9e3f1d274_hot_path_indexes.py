@@ -0,0 +1,40 @@
+"""Add indexes for the hot list, analysis, watchlist and notification queries
+
+Revision ID: c5a9e3f1d274
+Revises: b27f0e95c4d8
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a9e3f1d274'
+down_revision = 'b27f0e95c4d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Credential lists are ordered by created_at and paginated; date filters are ranges on it
+    op.create_index('ix_breached_credential_created_at', 'breached_credential', ['created_at'],
+                    if_not_exists=True)
+    # Analysis groups by source and counts marked rows (few, so the index is selective)
+    op.create_index('ix_breached_credential_source', 'breached_credential', ['source'],
+                    if_not_exists=True)
+    op.create_index('ix_breached_credential_is_marked', 'breached_credential', ['is_marked'],
+                    if_not_exists=True)
+    # Every tenant-scoped request loads the company's watchlist
+    op.create_index('ix_watchlist_entry_company_id', 'watchlist_entry', ['company_id'],
+                    if_not_exists=True)
+    # Notification dropdown: one user's (unread) notifications, newest first, and the unread count
+    op.create_index('ix_notification_user_read_created', 'notification', ['user_id', 'is_read', 'created_at'],
+                    if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_notification_user_read_created', table_name='notification', if_exists=True)
+    op.drop_index('ix_watchlist_entry_company_id', table_name='watchlist_entry', if_exists=True)
+    op.drop_index('ix_breached_credential_is_marked', table_name='breached_credential', if_exists=True)
+    op.drop_index('ix_breached_credential_source', table_name='breached_credential', if_exists=True)
+    op.drop_index('ix_breached_credential_created_at', table_name='breached_credential', if_exists=True)
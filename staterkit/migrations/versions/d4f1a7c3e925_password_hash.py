@@ -0,0 +1,35 @@
+"""Add password_hash table for k-anonymity password range lookups
+
+Revision ID: d4f1a7c3e925
+Revises: 9b6d4e2f8a13
+Create Date: 2026-10-19 17:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f1a7c3e925'
+down_revision = '9b6d4e2f8a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'password_hash',
+        sa.Column('credential_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=8), nullable=False),
+        sa.Column('prefix', sa.String(length=5), nullable=False),
+        sa.Column('suffix', sa.String(length=35), nullable=False),
+        sa.ForeignKeyConstraint(['credential_id'], ['breached_credential.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('credential_id', 'kind'),
+    )
+    # /api/v1/range/<prefix> is one seek into this index plus a scan of the prefix
+    op.create_index('ix_password_hash_range', 'password_hash', ['kind', 'prefix', 'suffix'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_password_hash_range', table_name='password_hash')
+    op.drop_table('password_hash')
@@ -0,0 +1,31 @@
+"""Add data_version table for conditional GET ETags
+
+Revision ID: e7b3d91c5a20
+Revises: c5a9e3f1d274
+Create Date: 2026-10-19 15:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3d91c5a20'
+down_revision = 'c5a9e3f1d274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_version = op.create_table(
+        'data_version',
+        sa.Column('scope', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+    op.bulk_insert(data_version, [{'scope': 'tenant_data', 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('data_version')
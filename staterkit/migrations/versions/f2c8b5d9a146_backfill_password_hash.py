@@ -0,0 +1,31 @@
+"""Backfill password_hash from existing breached credentials
+
+Runs the ``password_hash`` backfill in key-ranged chunks. On large tables
+run ``flask backfill run password_hash`` ahead of the deploy; the upgrade
+then only resumes from the stored checkpoint.
+
+Revision ID: f2c8b5d9a146
+Revises: d4f1a7c3e925
+Create Date: 2026-10-19 17:45:00.000000
+
+"""
+from alembic import op
+
+from cuba.backfill import run_backfill
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8b5d9a146'
+down_revision = 'd4f1a7c3e925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        run_backfill(op.get_bind(), 'password_hash')
+
+
+def downgrade():
+    # Data-only revision: the table is dropped by the previous revision
+    pass
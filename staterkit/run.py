@@ -1,5 +1,6 @@
-from cuba import app
+from cuba import create_app
+
+app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True,port=8003) 
-
@@ -1,7 +1,8 @@
 """Test database after migration"""
-from cuba import app, db
+from cuba import create_app, db
 from cuba.models import User, Company, BreachedCredential
 
+app = create_app()
 with app.app_context():
     # Test user query
     user = User.query.filter_by(email='admin@dseclab.com').first()
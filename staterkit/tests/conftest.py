@@ -0,0 +1,79 @@
+"""
+Shared fixtures.
+
+The session app is built with ``create_app`` against a throwaway database.
+The schema comes from the Alembic revisions (not ``db.create_all()``) so
+tests see the same indexes as a migrated production database.
+"""
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import pytest
+
+_TEST_DIR = tempfile.mkdtemp(prefix='cuba-tests-')
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# Logins created by the data generator
+USERS = {
+    'admin': ('admin@dseclab.com', 'admin123'),
+    'member': ('analyst0@techcorp.com', 'admin123'),  # largest tenant
+    'tail_member': ('analyst0@corp00007.example', 'admin123'),  # small tenant
+}
+
+
+@pytest.fixture(scope='session')
+def app():
+    from flask_migrate import upgrade
+
+    from cuba import create_app, db
+    from cuba.services.datagen import DatasetSpec, generate_dataset
+
+    flask_app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}",
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+    })
+    with flask_app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        generate_dataset(DatasetSpec(companies=8, users_per_company=1, credentials=3000,
+                                     notifications_per_user=20, audit_rows=500, seed=11,
+                                     anchor=datetime(2026, 1, 1)))
+        db.session.remove()
+    yield flask_app
+    shutil.rmtree(_TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def login(app):
+    """Return a test client logged in as one of USERS."""
+    clients = {}
+
+    def _login(role):
+        if role not in clients:
+            client = app.test_client()
+            email, password = USERS[role]
+            response = client.post('/login', data={'email': email, 'password': password})
+            assert response.status_code == 302, f"login failed for {email}"
+            clients[role] = client
+        return clients[role]
+
+    return _login
+
+
+@pytest.fixture(scope='session')
+def api_headers(app):
+    """Return Authorization headers with an API token for one of USERS."""
+    tokens = {}
+
+    def _headers(role):
+        if role not in tokens:
+            email, password = USERS[role]
+            response = app.test_client().post('/api/auth/login', json={'email': email, 'password': password})
+            assert response.status_code == 200, f"API login failed for {email}"
+            tokens[role] = response.get_json()['access_token']
+        return {'Authorization': f'Bearer {tokens[role]}'}
+
+    return _headers
@@ -0,0 +1,128 @@
+"""
+JSON API (``/api/v1/breached-creds``): cursor pagination, field projection
+and tenant scoping.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, func, insert, or_, select
+
+from cuba import db
+from cuba.models import BreachedCredential
+
+LIST_URL = '/api/v1/breached-creds'
+
+
+@pytest.fixture
+def tied_rows(app):
+    """Rows sharing one created_at and rows without one: the cursor's tie-break and NULL branches."""
+    table = BreachedCredential.__table__
+    tied = datetime(2001, 1, 1)
+    rows = [{'username': f'tie{n}@ties.example', 'domain': 'ties.example', 'created_by': 1, 'created_at': tied}
+            for n in range(5)]
+    rows += [{'username': f'undated{n}@ties.example', 'domain': 'ties.example', 'created_by': 1, 'created_at': None}
+             for n in range(3)]
+    with app.app_context():
+        db.session.execute(insert(table), rows)
+        db.session.commit()
+    yield
+    with app.app_context():
+        db.session.execute(delete(table).where(table.c.domain == 'ties.example'))
+        db.session.commit()
+
+
+def _walk(client, headers, limit, **params):
+    """Every item of a listing, following next_cursor; returns (items, pages)."""
+    items, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, limit=limit, **({'cursor': cursor} if cursor else {}))
+        response = client.get(LIST_URL, query_string=query, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        assert body['count'] == len(body['items']) <= limit
+        items += body['items']
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            return items, pages
+
+
+def _before(a, b):
+    """Whether ``a`` sorts before ``b``: created_at DESC with NULLs last, then id DESC."""
+    if a['created_at'] == b['created_at']:
+        return a['id'] > b['id']
+    if a['created_at'] is None or b['created_at'] is None:
+        return b['created_at'] is None
+    return datetime.fromisoformat(a['created_at']) > datetime.fromisoformat(b['created_at'])
+
+
+def test_cursor_pagination_returns_every_row_once_in_order(app, api_headers, tied_rows):
+    items, pages = _walk(app.test_client(), api_headers('admin'), 250, fields='id,created_at')
+    with app.app_context():
+        total = db.session.execute(select(func.count(BreachedCredential.id))).scalar()
+
+    ids = [item['id'] for item in items]
+    assert len(ids) == len(set(ids)) == total
+    assert pages == -(-total // 250)
+    assert all(_before(a, b) for a, b in zip(items, items[1:]))
+    assert [item['created_at'] for item in items[-3:]] == [None] * 3
+
+
+def test_cursor_pages_through_ties_and_nulls_one_row_at_a_time(app, api_headers, tied_rows):
+    items, _ = _walk(app.test_client(), api_headers('admin'), 1, fields='id,created_at', domain='ties.example')
+    assert [item['created_at'] for item in items] == ['2001-01-01T00:00:00'] * 5 + [None] * 3
+    assert [item['id'] for item in items] == sorted((item['id'] for item in items[:5]), reverse=True) + \
+        sorted((item['id'] for item in items[5:]), reverse=True)
+
+
+def test_invalid_cursor_is_rejected(app, api_headers):
+    response = app.test_client().get(LIST_URL, query_string={'cursor': 'not-a-cursor'}, headers=api_headers('admin'))
+    assert response.status_code == 400
+
+
+def test_fields_limit_the_payload(app, api_headers):
+    client = app.test_client()
+    headers = api_headers('admin')
+
+    item = client.get(LIST_URL, query_string={'fields': 'id,username', 'limit': 1},
+                      headers=headers).get_json()['items'][0]
+    assert set(item) == {'id', 'username'}
+
+    default = client.get(LIST_URL, query_string={'limit': 1}, headers=headers).get_json()['items'][0]
+    assert 'password' not in default and 'id' in default
+
+    detail = client.get(f"{LIST_URL}/{item['id']}", query_string={'fields': 'domain'}, headers=headers).get_json()
+    assert set(detail['item']) == {'domain'}
+
+    response = client.get(LIST_URL, query_string={'fields': 'id,secret'}, headers=headers)
+    assert response.status_code == 400
+    assert 'secret' in response.get_json()['error']
+
+
+def test_member_sees_only_their_tenant(app, api_headers):
+    client = app.test_client()
+    headers = api_headers('member')
+    items, _ = _walk(client, headers, 500, fields='id')
+
+    # Every techcorp.com watchlist entry contains 'techcorp.com'
+    with app.app_context():
+        in_scope = set(db.session.execute(select(BreachedCredential.id).where(or_(
+            BreachedCredential.domain.ilike('%techcorp.com%'),
+            BreachedCredential.username.ilike('%techcorp.com%'),
+            BreachedCredential.url.ilike('%techcorp.com%'),
+        ))).scalars())
+        outside = db.session.execute(select(BreachedCredential.id).where(
+            BreachedCredential.id.notin_(in_scope)).limit(1)).scalar()
+
+    assert in_scope and {item['id'] for item in items} == in_scope
+    assert client.get(f'{LIST_URL}/{outside}', headers=headers).status_code == 404
+    assert client.get(f'{LIST_URL}/{outside}', headers=api_headers('admin')).status_code == 200
+
+    stats = client.get(f'{LIST_URL}/stats', headers=headers).get_json()
+    assert stats['total'] == len(in_scope)
+
+
+@pytest.mark.parametrize('url', [LIST_URL, f'{LIST_URL}/1', f'{LIST_URL}/stats', f'{LIST_URL}/facets'])
+def test_requests_without_a_token_are_rejected(app, url):
+    response = app.test_client().get(url)
+    assert response.status_code == 401
@@ -0,0 +1,154 @@
+"""
+Resumable backfills and the legacy-schema rebuild in the baseline revision.
+
+The framework tests run a throwaway backfill against their own SQLite file,
+so checkpoints and key ranges do not depend on the session dataset.
+"""
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from cuba.backfill import BACKFILLS, register_backfill, run_backfill
+
+from .conftest import MIGRATIONS_DIR, _TEST_DIR
+
+
+@pytest.fixture
+def backfill_engine(tmp_path):
+    """25 rows with an empty ``doubled`` column and a registered ``test_doubled`` backfill."""
+    from cuba.models import BackfillCheckpoint
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    BackfillCheckpoint.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE sample (id INTEGER PRIMARY KEY, value INTEGER, doubled INTEGER)"))
+        connection.execute(text("INSERT INTO sample (id, value) VALUES (:id, :id)"),
+                           [{'id': n} for n in range(1, 26)])
+
+    calls = []
+
+    @register_backfill('test_doubled', table='sample', chunk_size=10, pause=0)
+    def doubled(connection, lower, upper):
+        calls.append((lower, upper))
+        return connection.execute(text("UPDATE sample SET doubled = value * 2 "
+                                       "WHERE id > :lower AND id <= :upper AND doubled IS NULL"),
+                                  {'lower': lower, 'upper': upper}).rowcount
+
+    engine.calls = calls
+    yield engine
+    BACKFILLS.pop('test_doubled', None)
+    engine.dispose()
+
+
+def _checkpoint(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT last_key, rows_changed, completed_at FROM backfill_checkpoint "
+                                       "WHERE name = 'test_doubled'")).one()
+
+
+def test_backfill_walks_the_table_in_chunks(backfill_engine):
+    progress = []
+    with backfill_engine.connect() as connection:
+        result = run_backfill(connection, 'test_doubled', progress=lambda *args: progress.append(args))
+
+    assert (result.chunks, result.rows_changed, result.last_key, result.completed) == (3, 25, 25, True)
+    assert backfill_engine.calls == [(0, 10), (10, 20), (20, 25)]
+    assert progress == [(10, 25, 10), (20, 25, 20), (25, 25, 25)]
+    last_key, rows_changed, completed_at = _checkpoint(backfill_engine)
+    assert (last_key, rows_changed) == (25, 25) and completed_at is not None
+    with backfill_engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM sample WHERE doubled = value * 2")).scalar() == 25
+
+
+def test_backfill_resumes_from_the_checkpoint(backfill_engine):
+    with backfill_engine.connect() as connection:
+        first = run_backfill(connection, 'test_doubled', max_chunks=1)
+    assert (first.chunks, first.rows_changed, first.last_key, first.completed) == (1, 10, 10, False)
+    last_key, rows_changed, completed_at = _checkpoint(backfill_engine)
+    assert (last_key, rows_changed, completed_at) == (10, 10, None)
+
+    with backfill_engine.connect() as connection:
+        second = run_backfill(connection, 'test_doubled')
+    assert (second.chunks, second.rows_changed, second.completed) == (2, 15, True)
+    assert backfill_engine.calls == [(0, 10), (10, 20), (20, 25)]  # The first chunk is not repeated
+    assert _checkpoint(backfill_engine)[:2] == (25, 25)
+
+    with backfill_engine.connect() as connection:
+        assert run_backfill(connection, 'test_doubled').chunks == 0  # Completed: nothing left
+
+
+def test_backfill_restart_ignores_the_checkpoint(backfill_engine):
+    with backfill_engine.connect() as connection:
+        run_backfill(connection, 'test_doubled')
+        connection.execute(text("UPDATE sample SET doubled = NULL WHERE id IN (3, 17)"))
+        connection.commit()
+        result = run_backfill(connection, 'test_doubled', restart=True)
+
+    assert (result.chunks, result.rows_changed, result.completed) == (3, 2, True)
+    assert backfill_engine.calls == [(0, 10), (10, 20), (20, 25)] * 2
+    assert _checkpoint(backfill_engine)[:2] == (25, 2)  # Counts restart from zero
+
+
+def test_backfill_cli_max_chunks_then_restart(app):
+    from cuba import db
+
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(text("DELETE FROM backfill_checkpoint WHERE name = 'breached_credential_domain'"))
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['backfill', 'run', 'breached_credential_domain',
+                                 '--chunk-size', '1000', '--pause', '0', '--max-chunks', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'paused: 1 chunks' in result.output
+
+    result = runner.invoke(args=['backfill', 'run', 'breached_credential_domain', '--chunk-size', '1000',
+                                 '--pause', '0'])
+    assert result.exit_code == 0, result.output
+    assert 'completed' in result.output
+    assert 'key 1000/' not in result.output  # Resumed after the first chunk
+
+    result = runner.invoke(args=['backfill', 'run', 'breached_credential_domain', '--chunk-size', '1000',
+                                 '--pause', '0', '--restart'])
+    assert result.exit_code == 0, result.output
+    assert 'key 1000/' in result.output and 'completed' in result.output
+
+    result = runner.invoke(args=['backfill', 'list'])
+    assert 'breached_credential_domain: completed' in result.output
+
+
+def test_baseline_maps_legacy_severity_to_type():
+    from flask_migrate import upgrade
+
+    from cuba import create_app
+
+    path = os.path.join(_TEST_DIR, 'legacy.db')
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE breached_credential (id INTEGER PRIMARY KEY, username VARCHAR(200), "
+                   "email_domain VARCHAR(200), severity VARCHAR(20), application VARCHAR(200), "
+                   "source VARCHAR(200), created_by INTEGER NOT NULL, created_at DATETIME)")
+    legacy.execute("CREATE INDEX ix_breached_credential_username ON breached_credential (username)")
+    legacy.executemany("INSERT INTO breached_credential (id, username, email_domain, severity, created_by) "
+                       "VALUES (?, ?, ?, ?, 1)",
+                       [(1, 'a@one.example', 'one.example', 'critical'),
+                        (2, 'b@two.example', 'two.example', 'high'),
+                        (3, 'c@three.example', 'three.example', 'medium'),
+                        (4, 'd@four.example', 'four.example', 'low'),
+                        (5, 'e@five.example', None, None)])
+    legacy.commit()
+    legacy.close()
+
+    legacy_app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'TESTING': True})
+    with legacy_app.app_context():
+        upgrade(directory=MIGRATIONS_DIR, revision='3f1a2b7c9d01')
+
+    migrated = sqlite3.connect(path)
+    rows = migrated.execute("SELECT id, type, domain, username FROM breached_credential ORDER BY id").fetchall()
+    migrated.close()
+    assert rows == [(1, 'stealer', 'one.example', 'a@one.example'),
+                    (2, 'malware', 'two.example', 'b@two.example'),
+                    (3, 'combolist', 'three.example', 'c@three.example'),
+                    (4, 'combolist', 'four.example', 'd@four.example'),
+                    (5, 'combolist', None, 'e@five.example')]
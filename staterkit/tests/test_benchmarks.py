@@ -0,0 +1,19 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+import pytest
+
+from benchmarks.worker import percentile
+
+
+@pytest.mark.parametrize('samples, pct, expected', [
+    (list(range(1, 21)), 95, 19),
+    (list(range(1, 21)), 50, 10),
+    (list(range(1, 11)), 95, 10),
+    (list(range(1, 101)), 99, 99),
+    (list(range(1, 5)), 25, 1),
+    ([7, 3, 5], 50, 5),
+    ([4], 99, 4),
+])
+def test_percentile_is_nearest_rank(samples, pct, expected):
+    assert percentile(samples, pct) == expected
@@ -0,0 +1,145 @@
+"""
+Bloom filter of breached usernames: no false negatives.
+
+Each test builds its own filter file and points the app at it, so the
+repository's instance folder is never written.
+"""
+import os
+import threading
+import time
+
+import pytest
+from sqlalchemy import select
+
+from cuba import db
+from cuba.bloom import BloomFilter, IdentityFilter
+from cuba.models import BreachedCredential, PasswordHash
+from cuba.services.identity_lookup import build_identity_filter, normalize_identity
+
+
+@pytest.fixture
+def bloom_path(app, tmp_path, monkeypatch):
+    path = str(tmp_path / 'identity_bloom.bin')
+    monkeypatch.setitem(app.config, 'BLOOM_FILTER_PATH', path)
+    monkeypatch.setitem(app.extensions, 'identity_filter', IdentityFilter(path))
+    yield path
+
+
+def _build(app, path, **kwargs):
+    with app.app_context():
+        with db.engine.connect() as connection:
+            return build_identity_filter(connection, path, **kwargs)
+
+
+def _missing(app, path, usernames=None):
+    """Usernames (default: every stored one) the filter file claims were never breached."""
+    if usernames is None:
+        with app.app_context():
+            usernames = db.session.execute(select(BreachedCredential.username)).scalars().all()
+    bloom = BloomFilter(path)
+    try:
+        return [name for name in usernames if name and normalize_identity(name) not in bloom]
+    finally:
+        bloom.close()
+
+
+def _delete_usernames(app, pattern):
+    with app.app_context():
+        ids = select(BreachedCredential.id).where(BreachedCredential.username.like(pattern))
+        PasswordHash.query.filter(PasswordHash.credential_id.in_(ids)).delete(synchronize_session=False)
+        BreachedCredential.query.filter(BreachedCredential.username.like(pattern)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_rebuilt_filter_has_every_username(app, bloom_path):
+    stats = _build(app, bloom_path, chunk_size=700)
+    assert stats['items'] > 0
+    assert _missing(app, bloom_path) == []
+    never = [f'never-breached-{n}@nowhere.example' for n in range(2000)]
+    assert len(_missing(app, bloom_path, never)) > 1900  # 0.1% target rate
+
+
+def test_ingested_usernames_are_added(app, api_headers, bloom_path):
+    from cuba.services.ingest import bulk_insert_credentials
+
+    _build(app, bloom_path)
+    usernames = [f'Bloom.Ingest{n}@Techcorp.com' for n in range(50)]
+    try:
+        with app.app_context():
+            bulk_insert_credentials([{'username': name, 'password': 'x'} for name in usernames], created_by=1)
+        assert _missing(app, bloom_path, usernames) == []
+
+        response = app.test_client().get(f'/api/v1/identities/{usernames[0]}', headers=api_headers('admin'))
+        assert response.get_json()['breached'] is True
+    finally:
+        _delete_usernames(app, 'Bloom.Ingest%')
+
+
+def test_rebuild_keeps_usernames_added_by_a_concurrent_writer(app, bloom_path):
+    """
+    A writer adds its username to the old file and commits only after the
+    rebuild has replaced it; the rebuild must still pick the row up.
+    """
+    from cuba.changes import lock_sequence
+    from cuba.services.identity_lookup import record_identities
+
+    _build(app, bloom_path)
+    old_inode = os.stat(bloom_path).st_ino
+    added = threading.Event()
+    errors = []
+
+    def writer():
+        try:
+            with app.app_context():
+                lock_sequence()
+                db.session.add(BreachedCredential(username='bloom.concurrent@techcorp.com', created_by=1))
+                db.session.flush()
+                record_identities(['bloom.concurrent@techcorp.com'])
+                added.set()
+                while os.stat(bloom_path).st_ino == old_inode:
+                    time.sleep(0.01)
+                time.sleep(0.2)  # The rebuild's catch-up runs meanwhile
+                db.session.commit()
+        except Exception as error:  # Surfaced by the assertion below
+            errors.append(error)
+            added.set()
+
+    thread = threading.Thread(target=writer)
+
+    def progress(last_key, max_key):
+        if not thread.is_alive() and not added.is_set():
+            thread.start()
+            assert added.wait(5)
+
+    try:
+        _build(app, bloom_path, chunk_size=1000, progress=progress)
+        thread.join(10)
+        assert errors == []
+        assert _missing(app, bloom_path, ['bloom.concurrent@techcorp.com']) == []
+        assert _missing(app, bloom_path) == []
+    finally:
+        thread.join(10)
+        _delete_usernames(app, 'bloom.concurrent@%')
+
+
+def test_rebuild_keeps_usernames_edited_during_the_scan(app, login, bloom_path):
+    """An edit commits after its row's chunk was scanned; its new username went to the old file."""
+    admin = login('admin')
+    admin.post('/threat-intelligence/breached-creds/add',
+               data={'username': 'bloom.before@techcorp.com', 'password': 'x', 'type': 'combolist'})
+    with app.app_context():
+        credential_id = BreachedCredential.query.filter_by(username='bloom.before@techcorp.com').one().id
+    _build(app, bloom_path)
+
+    def progress(last_key, max_key):
+        if last_key == max_key:  # Every chunk, including the edited row's, has been read
+            admin.post(f'/threat-intelligence/breached-creds/{credential_id}/edit',
+                       data={'username': 'bloom.after@techcorp.com', 'password': 'x', 'type': 'combolist'})
+
+    try:
+        _build(app, bloom_path, chunk_size=1000, progress=progress)
+        with app.app_context():
+            assert db.session.get(BreachedCredential, credential_id).username == 'bloom.after@techcorp.com'
+        assert _missing(app, bloom_path, ['bloom.after@techcorp.com']) == []
+    finally:
+        _delete_usernames(app, 'bloom.%@techcorp.com')
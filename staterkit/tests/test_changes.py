@@ -0,0 +1,144 @@
+"""
+Change feed (``/api/v1/changes``): sequence order and tenant scope changes.
+
+Writes go through the HTML forms, like a user's would. Each test reads the
+feed from the sequence number it started at, so earlier writes by other
+tests do not matter.
+"""
+import pytest
+from sqlalchemy import select
+
+from cuba import db
+from cuba.models import BreachedCredential, PasswordHash
+
+CHANGES_URL = '/api/v1/changes'
+ADD_URL = '/threat-intelligence/breached-creds/add'
+
+
+def _feed(app, headers, since, limit=1000):
+    response = app.test_client().get(CHANGES_URL, query_string={'since': since, 'limit': limit}, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _raw(app, headers, since):
+    """Every change after ``since`` one batch (of one) at a time, so none are collapsed."""
+    changes = []
+    while True:
+        body = _feed(app, headers, since, limit=1)
+        changes += body['changes']
+        if not body['has_more']:
+            return changes
+        since = body['next_since']
+
+
+def _add(app, admin, username):
+    admin.post(ADD_URL, data={'username': username, 'password': 'x', 'type': 'combolist'})
+    with app.app_context():
+        return BreachedCredential.query.filter_by(username=username).one().id
+
+
+def _edit(admin, credential_id, username):
+    admin.post(f'/threat-intelligence/breached-creds/{credential_id}/edit',
+               data={'username': username, 'password': 'x', 'type': 'combolist'})
+
+
+@pytest.fixture
+def cleanup(app):
+    """Delete the credentials a test created (by username pattern)."""
+    patterns = []
+    yield patterns.append
+    with app.app_context():
+        for pattern in patterns:
+            created = BreachedCredential.username.like(pattern)
+            PasswordHash.query.filter(PasswordHash.credential_id.in_(
+                select(BreachedCredential.id).where(created))).delete(synchronize_session=False)
+            BreachedCredential.query.filter(created).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_changes_come_back_in_sequence_order(app, login, api_headers, cleanup):
+    cleanup('feed.order%')
+    admin, headers = login('admin'), api_headers('admin')
+    start = _feed(app, headers, 0, limit=1)['latest']
+
+    first = _add(app, admin, 'feed.order1@order.example')
+    second = _add(app, admin, 'feed.order2@order.example')
+    _edit(admin, first, 'feed.order1@order.example')  # Same scope values: a plain update
+    admin.post(f'/threat-intelligence/breached-creds/{second}/mark')
+    admin.post(f'/threat-intelligence/breached-creds/{first}/delete')
+
+    raw = _raw(app, headers, start)
+    assert [change['seq'] for change in raw] == list(range(start + 1, start + 6))
+    assert [(change['op'], change['id']) for change in raw] == [
+        ('insert', first), ('insert', second), ('update', first), ('mark', second), ('delete', first)]
+
+    # One batch keeps each credential's newest change, in sequence order
+    body = _feed(app, headers, start)
+    assert [(change['op'], change['id']) for change in body['changes']] == [('mark', second), ('delete', first)]
+    assert body['changes'][0]['item']['is_marked'] is True
+    assert body['changes'][1]['item'] is None
+    assert body['next_since'] == body['latest'] == start + 5 and body['has_more'] is False
+    assert _feed(app, headers, body['next_since'])['changes'] == []
+
+
+def test_ingest_gets_consecutive_sequence_numbers(app, api_headers, cleanup):
+    from cuba.services.ingest import bulk_insert_credentials
+
+    cleanup('feed.ingest%')
+    headers = api_headers('admin')
+    start = _feed(app, headers, 0, limit=1)['latest']
+    with app.app_context():
+        bulk_insert_credentials([{'username': f'feed.ingest{n}@ingest.example', 'password': 'x'}
+                                 for n in range(20)], created_by=1)
+
+    body = _feed(app, headers, start)
+    assert [change['seq'] for change in body['changes']] == list(range(start + 1, start + 21))
+    assert sorted(change['item']['username'] for change in body['changes']) == \
+        sorted(f'feed.ingest{n}@ingest.example' for n in range(20))
+    assert [change['id'] for change in body['changes']] == sorted(change['id'] for change in body['changes'])
+
+
+def test_edit_out_of_scope_emits_a_delete_for_the_old_tenant(app, login, api_headers, cleanup):
+    cleanup('feed.scope%')
+    admin, admin_headers, member_headers = login('admin'), api_headers('admin'), api_headers('member')
+
+    start = _feed(app, admin_headers, 0, limit=1)['latest']
+    credential_id = _add(app, admin, 'feed.scope@techcorp.com')
+    [inserted] = _feed(app, member_headers, start)['changes']
+    assert (inserted['op'], inserted['id']) == ('insert', credential_id)
+    assert inserted['item']['username'] == 'feed.scope@techcorp.com'
+
+    moved = _feed(app, admin_headers, 0, limit=1)['latest']
+    _edit(admin, credential_id, 'feed.scope@elsewhere.example')
+
+    # The old values are logged as a delete before the update
+    assert [(change['op'], change['id']) for change in _raw(app, admin_headers, moved)] == [
+        ('delete', credential_id), ('update', credential_id)]
+    # The member only sees the delete; the update is out of their scope
+    member = _feed(app, member_headers, moved)
+    assert [(change['op'], change['id'], change['item']) for change in member['changes']] == [
+        ('delete', credential_id, None)]
+    assert member['next_since'] == moved + 1
+
+    # Moving it back logs a delete of the outside values (not theirs) and an update the member sees
+    back = _feed(app, admin_headers, 0, limit=1)['latest']
+    _edit(admin, credential_id, 'feed.scope@techcorp.com')
+    [returned] = _feed(app, member_headers, back)['changes']
+    assert returned['op'] == 'update' and returned['item']['username'] == 'feed.scope@techcorp.com'
+
+
+def test_edit_within_scope_logs_a_single_update(app, login, api_headers, cleanup):
+    cleanup('feed.same%')
+    admin, headers = login('admin'), api_headers('admin')
+    credential_id = _add(app, admin, 'feed.same@techcorp.com')
+    start = _feed(app, headers, 0, limit=1)['latest']
+
+    admin.post(f'/threat-intelligence/breached-creds/{credential_id}/edit',
+               data={'username': 'feed.same@techcorp.com', 'password': 'changed', 'type': 'stealer'})
+    assert [(change['op'], change['id']) for change in _raw(app, headers, start)] == [('update', credential_id)]
+
+
+def test_invalid_since_is_rejected(app, api_headers):
+    response = app.test_client().get(CHANGES_URL, query_string={'since': '-1'}, headers=api_headers('admin'))
+    assert response.status_code == 400
@@ -0,0 +1,127 @@
+"""
+Conditional GET: ETag / 304 for search, notifications and the dashboard,
+and ETag changes after credential writes.
+"""
+import re
+
+import pytest
+from sqlalchemy import insert, select
+
+from cuba import db
+from cuba.models import BreachedCredential, PasswordHash
+
+from .conftest import USERS
+
+SEARCH_URL = '/api/search?q=techcorp'
+
+
+@pytest.fixture
+def member_client(app):
+    """A fresh member session: the dashboard is never conditional while flashes are pending."""
+    client = app.test_client()
+    email, password = USERS['member']
+    assert client.post('/login', data={'email': email, 'password': password}).status_code == 302
+    client.get('/')  # Consume the login flash
+    return client
+
+
+@pytest.fixture
+def cleanup(app):
+    patterns = []
+    yield patterns.append
+    with app.app_context():
+        for pattern in patterns:
+            created = BreachedCredential.username.like(pattern)
+            PasswordHash.query.filter(PasswordHash.credential_id.in_(
+                select(BreachedCredential.id).where(created))).delete(synchronize_session=False)
+            BreachedCredential.query.filter(created).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _queries(response):
+    return int(re.search(r'desc="(\d+) queries"', response.headers['Server-Timing']).group(1))
+
+
+@pytest.mark.parametrize('url', [SEARCH_URL, '/api/notifications', '/'])
+def test_matching_etag_gets_304(member_client, url):
+    first = member_client.get(url)
+    assert first.status_code == 200
+    etag = first.headers['ETag'].strip('"')
+    assert 'private' in first.headers['Cache-Control'] and 'no-cache' in first.headers['Cache-Control']
+
+    cached = member_client.get(url, headers={'If-None-Match': f'"{etag}"'})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'].strip('"') == etag
+    assert _queries(cached) < _queries(first)
+
+    assert member_client.get(url, headers={'If-None-Match': '"stale"'}).status_code == 200
+
+
+def test_etags_differ_per_query_and_user(app, login, member_client):
+    member = member_client.get(SEARCH_URL).headers['ETag']
+    assert member_client.get('/api/search?q=corp').headers['ETag'] != member
+    assert login('admin').get(SEARCH_URL).headers['ETag'] != member
+
+
+def _revalidate(client, etag):
+    """Status and ETag of a search revalidation."""
+    response = client.get(SEARCH_URL, headers={'If-None-Match': etag})
+    return response.status_code, response.headers['ETag']
+
+
+def test_form_add_changes_the_etag(app, login, member_client, cleanup):
+    cleanup('etag.form%')
+    etag = member_client.get(SEARCH_URL).headers['ETag']
+    login('admin').post('/threat-intelligence/breached-creds/add',
+                        data={'username': 'etag.form@techcorp.com', 'password': 'x', 'type': 'combolist'})
+    status, new_etag = _revalidate(member_client, etag)
+    assert status == 200 and new_etag != etag
+
+
+def test_bulk_ingest_changes_the_etag(app, member_client, cleanup):
+    from cuba.services.ingest import bulk_insert_credentials
+
+    cleanup('etag.ingest%')
+    etag = member_client.get(SEARCH_URL).headers['ETag']
+    with app.app_context():
+        bulk_insert_credentials([{'username': f'etag.ingest{n}@techcorp.com', 'password': 'x'} for n in range(3)],
+                                created_by=1)
+    status, new_etag = _revalidate(member_client, etag)
+    assert status == 200 and new_etag != etag
+
+
+def test_backfill_changes_the_etag(app, member_client, cleanup):
+    cleanup('etag.backfill%')
+    with app.app_context():
+        # A raw insert bypasses the application's writers: nothing is bumped yet
+        db.session.execute(insert(BreachedCredential), [{'username': 'etag.backfill@techcorp.com', 'created_by': 1}])
+        db.session.commit()
+    etag = member_client.get(SEARCH_URL).headers['ETag']
+    assert _revalidate(member_client, etag)[0] == 304
+
+    result = app.test_cli_runner().invoke(args=['backfill', 'run', 'breached_credential_domain',
+                                                '--restart', '--pause', '0'])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        assert db.session.execute(select(BreachedCredential.domain).where(
+            BreachedCredential.username == 'etag.backfill@techcorp.com')).scalar() == 'techcorp.com'
+    status, new_etag = _revalidate(member_client, etag)
+    assert status == 200 and new_etag != etag
+
+
+def test_new_and_read_notifications_change_their_etag(app, member_client):
+    from cuba.models import Notification, User
+
+    etag = member_client.get('/api/notifications').headers['ETag']
+    with app.app_context():
+        user_id = User.query.filter_by(email=USERS['member'][0]).one().id
+        db.session.add(Notification(user_id=user_id, title='ETag probe', notification_type='info'))
+        db.session.commit()
+    response = member_client.get('/api/notifications', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+    etag = response.headers['ETag']
+    member_client.post('/api/notifications/mark-all-read')
+    response = member_client.get('/api/notifications', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
@@ -0,0 +1,46 @@
+"""
+Synthetic dataset generator: transactions and derived tables.
+"""
+import sqlite3
+
+from sqlalchemy import event
+
+
+def test_every_commit_covers_its_credentials_in_the_derived_tables(tmp_path):
+    from flask_migrate import upgrade
+
+    from cuba import create_app, db
+    from cuba.services.datagen import DatasetSpec, generate_dataset
+
+    from .conftest import MIGRATIONS_DIR
+
+    path = tmp_path / 'datagen.db'
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'TESTING': True})
+    snapshots = []
+
+    def committed_state(*args):
+        # Runs before each commit, so it sees what the previous commit published
+        reader = sqlite3.connect(path)
+        try:
+            snapshots.append(reader.execute(
+                "SELECT (SELECT COUNT(*) FROM breached_credential), "
+                "(SELECT COUNT(*) FROM change_log WHERE op = 'insert'), "
+                "(SELECT COUNT(DISTINCT credential_id) FROM password_hash), "
+                "(SELECT COUNT(*) FROM breached_credential WHERE password IS NOT NULL)").fetchone())
+        finally:
+            reader.close()
+
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        event.listen(db.engine, 'commit', committed_state)
+        counts = generate_dataset(DatasetSpec(companies=3, users_per_company=1, credentials=1000,
+                                              notifications_per_user=1, audit_rows=10, seed=5,
+                                              batch_size=100, commit_every=250))
+        event.remove(db.engine, 'commit', committed_state)
+    committed_state()
+
+    assert counts['breached_credential'] == 1000
+    assert len({credentials for credentials, *_ in snapshots if 0 < credentials < 1000}) >= 3  # Several commits
+    for credentials, logged, indexed, with_password in snapshots:
+        assert logged == credentials
+        assert indexed == with_password
@@ -0,0 +1,171 @@
+"""
+SIEM forwarder against local syslog listeners.
+
+A TCP and a UDP listener on 127.0.0.1 stand in for the SIEM. The tests check
+the wire format (RFC 5424 header, CEF or JSON), that batches share one TCP
+connection, and that events survive an unreachable destination through the
+disk spool.
+"""
+import json
+import socket
+import socketserver
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from cuba.forwarder import FileTransport, Forwarder, Spool, TcpTransport, UdpTransport, credential_event
+
+
+class _Listener:
+    """Collects newline-framed lines (TCP) or datagrams (UDP) in a background thread."""
+
+    def __init__(self, kind='tcp', port=0):
+        self.lines = []
+        self.connections = 0
+        listener = self
+
+        class TcpHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                listener.connections += 1
+                for raw in self.rfile:
+                    listener.lines.append(raw.decode('utf-8').rstrip('\n'))
+
+        class UdpHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                listener.lines.append(self.request[0].decode('utf-8'))
+
+        if kind == 'tcp':
+            server_class = type('Server', (socketserver.ThreadingTCPServer,),
+                                {'allow_reuse_address': True, 'daemon_threads': True})
+            self.server = server_class(('127.0.0.1', port), TcpHandler)
+        else:
+            self.server = socketserver.UDPServer(('127.0.0.1', port), UdpHandler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def wait_for(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(self.lines) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.lines
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _event(n, **overrides):
+    event = {
+        'id': n, 'username': f'user{n}@techcorp.com', 'domain': 'techcorp.com',
+        'url': 'https://login.techcorp.com', 'source': 'Stealer Logs', 'type': 'stealer',
+        'company_id': 1, 'created_at': datetime(2026, 1, 1, 12, 0, 0),
+    }
+    event.update(overrides)
+    return credential_event(event)
+
+
+@pytest.fixture
+def tcp_listener():
+    listener = _Listener('tcp')
+    yield listener
+    listener.close()
+
+
+def test_tcp_cef_batches_share_one_connection(tcp_listener, tmp_path):
+    forwarder = Forwarder(TcpTransport('127.0.0.1', tcp_listener.port), Spool(str(tmp_path)), fmt='cef')
+    forwarder.submit(_event(n) for n in range(50))
+    forwarder.submit([_event(99, username='a=b|c\\d')])
+    assert forwarder.flush(timeout=5)
+    lines = tcp_listener.wait_for(51)
+    forwarder.close()
+
+    assert len(lines) == 51
+    assert tcp_listener.connections == 1
+    header, _, message = lines[0].partition(' - ')
+    assert header.startswith('<84>1 2026-01-01T12:00:00.000Z ')
+    assert message.startswith('CEF:0|DSecLab|Cuba Threat Intelligence|1.0|breached-credential|')
+    assert '|9|' in message  # stealer severity
+    assert 'suser=user0@techcorp.com' in message and 'cs1=Stealer Logs' in message
+    assert 'password' not in message
+    # Extension values escape '=' and '\'
+    assert 'suser=a\\=b|c\\\\d ' in lines[-1]
+    assert forwarder.stats['sent'] == 51 and not forwarder.spool.pending()
+
+
+def test_udp_json(tmp_path):
+    listener = _Listener('udp')
+    try:
+        forwarder = Forwarder(UdpTransport('127.0.0.1', listener.port), Spool(str(tmp_path)), fmt='json')
+        forwarder.submit([_event(1), _event(2, type='combolist')])
+        assert forwarder.flush(timeout=5)
+        lines = listener.wait_for(2)
+        forwarder.close()
+    finally:
+        listener.close()
+
+    payloads = sorted((json.loads(line.partition(' - ')[2]) for line in lines), key=lambda p: p['id'])
+    assert [p['id'] for p in payloads] == [1, 2]
+    assert payloads[1]['type'] == 'combolist'
+    assert payloads[0]['event'] == 'breached-credential'
+    assert payloads[0]['created_at'] == '2026-01-01T12:00:00+00:00'
+
+
+def test_unreachable_destination_spools_then_replays(tmp_path):
+    port = _free_port()
+    forwarder = Forwarder(TcpTransport('127.0.0.1', port, timeout=1), Spool(str(tmp_path)),
+                          retry_interval=60)
+    forwarder.submit(_event(n) for n in range(10))
+    assert forwarder.flush(timeout=5)
+    assert forwarder.stats['spooled'] == 10
+    assert forwarder.spool.size()['files'] == 1
+
+    listener = _Listener('tcp', port=port)
+    try:
+        assert forwarder.replay_spool() == 10
+        lines = listener.wait_for(10)
+        forwarder.close()
+    finally:
+        listener.close()
+    assert sorted(int(line.split('externalId=')[1].split()[0]) for line in lines) == list(range(10))
+    assert forwarder.spool.pending() == []
+
+
+def test_full_queue_spills_to_spool_instead_of_blocking(tmp_path, monkeypatch):
+    forwarder = Forwarder(FileTransport(str(tmp_path / 'out.log')), Spool(str(tmp_path / 'spool')),
+                          queue_size=3)
+    monkeypatch.setattr(forwarder, '_ensure_started', lambda: None)  # Nothing drains the queue
+
+    started = time.perf_counter()
+    forwarder.submit(_event(n) for n in range(10))
+    assert time.perf_counter() - started < 1
+    assert forwarder.stats['queued'] == 3 and forwarder.stats['spooled'] == 7
+
+    forwarder.replay_spool()
+    assert len((tmp_path / 'out.log').read_text().splitlines()) == 7
+
+
+def test_ingest_forwards_only_tenant_matches(app, tmp_path, tcp_listener, monkeypatch):
+    from cuba.services.ingest import bulk_insert_credentials
+
+    forwarder = Forwarder(TcpTransport('127.0.0.1', tcp_listener.port), Spool(str(tmp_path)))
+    monkeypatch.setitem(app.extensions, 'forwarder', forwarder)
+    with app.app_context():
+        bulk_insert_credentials([
+            {'username': 'forwarded@techcorp.com', 'password': 'x', 'type': 'stealer'},
+            {'username': 'someone@unmatched.example', 'password': 'x'},
+        ], created_by=1)
+    assert forwarder.flush(timeout=5)
+    lines = tcp_listener.wait_for(1)
+    forwarder.close()
+
+    assert len(lines) == 1
+    assert 'suser=forwarded@techcorp.com' in lines[0]
+    assert 'externalId=' in lines[0] and 'cn1=' in lines[0]
@@ -0,0 +1,111 @@
+"""
+Identity snapshots (user, company, watchlist) in the app cache.
+
+Each test works on its own company and member so the session dataset and
+the shared logins are left untouched. A member request fills the snapshot;
+every admin write that changes one of its rows must drop it.
+"""
+import pytest
+
+from cuba import cache, db
+from cuba.identity import _key, load_identity
+
+
+@pytest.fixture
+def member(app):
+    """A company with one watchlist domain and a logged-in member; yields (client, user_id, company_id)."""
+    from cuba.models import Company, User, WatchlistEntry
+
+    with app.app_context():
+        company = Company(name='Snapshot Co', domain='snapshot-co.example', company_type='other')
+        db.session.add(company)
+        db.session.flush()
+        db.session.add(WatchlistEntry(company_id=company.id, entry_type='domain', entry_value='snapshot-co.example'))
+        user = User(username='snapshot_member', email='member@snapshot-co.example', role='member',
+                    company_id=company.id, is_active=True)
+        user.set_password('Snapshot-pass1')
+        db.session.add(user)
+        db.session.commit()
+        user_id, company_id = user.id, company.id
+
+    client = app.test_client()
+    response = client.post('/login', data={'email': 'member@snapshot-co.example', 'password': 'Snapshot-pass1'})
+    assert response.status_code == 302
+    yield client, user_id, company_id
+
+    with app.app_context():
+        WatchlistEntry.query.filter_by(company_id=company_id).delete()
+        User.query.filter_by(id=user_id).delete()
+        Company.query.filter_by(id=company_id).delete()
+        db.session.commit()
+        cache.delete(_key(user_id))
+
+
+def _snapshot(app, client, user_id):
+    """Make a member request (which caches the identity) and return the cached snapshot."""
+    assert client.get('/api/notifications').status_code == 200
+    with app.app_context():
+        return cache.get(_key(user_id))
+
+
+def _watchlist(app, user_id):
+    with app.test_request_context():
+        return sorted(entry.entry_value for entry in load_identity(user_id).company.watchlist_entries)
+
+
+def test_member_requests_fill_the_snapshot(app, member):
+    client, user_id, _ = member
+    snapshot = _snapshot(app, client, user_id)
+    assert snapshot['user']['username'] == 'snapshot_member'
+    assert [entry['entry_value'] for entry in snapshot['watchlist']] == ['snapshot-co.example']
+
+
+def test_edit_user_drops_the_snapshot(app, login, member):
+    client, user_id, company_id = member
+    assert _snapshot(app, client, user_id) is not None
+
+    response = login('admin').post(f'/admin/users/{user_id}/edit', data={
+        'username': 'snapshot_renamed', 'email': 'member@snapshot-co.example', 'role': 'member',
+        'company_id': company_id, 'is_active': 'y'})
+    assert response.status_code == 302
+
+    with app.app_context():
+        assert cache.get(_key(user_id)) is None
+    assert _snapshot(app, client, user_id)['user']['username'] == 'snapshot_renamed'
+
+
+def test_edit_company_drops_member_snapshots(app, login, member):
+    client, user_id, company_id = member
+    assert _snapshot(app, client, user_id) is not None
+
+    response = login('admin').post(f'/admin/companies/{company_id}/edit', data={
+        'name': 'Snapshot Co Renamed', 'domain': 'snapshot-co.example', 'company_type': 'other',
+        'watchlist_domain[]': ['snapshot-co.example', 'vpn.snapshot-co.example']})
+    assert response.status_code == 302
+
+    with app.app_context():
+        assert cache.get(_key(user_id)) is None
+    snapshot = _snapshot(app, client, user_id)
+    assert snapshot['company']['name'] == 'Snapshot Co Renamed'
+    assert _watchlist(app, user_id) == ['snapshot-co.example', 'vpn.snapshot-co.example']
+
+
+def test_watchlist_add_and_delete_drop_member_snapshots(app, login, member):
+    client, user_id, company_id = member
+    admin = login('admin')
+    assert _snapshot(app, client, user_id) is not None
+
+    response = admin.post(f'/admin/companies/{company_id}/watchlist/add',
+                          data={'entry_type': 'domain', 'entry_value': 'mail.snapshot-co.example'})
+    assert response.get_json()['success']
+    entry_id = response.get_json()['entry_id']
+    with app.app_context():
+        assert cache.get(_key(user_id)) is None
+    assert _snapshot(app, client, user_id) is not None
+    assert _watchlist(app, user_id) == ['mail.snapshot-co.example', 'snapshot-co.example']
+
+    response = admin.post(f'/admin/companies/{company_id}/watchlist/{entry_id}/delete')
+    assert response.get_json()['success']
+    with app.app_context():
+        assert cache.get(_key(user_id)) is None
+    assert _watchlist(app, user_id) == ['snapshot-co.example']
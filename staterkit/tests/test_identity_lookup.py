@@ -0,0 +1,71 @@
+"""
+Identity lookups (``/api/v1/identities``): tenant scoping and request limits.
+"""
+from sqlalchemy import func, or_, select
+
+from cuba import db
+from cuba.api import MAX_LOOKUP_IDENTITIES
+from cuba.models import BreachedCredential
+
+LOOKUP_URL = '/api/v1/identities/lookup'
+
+
+def _hits(app, tenant=None, outside=None, count=2):
+    """{identity: credential count} for usernames in (or entirely outside) the techcorp.com scope."""
+    username = func.lower(BreachedCredential.username)
+    in_scope = or_(BreachedCredential.domain.ilike('%techcorp.com%'),
+                   BreachedCredential.username.ilike('%techcorp.com%'),
+                   BreachedCredential.url.ilike('%techcorp.com%'))
+    with app.app_context():
+        stmt = select(username, func.count(BreachedCredential.id)).where(BreachedCredential.username.isnot(None))
+        if tenant:
+            stmt = stmt.where(BreachedCredential.username.ilike('%@techcorp.com'))
+        if outside:
+            stmt = stmt.group_by(username).having(func.max(in_scope) == 0)
+        else:
+            stmt = stmt.group_by(username)
+        return dict(db.session.execute(stmt.order_by(username).limit(count)).all())
+
+
+def test_batch_lookup_is_scoped_to_the_tenant(app, api_headers):
+    tenant = _hits(app, tenant=True)
+    outside = _hits(app, outside=True)
+    assert len(tenant) == 2 and len(outside) == 2
+    wanted = list(tenant) + list(outside)
+    # Case, padding, duplicates, blanks and non-strings are normalized away
+    body = {'identities': [identity.upper() for identity in wanted] + [f'  {wanted[0]} ', '', None, 42,
+                                                                        'never-breached@nowhere.example']}
+    client = app.test_client()
+
+    admin = client.post(LOOKUP_URL, json=body, headers=api_headers('admin')).get_json()
+    assert admin['checked'] == 5
+    assert {result['identity']: result['hits'] for result in admin['results']} == {**tenant, **outside}
+    assert [result['identity'] for result in admin['results']] == wanted  # Request order
+
+    member = client.post(LOOKUP_URL, json=body, headers=api_headers('member')).get_json()
+    assert {result['identity']: result['hits'] for result in member['results']} == tenant
+    assert member['matched'] == 2
+
+
+def test_single_lookup_is_scoped_to_the_tenant(app, api_headers):
+    [outside] = _hits(app, outside=True, count=1)
+    client = app.test_client()
+
+    member = client.get(f'/api/v1/identities/{outside}', headers=api_headers('member')).get_json()
+    assert member['breached'] is False and member['summary'] is None
+    admin = client.get(f'/api/v1/identities/{outside}', headers=api_headers('admin')).get_json()
+    assert admin['breached'] is True and admin['summary']['identity'] == outside
+
+
+def test_batch_lookup_limits(app, api_headers):
+    client = app.test_client()
+    headers = api_headers('admin')
+
+    too_many = {'identities': [f'user{n}@limit.example' for n in range(MAX_LOOKUP_IDENTITIES + 1)]}
+    response = client.post(LOOKUP_URL, json=too_many, headers=headers)
+    assert response.status_code == 413
+    assert str(MAX_LOOKUP_IDENTITIES) in response.get_json()['error']
+
+    assert client.post(LOOKUP_URL, json={'identities': 'a@b.example'}, headers=headers).status_code == 400
+    assert client.post(LOOKUP_URL, data='not json', headers=headers).status_code == 400
+    assert client.post(LOOKUP_URL, json={'identities': []}).status_code == 401
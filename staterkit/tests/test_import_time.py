@@ -0,0 +1,69 @@
+"""
+Cold-start budget.
+
+Autoscaled and read-only (``READ_ONLY_DB``) deployments start workers often,
+so importing ``cuba`` and building the app must stay cheap. Each check runs in
+a fresh interpreter because modules already imported by other tests would
+hide the cost. Raise ``CUBA_IMPORT_BUDGET_S`` on slow CI machines.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_SECONDS = float(os.environ.get('CUBA_IMPORT_BUDGET_S', '2.0'))
+
+# Only needed by exports / ``flask db``; never at startup
+HEAVY_MODULES = ['openpyxl', 'reportlab']
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import cuba
+imported = time.perf_counter()
+loaded_by_import = sorted(m for m in sys.modules if m.startswith(('cuba.', 'openpyxl', 'reportlab', 'alembic')))
+cuba.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - started,
+    'total_s': created - started,
+    'loaded_by_import': loaded_by_import,
+    'loaded': sorted(sys.modules),
+}))
+'''
+
+
+def _probe(tmp_path, **env):
+    environment = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'probe.db'}", **env)
+    environment.pop('SQLALCHEMY_DATABASE_URI', None)
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=PROJECT_DIR, env=environment,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope='module')
+def probe(tmp_path_factory):
+    return _probe(tmp_path_factory.mktemp('import-time'))
+
+
+def test_import_and_create_app_within_budget(probe):
+    assert probe['total_s'] < BUDGET_SECONDS, (
+        f"import cuba + create_app() took {probe['total_s']:.2f}s (budget {BUDGET_SECONDS}s)")
+
+
+def test_package_import_does_not_load_views(probe):
+    views = [m for m in probe['loaded_by_import'] if m.endswith(('_routes', '.threat_intel', '.auth', '.routes'))]
+    assert views == []
+
+
+@pytest.mark.parametrize('module', HEAVY_MODULES)
+def test_export_backends_are_lazy(probe, module):
+    assert module not in probe['loaded']
+
+
+def test_read_only_deployment_skips_alembic(tmp_path):
+    result = _probe(tmp_path, READ_ONLY_DB='1')
+    assert 'alembic' not in result['loaded']
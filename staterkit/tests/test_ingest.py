@@ -0,0 +1,68 @@
+"""
+Bulk ingest from files: record parsing and batched streaming through ``flask ingest``.
+"""
+import csv
+import json
+from datetime import datetime
+
+from cuba.services.ingest import iter_batches, iter_records
+
+
+def _ingested(app, usernames):
+    from cuba.models import BreachedCredential
+
+    with app.app_context():
+        rows = BreachedCredential.query.filter(BreachedCredential.username.in_(usernames)).all()
+        return {row.username: row for row in rows}
+
+
+def test_jsonl_created_at_is_parsed_and_batches_commit(app, tmp_path):
+    records = [
+        {'username': 'iso-z@ingest.example', 'password': 'x', 'created_at': '2025-03-04T05:06:07Z'},
+        {'username': 'offset@ingest.example', 'password': 'x', 'created_at': '2025-03-04T10:00:00+02:00'},
+        {'username': 'date@ingest.example', 'password': 'x', 'created_at': '2025-03-04'},
+        {'username': 'garbage@ingest.example', 'password': 'x', 'created_at': 'last tuesday'},
+        {'username': 'missing@ingest.example', 'password': 'x'},
+    ]
+    path = tmp_path / 'creds.jsonl'
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+
+    started = datetime.utcnow()
+    result = app.test_cli_runner().invoke(args=['ingest', str(path), '--created-by', 'admin@dseclab.com',
+                                                '--batch-size', '2'])
+    assert result.exit_code == 0, result.output
+    assert result.output.count('records committed') == 3
+    assert 'Ingested 5 breached credentials' in result.output
+
+    rows = _ingested(app, [record['username'] for record in records])
+    assert rows['iso-z@ingest.example'].created_at == datetime(2025, 3, 4, 5, 6, 7)
+    assert rows['offset@ingest.example'].created_at == datetime(2025, 3, 4, 8, 0, 0)
+    assert rows['date@ingest.example'].created_at == datetime(2025, 3, 4)
+    assert rows['garbage@ingest.example'].created_at >= started
+    assert rows['missing@ingest.example'].created_at >= started
+
+
+def test_csv_ingest(app, tmp_path):
+    path = tmp_path / 'creds.csv'
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['username', 'password', 'source', 'created_at'])
+        writer.writeheader()
+        writer.writerow({'username': 'csv1@ingest.example', 'password': 'x', 'source': 'CSV',
+                         'created_at': '2024-12-31 23:59:59'})
+        writer.writerow({'username': 'csv2@ingest.example', 'password': 'x', 'source': 'CSV', 'created_at': ''})
+
+    result = app.test_cli_runner().invoke(args=['ingest', str(path), '--created-by', 'admin@dseclab.com'])
+    assert result.exit_code == 0, result.output
+    rows = _ingested(app, ['csv1@ingest.example', 'csv2@ingest.example'])
+    assert rows['csv1@ingest.example'].created_at == datetime(2024, 12, 31, 23, 59, 59)
+    assert rows['csv1@ingest.example'].domain == 'ingest.example'
+    assert rows['csv2@ingest.example'].created_at is not None
+
+
+def test_records_are_streamed_in_batches(tmp_path):
+    path = tmp_path / 'many.jsonl'
+    path.write_text(''.join(json.dumps({'username': f'u{n}'}) + '\n' for n in range(7)))
+
+    records = iter_records(str(path))
+    assert not isinstance(records, list)
+    assert [len(batch) for batch in iter_batches(records, 3)] == [3, 3, 1]
@@ -0,0 +1,124 @@
+"""
+Failed-login throttling per client IP and per email.
+
+Each test posts from its own socket address (``REMOTE_ADDR``) and emails so
+the counters of the shared session app do not interfere. ``X-Forwarded-For``
+is client-controlled and must not change which IP an attempt is counted for.
+"""
+import pytest
+
+from .conftest import USERS
+
+
+def _post(client, ip, email, password='wrong', **headers):
+    return client.post('/login', data={'email': email, 'password': password},
+                       environ_base={'REMOTE_ADDR': ip}, headers=headers)
+
+
+def _fail(client, ip, n, **headers):
+    return _post(client, ip, f'nobody{n}@stuffing.example', **headers)
+
+
+def test_ip_limit_returns_429(app):
+    client = app.test_client()
+    limit = app.config['LOGIN_THROTTLE_IP_LIMIT']
+    for n in range(limit):
+        assert _fail(client, '198.51.100.1', n).status_code == 200
+    response = _fail(client, '198.51.100.1', limit)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+    # Another client is unaffected
+    assert _fail(client, '198.51.100.2', 0).status_code == 200
+
+
+def test_email_limit_applies_across_ips(app):
+    client = app.test_client()
+    limit = app.config['LOGIN_THROTTLE_EMAIL_LIMIT']
+    for n in range(limit):
+        assert _post(client, f'198.51.100.{10 + n}', 'target@stuffing.example').status_code == 200
+    response = _post(client, '198.51.100.30', 'target@stuffing.example')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+    # The IP itself is not limited: other emails still get through
+    assert _post(client, '198.51.100.30', 'other@stuffing.example').status_code == 200
+
+
+def test_spoofed_forwarded_for_does_not_reset_the_ip_limit(app):
+    client = app.test_client()
+    limit = app.config['LOGIN_THROTTLE_IP_LIMIT']
+    for n in range(limit):
+        response = _fail(client, '198.51.100.3', n, **{'X-Forwarded-For': f'10.9.{n // 250}.{n % 250}'})
+        assert response.status_code == 200
+    response = _fail(client, '198.51.100.3', limit, **{'X-Forwarded-For': '10.99.0.1', 'X-Real-IP': '10.99.0.2'})
+    assert response.status_code == 429
+
+
+def test_failed_attempts_fold_into_one_activity_row_per_ip(app):
+    from cuba.models import UserActivity
+
+    client = app.test_client()
+    for n in range(5):
+        assert _fail(client, '198.51.100.4', 1000 + n, **{'X-Forwarded-For': f'10.8.0.{n}'}).status_code == 200
+    with app.app_context():
+        rows = UserActivity.query.filter(UserActivity.activity_type == 'login_failed',
+                                         UserActivity.failure_reason == 'user_not_found',
+                                         UserActivity.ip_address.in_(
+                                             ['198.51.100.4'] + [f'10.8.0.{n}' for n in range(5)])).all()
+    assert {row.ip_address for row in rows} == {'198.51.100.4'}
+    assert sum(row.attempt_count for row in rows) == 5
+    assert len(rows) <= 2  # One row per window; the five attempts may straddle a window boundary
+
+
+@pytest.fixture
+def proxied_app(app):
+    from cuba import create_app
+
+    return create_app({'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'], 'TESTING': True,
+                       'WTF_CSRF_ENABLED': False, 'TRUSTED_PROXY_HOPS': 1})
+
+
+def test_trusted_proxy_hops_use_the_forwarded_address(proxied_app):
+    client = proxied_app.test_client()
+    limit = proxied_app.config['LOGIN_THROTTLE_IP_LIMIT']
+    # The proxy (socket 192.0.2.1) appends the real client; each client has its own counter
+    for n in range(limit):
+        assert _fail(client, '192.0.2.1', n, **{'X-Forwarded-For': '203.0.113.7'}).status_code == 200
+    assert _fail(client, '192.0.2.1', limit, **{'X-Forwarded-For': '203.0.113.7'}).status_code == 429
+    assert _fail(client, '192.0.2.1', 0, **{'X-Forwarded-For': '203.0.113.8'}).status_code == 200
+
+
+@pytest.fixture
+def cache_app(app):
+    from cuba import create_app
+
+    return create_app({'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'], 'TESTING': True,
+                       'WTF_CSRF_ENABLED': False, 'LOGIN_THROTTLE_BACKEND': 'cache'})
+
+
+def test_cache_backend_limits_per_ip_and_per_email(cache_app):
+    from cuba.throttle import CacheCounterStore
+
+    assert isinstance(cache_app.extensions['login_throttle'].by_ip.store, CacheCounterStore)
+    client = cache_app.test_client()
+    ip_limit = cache_app.config['LOGIN_THROTTLE_IP_LIMIT']
+    for n in range(ip_limit):
+        assert _fail(client, '198.51.100.40', n).status_code == 200
+    assert _fail(client, '198.51.100.40', ip_limit).status_code == 429
+
+    email_limit = cache_app.config['LOGIN_THROTTLE_EMAIL_LIMIT']
+    for n in range(email_limit):
+        assert _post(client, f'198.51.100.{50 + n}', 'cached@stuffing.example').status_code == 200
+    assert _post(client, '198.51.100.60', 'cached@stuffing.example').status_code == 429
+
+
+def test_successful_login_resets_the_email_count(cache_app):
+    client = cache_app.test_client()
+    email, password = USERS['tail_member']
+    limit = cache_app.config['LOGIN_THROTTLE_EMAIL_LIMIT']
+    for _ in range(limit - 1):
+        assert _post(client, '198.51.100.70', email).status_code == 200
+    assert _post(client, '198.51.100.70', email, password).status_code == 302
+    client.get('/logout')
+    for _ in range(limit - 1):
+        assert _post(client, '198.51.100.70', email).status_code == 200
+    assert _post(client, '198.51.100.70', email, password).status_code == 302
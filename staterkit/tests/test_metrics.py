@@ -0,0 +1,86 @@
+"""
+Multi-process metrics aggregation through METRICS_DIR.
+
+Worker files are written by hand with labels the application never uses,
+so the values recorded by the test process itself do not interfere.
+"""
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from cuba.metrics import RETIRED_FILE, _encode, collect
+
+COUNTER = ('cuba_export_rows_total', (('format', 'test-worker'),), '')
+GAUGE = ('cuba_http_requests_in_flight', (('worker', 'test-worker'),), '')
+
+
+@pytest.fixture
+def metrics_app(tmp_path):
+    return SimpleNamespace(config={'METRICS_DIR': str(tmp_path)})
+
+
+@pytest.fixture(scope='module')
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def _worker_file(metrics_dir, pid, started, counter, gauge=0):
+    filename = f'metrics_{pid}_{started}.json'
+    with open(os.path.join(metrics_dir, filename), 'w') as f:
+        json.dump({'pid': pid, 'started': started, 'values': _encode({COUNTER: counter, GAUGE: gauge})}, f)
+    return filename
+
+
+def test_exited_worker_is_folded_once(metrics_app, dead_pid):
+    metrics_dir = metrics_app.config['METRICS_DIR']
+    filename = _worker_file(metrics_dir, dead_pid, 1, counter=5, gauge=3)
+
+    values = collect(metrics_app)
+    assert values[COUNTER] == 5
+    assert GAUGE not in values  # Gauges of exited workers are dropped
+    assert filename not in os.listdir(metrics_dir)
+    assert RETIRED_FILE in os.listdir(metrics_dir)
+
+    # The folded total stays, without being counted twice, and adds up with the next exited worker
+    assert collect(metrics_app)[COUNTER] == 5
+    _worker_file(metrics_dir, dead_pid, 2, counter=4)
+    assert collect(metrics_app)[COUNTER] == 9
+    assert [name for name in os.listdir(metrics_dir) if name.startswith(f'metrics_{dead_pid}_')] == []
+
+
+def test_reused_pid_does_not_hide_the_old_workers_totals(metrics_app):
+    metrics_dir = metrics_app.config['METRICS_DIR']
+    # An exited worker had this process's pid; this process's own file is newer
+    filename = _worker_file(metrics_dir, os.getpid(), 1, counter=7, gauge=2)
+
+    values = collect(metrics_app)
+    assert values[COUNTER] == 7
+    assert GAUGE not in values
+    assert filename not in os.listdir(metrics_dir)
+    assert collect(metrics_app)[COUNTER] == 7
+
+
+def test_live_workers_are_summed_with_gauges(metrics_app):
+    metrics_dir = metrics_app.config['METRICS_DIR']
+    # pid 1 is alive and, with a far-future start, the newest file for it
+    _worker_file(metrics_dir, 1, 2 ** 62, counter=2, gauge=1)
+    values = collect(metrics_app)
+    assert (values[COUNTER], values[GAUGE]) == (2, 1)
+    assert collect(metrics_app)[COUNTER] == 2
+
+
+def test_interrupted_fold_is_not_counted_twice(metrics_app, dead_pid):
+    metrics_dir = metrics_app.config['METRICS_DIR']
+    filename = _worker_file(metrics_dir, dead_pid, 3, counter=6)
+    # A scrape wrote the retired totals, then stopped before deleting the file
+    with open(os.path.join(metrics_dir, RETIRED_FILE), 'w') as f:
+        json.dump({'folded': [filename], 'values': _encode({COUNTER: 6})}, f)
+
+    assert collect(metrics_app)[COUNTER] == 6
+    assert filename not in os.listdir(metrics_dir)
@@ -0,0 +1,90 @@
+"""
+k-anonymity password range API (``/api/v1/range/<prefix>``).
+
+Hashes are checked against published values: SHA-1 and NTLM of
+``password`` and ``Password1``, and the MD4 test suite of RFC 1320.
+"""
+import pytest
+
+from cuba.services.password_index import _md4, ntlm_hash, sha1_hash
+
+# SHA-1 / NTLM of 'password' and 'Password1'
+KNOWN = {
+    'password': ('5BAA61E4C9B93F3F0682250B6CF8331B7EE68FD8', '8846F7EAEE8FB117AD06BDD830B7586C'),
+    'Password1': ('70CCD9007338D6D81DD3B6271621B9CF9A97EA00', '64F12CDDAA88057E06A81B54E73B949B'),
+}
+ADD_URL = '/threat-intelligence/breached-creds/add'
+
+
+@pytest.mark.parametrize('password', sorted(KNOWN))
+def test_known_hashes(password):
+    assert (sha1_hash(password), ntlm_hash(password)) == KNOWN[password]
+
+
+@pytest.mark.parametrize('message, digest', [
+    (b'', '31d6cfe0d16ae931b73c59d7e0c089c0'),
+    (b'abc', 'a448017aaf21d8525fc10ae87aa6729d'),
+    (b'message digest', 'd9130a8164549fe818874806e1c7014b'),
+    (b'12345678901234567890123456789012345678901234567890123456789012345678901234567890',
+     'e33b4ddc9c38f2199c3e7b164fcc0536'),
+])
+def test_md4_fallback_matches_rfc_1320(message, digest):
+    assert _md4(message).hex() == digest
+
+
+def _range_count(client, headers, digest, mode):
+    """Count listed for ``digest`` in its prefix's range response (0 if absent), and the ETag."""
+    response = client.get(f'/api/v1/range/{digest[:5].lower()}', query_string={'mode': mode}, headers=headers)
+    assert response.status_code == 200
+    counts = dict(line.split(':') for line in response.get_data(as_text=True).split('\r\n') if line)
+    assert all(len(suffix) == len(digest) - 5 and suffix == suffix.upper() for suffix in counts)
+    return int(counts.get(digest[5:], 0)), response.headers['ETag']
+
+
+def _counts(client, headers, password):
+    sha1, ntlm = KNOWN[password]
+    (sha1_count, etag), (ntlm_count, _) = (_range_count(client, headers, sha1, 'sha1'),
+                                           _range_count(client, headers, ntlm, 'ntlm'))
+    assert sha1_count == ntlm_count
+    return sha1_count, etag
+
+
+def test_range_follows_add_edit_and_delete(app, login, api_headers):
+    from cuba.models import BreachedCredential
+
+    client = app.test_client()
+    headers = api_headers('member')  # The range is the same for every caller
+    admin = login('admin')
+    before = {password: _counts(client, headers, password)[0] for password in KNOWN}
+
+    admin.post(ADD_URL, data={'username': 'range-probe@range.example', 'password': 'password', 'type': 'combolist'})
+    with app.app_context():
+        credential_id = BreachedCredential.query.filter_by(username='range-probe@range.example').one().id
+    added, etag = _counts(client, headers, 'password')
+    assert added == before['password'] + 1
+
+    cached = client.get(f"/api/v1/range/{KNOWN['password'][0][:5]}", headers={**headers, 'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    admin.post(f'/threat-intelligence/breached-creds/{credential_id}/edit',
+               data={'username': 'range-probe@range.example', 'password': 'Password1', 'type': 'combolist'})
+    edited, edited_etag = _counts(client, headers, 'password')
+    assert edited == before['password'] and edited_etag != etag
+    assert _counts(client, headers, 'Password1')[0] == before['Password1'] + 1
+
+    admin.post(f'/threat-intelligence/breached-creds/{credential_id}/delete')
+    assert _counts(client, headers, 'Password1')[0] == before['Password1']
+    assert _counts(client, headers, 'password')[0] == before['password']
+
+
+@pytest.mark.parametrize('path, status', [
+    ('/api/v1/range/5BAA6?mode=md5', 400),
+    ('/api/v1/range/5BAA', 400),
+    ('/api/v1/range/5BAZ6', 400),
+])
+def test_range_rejects_bad_requests(app, api_headers, path, status):
+    assert app.test_client().get(path, headers=api_headers('admin')).status_code == status
+
+
+def test_range_requires_a_token(app):
+    assert app.test_client().get('/api/v1/range/5BAA6').status_code == 401
@@ -0,0 +1,82 @@
+"""
+Password hash policy: rehash on login after PASSWORD_HASH_METHOD changes.
+
+The tests use cheap pbkdf2 settings so hashing does not slow the suite down.
+"""
+import pytest
+from werkzeug.security import generate_password_hash
+
+from cuba import db
+from cuba.passwords import hash_method, normalize_method
+
+OLD_METHOD = 'pbkdf2:sha256:1000'
+NEW_METHOD = 'pbkdf2:sha256:2000'
+
+
+@pytest.fixture
+def old_hash_user(app, monkeypatch):
+    """A user whose hash uses OLD_METHOD while the policy is NEW_METHOD; yields the user id."""
+    from cuba.models import User
+
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', NEW_METHOD)
+    with app.app_context():
+        user = User(username='rehash_user', email='rehash@techcorp.com', role='member', is_active=True,
+                    password=generate_password_hash('Rehash-pass1', method=OLD_METHOD))
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    yield user_id
+    with app.app_context():
+        User.query.filter_by(id=user_id).delete()
+        db.session.commit()
+
+
+def _stored_hash(app, user_id):
+    from cuba.models import User
+
+    with app.app_context():
+        return db.session.get(User, user_id).password
+
+
+def _login(app, password):
+    client = app.test_client()
+    return client.post('/login', data={'email': 'rehash@techcorp.com', 'password': password},
+                       environ_base={'REMOTE_ADDR': '198.51.100.43'})
+
+
+def test_login_rehashes_with_the_new_policy(app, old_hash_user):
+    assert _login(app, 'Rehash-pass1').status_code == 302
+    stored = _stored_hash(app, old_hash_user)
+    assert hash_method(stored) == NEW_METHOD
+
+    # The new hash verifies, and a second login leaves it alone
+    assert _login(app, 'Rehash-pass1').status_code == 302
+    assert _stored_hash(app, old_hash_user) == stored
+
+
+def test_failed_login_keeps_the_old_hash(app, old_hash_user):
+    before = _stored_hash(app, old_hash_user)
+    assert _login(app, 'wrong-password').status_code == 200
+    assert _stored_hash(app, old_hash_user) == before
+    assert hash_method(before) == OLD_METHOD
+
+
+def test_status_counts_outdated_hashes(app, old_hash_user):
+    result = app.test_cli_runner().invoke(args=['passwords', 'status'])
+    assert result.exit_code == 0, result.output
+    assert f'  {OLD_METHOD:<28} 1 users' in result.output
+    assert f'will be rehashed with {NEW_METHOD}' in result.output
+
+
+@pytest.mark.parametrize('method, expected', [
+    ('scrypt', 'scrypt:32768:8:1'),
+    ('scrypt:16384:8:1', 'scrypt:16384:8:1'),
+    ('pbkdf2:sha256:600000', 'pbkdf2:sha256:600000'),
+])
+def test_normalize_method(method, expected):
+    assert normalize_method(method) == expected
+
+
+def test_normalize_method_rejects_unknown_algorithms():
+    with pytest.raises(ValueError):
+        normalize_method('md5')
@@ -0,0 +1,124 @@
+"""
+On-demand request profiling: the hooks, the profile token and the admin views.
+
+Profiling is off in the shared session app. The other tests build an app
+with PROFILING_ENABLED on the same database and their own PROFILE_DIR.
+"""
+import os
+import time
+
+import pytest
+
+from .conftest import USERS
+
+PAGE_URL = '/login'
+
+
+@pytest.fixture
+def profiling_app(app, tmp_path):
+    from cuba import create_app
+
+    return create_app({'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'], 'TESTING': True,
+                       'WTF_CSRF_ENABLED': False, 'PROFILING_ENABLED': True, 'PROFILE_DIR': str(tmp_path)})
+
+
+def _client(app, role):
+    client = app.test_client()
+    email, password = USERS[role]
+    assert client.post('/login', data={'email': email, 'password': password}).status_code == 302
+    return client
+
+
+def _token(app):
+    from cuba.profiling import issue_profile_token
+
+    with app.app_context():
+        return issue_profile_token(1)
+
+
+def _stored(app):
+    return sorted(os.listdir(app.config['PROFILE_DIR']))
+
+
+def test_profiling_is_off_by_default(app, login, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'PROFILE_DIR', str(tmp_path))
+    assert not app.config['PROFILING_ENABLED']
+    assert 'X-Profile-Id' not in login('admin').get(f'{PAGE_URL}?_profile=1').headers
+    response = app.test_client().get(PAGE_URL, headers={'X-Profile-Token': _token(app)})
+    assert 'X-Profile-Id' not in response.headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_admin_flag_profiles_the_request(profiling_app):
+    response = _client(profiling_app, 'admin').get(f'{PAGE_URL}?_profile=1', headers={'X-Request-ID': 'req-42'})
+    assert response.headers['X-Profile-Id'] == 'req-42'
+    assert _stored(profiling_app) == ['req-42.json', 'req-42.pstats']
+
+
+def test_flag_is_ignored_for_non_admins(profiling_app):
+    response = _client(profiling_app, 'member').get(f'{PAGE_URL}?_profile=1')
+    assert 'X-Profile-Id' not in response.headers
+    assert _stored(profiling_app) == []
+
+
+def test_token_profiles_a_request_without_a_session(profiling_app):
+    response = profiling_app.test_client().get(PAGE_URL, headers={'X-Profile-Token': _token(profiling_app)})
+    profile_id = response.headers['X-Profile-Id']
+    assert f'{profile_id}.pstats' in _stored(profiling_app)
+
+
+def test_expired_or_tampered_token_is_ignored(profiling_app, monkeypatch):
+    token = _token(profiling_app)
+    tampered = token[:-1] + ('A' if token[-1] != 'A' else 'B')
+    client = profiling_app.test_client()
+    assert 'X-Profile-Id' not in client.get(PAGE_URL, headers={'X-Profile-Token': tampered}).headers
+
+    monkeypatch.setitem(profiling_app.config, 'PROFILE_TOKEN_MAX_AGE', -1)  # Every token is too old
+    assert 'X-Profile-Id' not in client.get(PAGE_URL, headers={'X-Profile-Token': token}).headers
+    assert _stored(profiling_app) == []
+
+
+@pytest.mark.parametrize('request_id', ['../../etc/passwd', 'x' * 65, 'id with spaces', ''])
+def test_malformed_request_id_is_replaced(profiling_app, request_id):
+    response = profiling_app.test_client().get(PAGE_URL, headers={'X-Profile-Token': _token(profiling_app),
+                                                                  'X-Request-ID': request_id})
+    profile_id = response.headers['X-Profile-Id']
+    assert profile_id != request_id and len(profile_id) == 32
+    int(profile_id, 16)
+    assert _stored(profiling_app) == [f'{profile_id}.json', f'{profile_id}.pstats']
+
+
+def test_pruning_keeps_the_newest_profiles(profiling_app, monkeypatch):
+    monkeypatch.setitem(profiling_app.config, 'PROFILES_KEPT', 3)
+    client = profiling_app.test_client()
+    headers = {'X-Profile-Token': _token(profiling_app)}
+    for n in range(5):
+        client.get(PAGE_URL, headers={**headers, 'X-Request-ID': f'prune-{n}'})
+        time.sleep(0.02)  # Distinct mtimes: pruning goes by age
+    assert _stored(profiling_app) == [f'prune-{n}.{ext}' for n in (2, 3, 4) for ext in ('json', 'pstats')]
+
+
+def test_admin_views_list_show_and_download_profiles(profiling_app):
+    admin = _client(profiling_app, 'admin')
+    admin.get(f'{PAGE_URL}?_profile=1', headers={'X-Request-ID': 'view-1'})
+
+    listing = admin.get('/admin/profiles')
+    assert listing.status_code == 200 and b'view-1' in listing.data
+    issued = admin.post('/admin/profiles')
+    assert issued.status_code == 200 and b'X-Profile-Token: ' in issued.data
+
+    detail = admin.get('/admin/profiles/view-1?sort=tottime')
+    assert detail.status_code == 200 and b'function calls' in detail.data
+    download = admin.get('/admin/profiles/view-1/download')
+    assert download.status_code == 200 and download.mimetype == 'application/octet-stream'
+    assert admin.get('/admin/profiles/unknown/download').status_code == 404
+    assert admin.get('/admin/profiles/..%2Fsecret').status_code == 404
+
+
+def test_admin_views_are_forbidden_to_non_admins(profiling_app):
+    _client(profiling_app, 'admin').get(f'{PAGE_URL}?_profile=1', headers={'X-Request-ID': 'view-2'})
+    member = _client(profiling_app, 'member')
+    assert member.get('/admin/profiles').status_code == 403
+    assert member.post('/admin/profiles').status_code == 403
+    assert member.get('/admin/profiles/view-2').status_code == 403
+    assert member.get('/admin/profiles/view-2/download').status_code == 403
@@ -0,0 +1,138 @@
+"""
+Query-plan regression tests for the hot, tenant-scoped pages.
+
+Each case issues a real request, records every SELECT it runs and asks
+SQLite for ``EXPLAIN QUERY PLAN``. On paths that are expected to be indexed
+no hot table may be read with a bare full-table ``SCAN`` (index scans such
+as ``SCAN t USING INDEX ix`` for ORDER BY ... LIMIT, or ``USING COVERING
+INDEX`` for counts, are fine).
+
+Tenant members' dashboard filters on their own domain and is indexed like
+any other path. Their list, analysis, export and search pages are filtered
+by substring matches on the watchlist (``ILIKE '%domain%'``), which no
+B-tree index can serve, so those credential queries are a known scan. For
+them only the supporting lookups (watchlist, notifications, users) must stay
+indexed.
+"""
+import re
+
+import pytest
+from sqlalchemy import event
+
+from cuba import db
+from cuba.models import AuditLog
+
+LIST_URL = '/threat-intelligence/breached-creds'
+EXPORT_URL = '/threat-intelligence/breached-creds/export'
+
+HOT_TABLES = ('breached_credential', 'notification', 'audit_log', 'watchlist_entry', 'user', 'company')
+SUPPORT_TABLES = tuple(t for t in HOT_TABLES if t != 'breached_credential')
+
+INDEXED_PATHS = [
+    ('admin', LIST_URL),
+    ('admin', f'{LIST_URL}?page=5'),
+    ('admin', f'{LIST_URL}?type=stealer'),
+    ('admin', f'{LIST_URL}?date_filter=today'),
+    ('admin', f'{LIST_URL}?date_filter=week'),
+    ('admin', f'{LIST_URL}?date_filter=month'),
+    ('admin', '/'),
+    ('admin', '/threat-intelligence/analysis'),
+    ('admin', f'{EXPORT_URL}?format=json&date_filter=week'),
+    ('admin', f'{EXPORT_URL}?format=csv&type=stealer'),
+    ('member', '/'),
+    ('tail_member', '/'),
+    ('member', '/api/notifications'),
+    ('member', '/api/notifications?unread_only=1&limit=20'),
+]
+
+TENANT_PATHS = [
+    (role, url)
+    for role in ('member', 'tail_member')
+    for url in (LIST_URL, f'{LIST_URL}?date_filter=week', '/threat-intelligence/analysis',
+                f'{EXPORT_URL}?format=json', '/api/search?q=smith')
+]
+
+
+def _explain(connection, statement, parameters):
+    cursor = connection.cursor()
+    try:
+        cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+@pytest.fixture
+def capture_plans(app):
+    """Return ``run(client, url) -> (response, [(statement, plan lines)])``."""
+
+    def run(client, url):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith('SELECT'):
+                statements.append((statement, parameters))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+        raw = engine.raw_connection()
+        try:
+            plans = [(statement, _explain(raw.driver_connection, statement, parameters))
+                     for statement, parameters in statements]
+        finally:
+            raw.close()
+        return response, plans
+
+    return run
+
+
+def full_scans(plans, tables):
+    """(table, statement, plan) for every bare table scan of one of ``tables``."""
+    offenders = []
+    for statement, plan in plans:
+        for line in plan:
+            match = re.match(r'^SCAN (\w+)', line)
+            if match and match.group(1) in tables and 'USING' not in line:
+                offenders.append((match.group(1), ' '.join(statement.split())[:300], plan))
+    return offenders
+
+
+def _describe(offenders):
+    return '\n'.join(f'{table}: {plan}\n    {statement}' for table, statement, plan in offenders)
+
+
+@pytest.mark.parametrize('role,url', INDEXED_PATHS)
+def test_indexed_paths_do_not_scan(login, capture_plans, role, url):
+    response, plans = capture_plans(login(role), url)
+    assert response.status_code == 200
+    assert plans, 'no SELECT statements captured'
+    offenders = full_scans(plans, HOT_TABLES)
+    assert not offenders, f'full table scan on an indexed path:\n{_describe(offenders)}'
+
+
+@pytest.mark.parametrize('role,url', TENANT_PATHS)
+def test_tenant_paths_keep_supporting_lookups_indexed(login, capture_plans, role, url):
+    response, plans = capture_plans(login(role), url)
+    assert response.status_code == 200
+    offenders = full_scans(plans, SUPPORT_TABLES)
+    assert not offenders, f'full table scan on a tenant lookup:\n{_describe(offenders)}'
+
+
+def test_audit_log_listing_uses_created_at_index(app):
+    # Same query as admin_routes.audit_logs (newest first, paginated)
+    with app.app_context():
+        query = AuditLog.query.order_by(AuditLog.created_at.desc()).limit(50).offset(0)
+        compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+        raw = db.engine.raw_connection()
+        try:
+            plan = _explain(raw.driver_connection, str(compiled), ())
+        finally:
+            raw.close()
+    assert not full_scans([(str(compiled), plan)], ('audit_log',)), plan
+    assert any('ix_audit_log_created_at' in line for line in plan), plan
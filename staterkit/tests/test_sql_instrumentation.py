@@ -0,0 +1,84 @@
+"""
+Per-request SQL instrumentation: the Server-Timing query count and the slow query log.
+"""
+import logging
+import re
+from contextlib import contextmanager
+
+import pytest
+
+from cuba.sql_instrumentation import logger, slow_logger
+
+
+def _queries(response):
+    return int(re.search(r'desc="(\d+) queries"', response.headers['Server-Timing']).group(1))
+
+
+def test_export_does_not_reload_rows_after_the_audit_commit(login):
+    # The member export holds every techcorp.com credential; rendering after
+    # log_audit's commit would reload each row and creator one by one
+    response = login('member').get('/threat-intelligence/breached-creds/export?format=json')
+    assert response.status_code == 200
+    assert len(response.get_json()) > 100
+    assert _queries(response) <= 10
+
+
+@pytest.fixture
+def enabled_loggers():
+    """Alembic's fileConfig in the session fixture disables existing loggers; undo it here."""
+    disabled = [(target, target.disabled) for target in (logger, slow_logger)]
+    for target, _ in disabled:
+        target.disabled = False
+    yield
+    for target, state in disabled:
+        target.disabled = state
+
+
+@contextmanager
+def _captured(name):
+    """Records that reach the ``name`` logger's handlers."""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    target = logging.getLogger(name)
+    target.addHandler(handler)
+    try:
+        yield records
+    finally:
+        target.removeHandler(handler)
+
+
+def test_request_lines_are_not_repeated_by_the_app_logger(app, enabled_loggers):
+    # The app logger ('cuba') has Flask's default stderr handler; cuba.sql has its own
+    assert logger.handlers
+    with _captured('cuba.sql') as own, _captured('cuba') as app_records:
+        logger.info('{"event": "request_sql_probe"}')
+    assert len(own) == 1 and app_records == []
+
+
+def test_slow_query_log_handler_is_added_once(app, tmp_path, enabled_loggers):
+    from cuba import create_app
+
+    path = tmp_path / 'slow.log'
+    config = {'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'], 'TESTING': True,
+              'SQL_SLOW_QUERY_LOG': str(path)}
+    before, propagate = list(slow_logger.handlers), slow_logger.propagate
+    try:
+        create_app(config)
+        create_app(config)
+        added = [handler for handler in slow_logger.handlers if handler not in before]
+        assert len(added) == 1
+        assert isinstance(added[0], logging.FileHandler) and added[0].baseFilename == str(path)
+
+        # A slow query is written to the file only, not to stderr as well
+        with _captured('cuba.sql') as records:
+            slow_logger.warning('{"event": "slow_query_probe"}')
+        added[0].flush()
+        assert records == []
+        assert path.read_text().count('slow_query_probe') == 1
+    finally:
+        slow_logger.propagate = propagate
+        for handler in slow_logger.handlers[:]:
+            if handler not in before:
+                slow_logger.removeHandler(handler)
+                handler.close()
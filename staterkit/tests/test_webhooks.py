@@ -0,0 +1,221 @@
+"""
+Webhook delivery against a local HTTP receiver.
+
+The receiver (127.0.0.1, HTTP/1.1 keep-alive) records each POST and the
+connection it arrived on. Its response for a path can be changed per test:
+a status code or a delay.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cuba.webhooks import SIGNATURE_HEADER, TIMESTAMP_HEADER, WebhookDispatcher, sign
+
+
+class _Receiver:
+    def __init__(self):
+        self.requests = []
+        self.connections = 0
+        self.responses = {}  # path -> list of (status, delay) consumed in order; default (200, 0)
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                receiver.connections += 1
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                planned = receiver.responses.get(self.path) or [(200, 0)]
+                status, delay = planned.pop(0) if len(planned) > 1 else planned[0]
+                time.sleep(delay)
+                receiver.requests.append({'path': self.path, 'headers': dict(self.headers), 'body': body,
+                                          'at': time.perf_counter()})
+                self.send_response(status)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def receiver():
+    receiver = _Receiver()
+    yield receiver
+    receiver.close()
+
+
+@pytest.fixture
+def webhooks(app, monkeypatch):
+    """Create subscriptions for tests; removes them and their queues afterwards."""
+    from cuba import db
+    from cuba.models import Company, WebhookOutbox, WebhookSubscription
+
+    monkeypatch.setitem(app.config, 'WEBHOOKS_DISPATCH', False)  # Tests dispatch explicitly
+    created = []
+
+    def subscribe(domain, url):
+        with app.app_context():
+            company = Company.query.filter_by(domain=domain).one()
+            subscription = WebhookSubscription(company_id=company.id, url=url, secret=f'secret-{domain}')
+            db.session.add(subscription)
+            db.session.commit()
+            created.append(subscription.id)
+            return subscription.id, company.id
+
+    yield subscribe
+    with app.app_context():
+        WebhookOutbox.query.filter(WebhookOutbox.subscription_id.in_(created)).delete()
+        WebhookSubscription.query.filter(WebhookSubscription.id.in_(created)).delete()
+        db.session.commit()
+
+
+def _queue(app, subscription_id, company_id, count):
+    """Put ``count`` of the company's existing credentials on the subscription's queue."""
+    from cuba import db
+    from cuba.models import BreachedCredential, WebhookOutbox
+
+    with app.app_context():
+        ids = db.session.execute(db.select(BreachedCredential.id)
+                                 .where(BreachedCredential.company_id == company_id).limit(count)).scalars().all()
+        db.session.execute(db.insert(WebhookOutbox), [
+            {'subscription_id': subscription_id, 'credential_id': credential_id, 'event': 'breach.matched',
+             'status': 'pending', 'attempts': 0, 'created_at': datetime.utcnow()} for credential_id in ids])
+        db.session.commit()
+
+
+def _outbox(app, subscription_id):
+    from cuba.models import WebhookOutbox
+
+    with app.app_context():
+        return [(row.status, row.attempts) for row in WebhookOutbox.query.filter_by(subscription_id=subscription_id)]
+
+
+def test_ingest_matches_are_batched_signed_and_share_a_connection(app, receiver, webhooks):
+    from cuba.services.ingest import bulk_insert_credentials
+
+    subscription_id, _ = webhooks('techcorp.com', receiver.url + '/hook')
+    with app.app_context():
+        bulk_insert_credentials([
+            {'username': f'hooked{n}@techcorp.com', 'password': 'x', 'type': 'stealer'} for n in range(5)
+        ] + [{'username': 'someone@unmatched.example', 'password': 'x'}], created_by=1)
+    assert [status for status, _ in _outbox(app, subscription_id)] == ['pending'] * 5
+
+    dispatcher = WebhookDispatcher(app, batch_size=2)
+    dispatcher.run_once()
+    dispatcher.stop()
+
+    assert len(receiver.requests) == 3  # 2 + 2 + 1 events
+    assert receiver.connections == 1
+    events = []
+    for request in receiver.requests:
+        headers = request['headers']
+        assert headers[SIGNATURE_HEADER] == sign('secret-techcorp.com', headers[TIMESTAMP_HEADER], request['body'])
+        events.extend(json.loads(request['body'])['events'])
+    assert sorted(event['credential']['username'] for event in events) == [f'hooked{n}@techcorp.com' for n in range(5)]
+    assert all(event['type'] == 'breach.matched' and 'password' not in event['credential'] for event in events)
+    assert _outbox(app, subscription_id) == []
+
+
+def test_failed_delivery_backs_off_then_retries(app, receiver, webhooks):
+    from cuba import db
+    from cuba.models import WebhookSubscription
+
+    subscription_id, company_id = webhooks('techcorp.com', receiver.url + '/flaky')
+    _queue(app, subscription_id, company_id, 3)
+    receiver.responses['/flaky'] = [(503, 0), (200, 0)]
+    dispatcher = WebhookDispatcher(app, retry_base=0.5, retry_max=0.5)
+
+    dispatcher.run_once()
+    assert len(receiver.requests) == 1
+    assert _outbox(app, subscription_id) == [('pending', 1)] * 3
+    with app.app_context():
+        subscription = db.session.get(WebhookSubscription, subscription_id)
+        assert subscription.failure_count == 1 and subscription.retry_at > datetime.utcnow()
+        assert subscription.last_error.startswith('HTTP 503')
+
+    dispatcher.run_once()  # Paused: nothing is sent before retry_at
+    assert len(receiver.requests) == 1
+
+    time.sleep(0.6)
+    dispatcher.run_once()
+    dispatcher.stop()
+    assert len(receiver.requests) == 2
+    assert [event['id'] for event in json.loads(receiver.requests[0]['body'])['events']] == \
+           [event['id'] for event in json.loads(receiver.requests[1]['body'])['events']]
+    assert _outbox(app, subscription_id) == []
+    with app.app_context():
+        subscription = db.session.get(WebhookSubscription, subscription_id)
+        assert subscription.failure_count == 0 and subscription.retry_at is None
+
+
+def test_events_go_dead_after_max_attempts(app, receiver, webhooks):
+    subscription_id, company_id = webhooks('techcorp.com', receiver.url + '/down')
+    _queue(app, subscription_id, company_id, 2)
+    receiver.responses['/down'] = [(500, 0)]
+    dispatcher = WebhookDispatcher(app, max_attempts=1)
+    dispatcher.run_once()
+    dispatcher.stop()
+    assert _outbox(app, subscription_id) == [('dead', 1)] * 2
+
+
+def test_slow_endpoint_does_not_delay_other_tenants(app, receiver, webhooks):
+    from cuba.models import Company
+
+    with app.app_context():
+        other = Company.query.filter(Company.domain != 'techcorp.com').order_by(Company.id).first().domain
+    slow_id, slow_company = webhooks('techcorp.com', receiver.url + '/slow')
+    fast_id, fast_company = webhooks(other, receiver.url + '/fast')
+    _queue(app, slow_id, slow_company, 1)
+    _queue(app, fast_id, fast_company, 1)
+    receiver.responses['/slow'] = [(200, 1.5)]
+
+    dispatcher = WebhookDispatcher(app, workers=4)
+    started = time.perf_counter()
+    dispatcher.run_once()
+    dispatcher.stop()
+
+    arrived = {request['path']: request['at'] - started for request in receiver.requests}
+    assert arrived['/fast'] < 1.0 <= arrived['/slow']
+    assert _outbox(app, slow_id) == [] and _outbox(app, fast_id) == []
+
+
+def test_deleting_a_subscribed_company_removes_its_webhooks(app, login):
+    from cuba import db
+    from cuba.models import Company, WebhookOutbox, WebhookSubscription
+
+    with app.app_context():
+        company = Company(name='Hooked Co', domain='hooked-co.example', company_type='other')
+        db.session.add(company)
+        db.session.flush()
+        subscription = WebhookSubscription(company_id=company.id, url='https://hooks.example/in', secret='s')
+        db.session.add(subscription)
+        db.session.flush()
+        db.session.add(WebhookOutbox(subscription_id=subscription.id, credential_id=1, event='breach.matched'))
+        db.session.commit()
+        company_id, subscription_id = company.id, subscription.id
+
+    response = login('admin').post(f'/admin/companies/{company_id}/delete', follow_redirects=True)
+    assert b'deleted successfully' in response.data
+
+    with app.app_context():
+        assert db.session.get(Company, company_id) is None
+        assert db.session.get(WebhookSubscription, subscription_id) is None
+        assert WebhookOutbox.query.filter_by(subscription_id=subscription_id).count() == 0